@@ -0,0 +1,97 @@
+"""Payload encoding helpers shared by the providers."""
+import base64
+import io
+import json
+from email.generator import BytesGenerator
+from email.message import Message
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import pybase64
+    PYBASE64_AVAILABLE = True
+except ImportError:
+    PYBASE64_AVAILABLE = False
+
+# 57 raw bytes encode to exactly one 76-character base64 line (RFC 2045)
+BASE64_LINE_BYTES = 57
+
+# Multiple of 57 (and so of 3): each chunk encodes to whole lines without
+# padding, so encoded chunks concatenate
+FILE_CHUNK_SIZE = BASE64_LINE_BYTES * 16 * 1024
+
+# SIMD-accelerated when pybase64 is installed (pip install mailbridge[speedups])
+b64encode = pybase64.b64encode if PYBASE64_AVAILABLE else base64.b64encode
+encodebytes = pybase64.encodebytes if PYBASE64_AVAILABLE else base64.encodebytes
+
+
+def dumps(data: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON, via orjson when installed."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # Values orjson rejects (e.g. ints wider than 64 bits) still go through json
+            pass
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def encode_base64(content: bytes, wrap: bool = False) -> str:
+    """Base64-encode in-memory data, in 76-character lines when ``wrap`` is set."""
+    if wrap:
+        return encodebytes(content).decode('ascii')
+    return b64encode(content).decode('ascii')
+
+
+def encode_file_base64(path: Path, wrap: bool = False) -> str:
+    """
+    Base64-encode a file chunk by chunk into a buffer sized up front.
+
+    With ``wrap`` the output is split into 76-character lines for MIME
+    bodies; otherwise it is a single line, as JSON APIs expect. Chunks are
+    read into one reused buffer, so only a single chunk of raw data is held
+    at a time, instead of the whole file plus its encoded copy.
+    """
+    size = path.stat().st_size
+    capacity = -(-size // 3) * 4
+    if wrap:
+        capacity += -(-size // BASE64_LINE_BYTES)
+    encode = encodebytes if wrap else b64encode
+
+    encoded = bytearray(capacity)
+    position = 0
+    chunk = bytearray(min(size, FILE_CHUNK_SIZE) or 1)
+    view = memoryview(chunk)
+
+    with open(path, 'rb') as f:
+        while True:
+            read = f.readinto(chunk)
+            if not read:
+                break
+            piece = encode(view[:read])
+            encoded[position:position + len(piece)] = piece
+            position += len(piece)
+
+    # Drop unused capacity if the file shrank while reading, and the final newline
+    if wrap:
+        position = max(position - 1, 0)
+    del encoded[position:]
+    return encoded.decode('ascii')
+
+
+def flatten_crlf(msg: Message) -> bytes:
+    """
+    Flatten a message straight to CRLF wire bytes, skipping the str round-trip.
+
+    The message keeps its own policy, so the compat32 MIME classes still
+    RFC 2047-encode non-ASCII header values; policy.SMTP would reject them.
+    """
+    buffer = io.BytesIO()
+    BytesGenerator(buffer, mangle_from_=False).flatten(msg, linesep='\r\n')
+    return buffer.getvalue()
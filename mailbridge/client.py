@@ -1,4 +1,7 @@
-from typing import Optional, Dict, Any, Union, List
+import threading
+from collections import ChainMap
+from types import MappingProxyType
+from typing import Optional, Dict, Any, Union, List, Tuple
 from pathlib import Path
 
 from mailbridge.dto.email_message_dto import EmailMessageDto
@@ -16,25 +19,52 @@ from mailbridge.providers.smtp_provider import SMTPProvider
 
 class MailBridge:
 
-    PROVIDERS = {
+    _BUILTIN_PROVIDERS = MappingProxyType({
         'smtp': SMTPProvider,
         'sendgrid': SendGridProvider,
         'mailgun': MailgunProvider,
         'ses': SESProvider,
         'postmark': PostmarkProvider,
         'brevo': BrevoProvider,
-    }
+    })
 
-    def __init__(self, provider: str, **config):
-        self.provider_name = provider.lower()
-        if self.provider_name not in self.PROVIDERS:
-            available = ', '.join(self.PROVIDERS.keys())
+    # Filled by register_provider(); entries here take precedence over built-ins
+    _CUSTOM_PROVIDERS: Dict[str, type] = {}
+
+    # Read-only live view of both maps; add providers with register_provider().
+    # Lookups go through PROVIDERS, so replacing it (e.g. in tests) still works.
+    PROVIDERS = _PROVIDERS_VIEW = MappingProxyType(ChainMap(_CUSTOM_PROVIDERS, _BUILTIN_PROVIDERS))
+
+    # Providers shared between MailBridge(..., share_provider=True) instances
+    _provider_cache: Dict[tuple, BaseEmailProvider] = {}
+    _provider_cache_lock = threading.Lock()
+
+    _available_providers_cache = (None, ())
+
+    def __init__(self, provider: str, share_provider: bool = False, **config):
+        """
+        Create a mailer for the given provider.
+
+        Args:
+            provider: Provider name (case-insensitive)
+            share_provider: Reuse the provider instance, and with it any open
+                connections or HTTP sessions, of earlier MailBridge objects
+                created with the same provider and config (default: False)
+            **config: Provider configuration
+        """
+        self.provider_name = provider.casefold()
+        provider_class = self.PROVIDERS.get(self.provider_name)
+        if provider_class is None:
+            available = ', '.join(self.available_providers())
             raise ProviderNotFoundError(
                 f"Provider '{provider}' not found. Available providers: {available}"
             )
 
-        provider_class = self.PROVIDERS[self.provider_name]
-        self.provider: BaseEmailProvider = provider_class(**config)
+        self.provider: BaseEmailProvider = (
+            self._get_shared_provider(provider_class, config)
+            if share_provider
+            else provider_class(**config)
+        )
 
     def send(
             self,
@@ -177,6 +207,32 @@ class MailBridge:
         """Close provider connection."""
         self.provider.close()
 
+    @classmethod
+    def clear_provider_cache(cls) -> None:
+        """Close and forget every provider shared via share_provider=True."""
+        with cls._provider_cache_lock:
+            providers = list(cls._provider_cache.values())
+            cls._provider_cache.clear()
+        for provider in providers:
+            provider.close()
+
+    @classmethod
+    def _get_shared_provider(cls, provider_class: type, config: Dict[str, Any]) -> BaseEmailProvider:
+        key = (provider_class, tuple(sorted(config.items())))
+        try:
+            hash(key)
+        except TypeError:
+            # Unhashable config values (lists, dicts) can't be keyed; don't share
+            return provider_class(**config)
+
+        # Held while constructing, so racing callers never build a provider
+        # (with its own sessions or connections) that then goes unused
+        with cls._provider_cache_lock:
+            cached = cls._provider_cache.get(key)
+            if cached is None:
+                cached = cls._provider_cache[key] = provider_class(**config)
+        return cached
+
     @classmethod
     def register_provider(cls, name: str, provider_class: type):
         """
@@ -195,14 +251,26 @@ class MailBridge:
         """
         if not issubclass(provider_class, BaseEmailProvider):
             raise TypeError(f"{provider_class} must inherit from EmailProvider")
-        cls.PROVIDERS[name.lower()] = provider_class
+        cls._CUSTOM_PROVIDERS[name.casefold()] = provider_class
 
     @classmethod
-    def available_providers(cls) -> List[str]:
+    def available_providers(cls) -> Tuple[str, ...]:
         """
-        Get list of available providers.
+        Get names of available providers.
+
+        The result is cached until a provider is registered.
 
         Returns:
-            List of provider names
+            Tuple of provider names
         """
-        return list(cls.PROVIDERS.keys())
\ No newline at end of file
+        if cls.PROVIDERS is not cls._PROVIDERS_VIEW:
+            # PROVIDERS was replaced; it may change at any time, so read it as-is
+            return tuple(cls.PROVIDERS)
+
+        # Built-ins are immutable, so the custom names alone identify the result
+        key = tuple(cls._CUSTOM_PROVIDERS)
+        cached_key, names = cls._available_providers_cache
+        if cached_key != key:
+            names = tuple(cls.PROVIDERS)
+            cls._available_providers_cache = (key, names)
+        return names
\ No newline at end of file
@@ -1,8 +1,12 @@
+import sys
 from dataclasses import dataclass, field
 from typing import Optional, Dict, Any
 
+# Bulk sends hold one response per message; slots drop the per-instance __dict__
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class EmailResponseDTO:
     success: bool
     message_id: Optional[str] = None
@@ -8,6 +8,10 @@ from mailbridge.exceptions import EmailSendError
 
 
 class BaseEmailProvider(ABC):
+    # Class-level so capabilities can be checked without building a provider
+    SUPPORTS_TEMPLATES = False
+    SUPPORTS_BULK_SENDING = False
+
     def __init__(self, **config):
         self.config = config
         self._validate_config()
@@ -23,30 +27,31 @@ class BaseEmailProvider(ABC):
         pass
 
     def send_bulk(self, bulk: BulkEmailDTO) -> BulkEmailResponseDTO:
-        responses = []
-
-        for message in bulk.messages:
-            try:
-                responses.append(self.send(message))
-            except EmailSendError as e:
-                responses.append(EmailResponseDTO(
-                    success=False,
-                    provider=self.__class__.__name__,
-                    error=str(e)
-                ))
-            except Exception as e:
-                responses.append(EmailResponseDTO(
-                    success=False,
-                    provider=self.__class__.__name__,
-                    error=f"Unexpected error: {str(e)}"
-                ))
+        responses = [self._send_one(message) for message in bulk.messages]
         return BulkEmailResponseDTO.from_responses(responses)
 
+    def _send_one(self, message: EmailMessageDto) -> EmailResponseDTO:
+        """Send a single message, turning failures into an unsuccessful response."""
+        try:
+            return self.send(message)
+        except EmailSendError as e:
+            return EmailResponseDTO(
+                success=False,
+                provider=self.__class__.__name__,
+                error=str(e)
+            )
+        except Exception as e:
+            return EmailResponseDTO(
+                success=False,
+                provider=self.__class__.__name__,
+                error=f"Unexpected error: {str(e)}"
+            )
+
     def supports_templates(self) -> bool:
-        return False
+        return self.SUPPORTS_TEMPLATES
 
     def supports_bulk_sending(self) -> bool:
-        return False
+        return self.SUPPORTS_BULK_SENDING
 
     def __enter__(self):
         """Context manager entry."""
@@ -61,12 +66,10 @@ class BaseEmailProvider(ABC):
         pass
 
 class TemplateCapableProvider(BaseEmailProvider, ABC):
-    def supports_templates(self) -> bool:
-        return True
+    SUPPORTS_TEMPLATES = True
 
 class BulkCapableProvider(BaseEmailProvider):
-    def supports_bulk_sending(self) -> bool:
-        return True
+    SUPPORTS_BULK_SENDING = True
 
     @abstractmethod
     def send_bulk(self, bulk: BulkEmailDTO) -> BulkEmailResponseDTO:
@@ -1,7 +1,14 @@
-import base64
+import asyncio
+import mimetypes
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from mailbridge._encoding import dumps, encode_base64, encode_file_base64
 from mailbridge.providers.base_email_provider import TemplateCapableProvider, BulkCapableProvider
 
 from mailbridge.dto.bulk_email_dto import BulkEmailDTO
@@ -10,7 +17,136 @@ from mailbridge.dto.email_message_dto import EmailMessageDto
 from mailbridge.dto.email_response_dto import EmailResponseDTO
 from mailbridge.exceptions import ConfigurationError, EmailSendError
 
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+# SendGrid rejects requests with more recipients than this, counting to, cc
+# and bcc across all personalizations
+_MAX_RECIPIENTS = 1000
+
+
+@lru_cache(maxsize=16384)
+def _address(email: str) -> Dict[str, str]:
+    """
+    SendGrid address object, shared between payloads.
+
+    Payloads are serialized straight after they are built and never
+    mutated, so the same dict can be reused for every occurrence of an
+    address across a bulk send.
+    """
+    return {'email': email}
+
+
+def _addresses(emails: List[str]) -> List[Dict[str, str]]:
+    return list(map(_address, emails))
+
+
+@lru_cache(maxsize=1024)
+def _guess_mime(suffix: str) -> str:
+    """MIME type for a file extension, defaulting to application/octet-stream."""
+    return mimetypes.guess_type(f'attachment{suffix}')[0] or 'application/octet-stream'
+
+
+def _content_key(message: EmailMessageDto) -> tuple:
+    """
+    Everything outside the personalization that a regular message sends.
+
+    Messages with equal keys differ only in recipients, so they can share
+    one request with a personalization each.
+    """
+    return (
+        message.from_email,
+        message.subject,
+        message.body,
+        message.html,
+        message.reply_to,
+        tuple(sorted(message.headers.items())) if message.headers else (),
+        tuple(message.attachments or ()),
+    )
+
+
+def _recipient_count(message: EmailMessageDto) -> int:
+    return len(message.to) + len(message.cc or ()) + len(message.bcc or ())
+
+
+def _batches(messages: List[EmailMessageDto]) -> List[List[EmailMessageDto]]:
+    """Split messages into batches SendGrid accepts in a single request."""
+    batches = []
+    batch = []
+    recipients = 0
+    for msg in messages:
+        count = _recipient_count(msg)
+        if batch and recipients + count > _MAX_RECIPIENTS:
+            batches.append(batch)
+            batch = []
+            recipients = 0
+        batch.append(msg)
+        recipients += count
+    if batch:
+        batches.append(batch)
+    return batches
+
+
 class SendGridProvider(TemplateCapableProvider, BulkCapableProvider):
+
+    def __init__(self, **config):
+        super().__init__(**config)
+        self.session = self._create_session()
+        # Identical for every request, so built once instead of per send
+        self._auth_headers = {
+            'Authorization': f'Bearer {self.config["api_key"]}',
+            'Content-Type': 'application/json'
+        }
+        self._default_from = {'email': self.config.get('from_email')}
+        self._encode_pool = None
+        self._encode_pool_lock = threading.Lock()
+
+    def _create_session(self) -> requests.Session:
+        """
+        Build a keep-alive session so sends reuse pooled TCP/TLS connections.
+
+        Only failed connects and 429 responses are retried: in both cases
+        SendGrid never accepted the message, so a retry cannot duplicate it.
+        """
+        retry = Retry(
+            total=self.config.get('max_retries', 3),
+            read=0,
+            backoff_factor=0.3,
+            status_forcelist=(429,),
+            allowed_methods=frozenset({'POST'}),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_maxsize=self.config.get('pool_size', 50),
+            max_retries=retry
+        )
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def close(self) -> None:
+        """Close pooled HTTP connections and attachment encoding threads."""
+        self.session.close()
+        with self._encode_pool_lock:
+            pool, self._encode_pool = self._encode_pool, None
+        if pool is not None:
+            pool.shutdown()
+
+    def _get_encode_pool(self) -> ThreadPoolExecutor:
+        # Payloads may be built on several threads at once (send_bulk_async),
+        # so only one of them may create the pool
+        with self._encode_pool_lock:
+            if self._encode_pool is None:
+                self._encode_pool = ThreadPoolExecutor(
+                    max_workers=self.config.get('encode_workers', 4),
+                    thread_name_prefix='sendgrid-encode'
+                )
+            return self._encode_pool
+
     def _validate_config(self) -> None:
         """Validate SendGrid configuration."""
         if 'api_key' not in self.config:
@@ -45,30 +181,63 @@ class SendGridProvider(TemplateCapableProvider, BulkCapableProvider):
 
     def send_bulk(self, bulk: BulkEmailDTO) -> BulkEmailResponseDTO:
         try:
-            # Group messages by template vs regular
-            template_messages = [m for m in bulk.messages if m.is_template_email()]
-            regular_messages = [m for m in bulk.messages if not m.is_template_email()]
+            responses = [
+                self._bulk_response(self._send_request(build()), metadata)
+                for build, metadata in self._build_bulk_requests(bulk.messages)
+            ]
+            return BulkEmailResponseDTO.from_responses(responses)
 
-            responses = []
+        except Exception as e:
+            raise EmailSendError(
+                f"Failed to send bulk emails via SendGrid: {str(e)}",
+                provider='sendgrid',
+                original_error=e
+            )
 
-            # Send template messages (can batch by template_id)
-            if template_messages:
-                grouped_by_template = {}
-                for msg in template_messages:
-                    if msg.template_id not in grouped_by_template:
-                        grouped_by_template[msg.template_id] = []
-                    grouped_by_template[msg.template_id].append(msg)
+    async def send_bulk_async(self, bulk: BulkEmailDTO) -> BulkEmailResponseDTO:
+        """
+        Send bulk requests concurrently over a single HTTP/2 connection.
+
+        Messages are batched exactly as in ``send_bulk``; the resulting
+        requests are then issued with at most ``concurrency`` (default 16)
+        in flight at once.
+
+        Example:
+            result = asyncio.run(provider.send_bulk_async(bulk))
+        """
+        if not HTTPX_AVAILABLE:
+            raise ConfigurationError(
+                "httpx is required for async SendGrid sending. "
+                "Install it with: pip install mailbridge[sendgrid-async]"
+            )
 
-                for template_id, messages in grouped_by_template.items():
-                    response = self._send_bulk_template(template_id, messages)
-                    responses.append(response)
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.config.get('concurrency', 16))
+        transport = httpx.AsyncHTTPTransport(
+            http2=True,
+            limits=httpx.Limits(max_connections=self.config.get('pool_size', 50)),
+            retries=self.config.get('max_retries', 3)
+        )
 
-            # Send regular messages
-            for msg in regular_messages:
-                response = self.send(msg)
-                responses.append(response)
+        async def send_one(build, metadata):
+            async with semaphore:
+                # Encode attachments off the event loop so other requests keep transmitting
+                payload = await loop.run_in_executor(None, build)
+                response = await client.post(
+                    self.endpoint,
+                    content=dumps(payload),
+                    headers=self._auth_headers
+                )
+            self._check_response(response)
+            return self._bulk_response(response, metadata)
 
-            return BulkEmailResponseDTO.from_responses(responses)
+        try:
+            async with httpx.AsyncClient(transport=transport, timeout=30) as client:
+                responses = await asyncio.gather(*(
+                    send_one(build, metadata)
+                    for build, metadata in self._build_bulk_requests(bulk.messages)
+                ))
+            return BulkEmailResponseDTO.from_responses(list(responses))
 
         except Exception as e:
             raise EmailSendError(
@@ -77,89 +246,126 @@ class SendGridProvider(TemplateCapableProvider, BulkCapableProvider):
                 original_error=e
             )
 
-    def _send_bulk_template(
+    def _build_bulk_requests(self, messages: List[EmailMessageDto]) -> List[tuple]:
+        """
+        Group bulk messages into as few API requests as possible.
+
+        Returns (build, metadata) pairs, one per request. Payloads are built
+        only when ``build()`` is called, so attachments are encoded just
+        before each request is sent.
+        """
+        # Single pass: template messages batch by template_id, regular
+        # messages batch when their content is identical
+        grouped_by_template = {}
+        grouped_by_content = {}
+        for msg in messages:
+            if msg.is_template_email():
+                grouped_by_template.setdefault(msg.template_id, []).append(msg)
+                continue
+            try:
+                grouped_by_content.setdefault(_content_key(msg), []).append(msg)
+            except TypeError:
+                # Unhashable attachment content (e.g. a bytearray): send on its own
+                grouped_by_content[object()] = [msg]
+
+        pending = []
+
+        for template_id, group in grouped_by_template.items():
+            for batch in _batches(group):
+                pending.append((
+                    partial(self._build_bulk_template_payload, template_id, batch),
+                    {'bulk_count': len(batch), 'template_id': template_id}
+                ))
+
+        for group in grouped_by_content.values():
+            for batch in _batches(group):
+                if len(batch) == 1:
+                    pending.append((partial(self._build_payload, batch[0]), {}))
+                else:
+                    pending.append((
+                        partial(self._build_bulk_regular_payload, batch),
+                        {'bulk_count': len(batch)}
+                    ))
+
+        return pending
+
+    def _build_bulk_template_payload(
             self,
             template_id: str,
             messages: List[EmailMessageDto]
-    ) -> EmailResponseDTO:
-        """Send multiple template emails with same template_id."""
-        personalizations = self._build_personalizations(messages)
-
-        payload = {
-            'personalizations': personalizations,
-            'from': {
-                'email': messages[0].from_email or self.config.get('from_email')
-            },
+    ) -> Dict[str, Any]:
+        """Build one payload for multiple template emails with same template_id."""
+        return {
+            'personalizations': self._build_personalizations(messages),
+            'from': self._build_payload_from(messages[0]),
             'template_id': template_id
         }
 
-        response = self._send_request(payload)
-
-        if response.status_code not in (200, 202):
-            raise EmailSendError(
-                f"SendGrid bulk template error: {response.status_code}",
-                provider='sendgrid'
-            )
+    def _build_bulk_regular_payload(self, messages: List[EmailMessageDto]) -> Dict[str, Any]:
+        """Build one payload for multiple regular emails sharing the same content."""
+        payload = self._build_payload(messages[0])
+        payload['personalizations'] = [self._build_personalization(msg) for msg in messages]
+        return payload
 
+    @staticmethod
+    def _bulk_response(response, metadata: Dict[str, Any]) -> EmailResponseDTO:
         return EmailResponseDTO(
             success=True,
             message_id=response.headers.get('X-Message-Id'),
             provider='sendgrid',
-            metadata={
-                'bulk_count': len(messages),
-                'template_id': template_id
-            }
+            metadata={'status_code': response.status_code, **metadata}
         )
 
     def _send_request(self, payload: Dict[str, Any]):
-        headers = {
-            'Authorization': f'Bearer {self.config["api_key"]}',
-            'Content-Type': 'application/json'
-        }
-
-        response = requests.post(
+        response = self.session.post(
             self.endpoint,
-            json=payload,
-            headers=headers,
+            data=dumps(payload),
+            headers=self._auth_headers,
             timeout=30
         )
+        self._check_response(response)
+        return response
 
+    @staticmethod
+    def _check_response(response) -> None:
         if response.status_code not in (200, 202):
             raise EmailSendError(
                 f"SendGrid template error: {response.status_code} - {response.text}",
                 provider='sendgrid'
             )
 
-        return response
-
     def _build_personalizations(self, messages: List[EmailMessageDto]) -> List[Dict]:
         """Build personalizations array for bulk template sending."""
         personalizations = []
 
         for msg in messages:
-            personalization = {
-                'to': [{'email': email} for email in msg.to],
-                'dynamic_template_data': msg.template_data or {}
-            }
-
-            if msg.cc:
-                personalization['cc'] = [{'email': email} for email in msg.cc]
-            if msg.bcc:
-                personalization['bcc'] = [{'email': email} for email in msg.bcc]
-
+            personalization = self._build_personalization(msg)
+            personalization['dynamic_template_data'] = msg.template_data or {}
             personalizations.append(personalization)
 
         return personalizations
 
+    def _build_personalization(self, message: EmailMessageDto) -> Dict[str, Any]:
+        """Build the recipient part of a single personalization."""
+        personalization = {'to': _addresses(message.to)}
+
+        if message.cc:
+            personalization['cc'] = _addresses(message.cc)
+        if message.bcc:
+            personalization['bcc'] = _addresses(message.bcc)
+
+        return personalization
+
+    def _build_payload_from(self, message: EmailMessageDto) -> Dict[str, str]:
+        if message.from_email:
+            return _address(message.from_email)
+        return self._default_from
+
     def _build_payload(self, message: EmailMessageDto) -> Dict[str, Any]:
         """Build SendGrid API payload."""
         payload = {
-            'personalizations': [{
-                'to': [{'email': email} for email in message.to]
-            }],
-            'from': {
-                'email': message.from_email or self.config.get('from_email')
-            }
+            'personalizations': [self._build_personalization(message)],
+            'from': self._build_payload_from(message)
         }
 
         if message.is_template_email():
@@ -172,21 +378,9 @@ class SendGridProvider(TemplateCapableProvider, BulkCapableProvider):
                 'value': message.body
             }]
 
-        # Add CC
-        if message.cc:
-            payload['personalizations'][0]['cc'] = [
-                {'email': email} for email in message.cc
-            ]
-
-        # Add BCC
-        if message.bcc:
-            payload['personalizations'][0]['bcc'] = [
-                {'email': email} for email in message.bcc
-            ]
-
         # Add Reply-To
         if message.reply_to:
-            payload['reply_to'] = {'email': message.reply_to}
+            payload['reply_to'] = _address(message.reply_to)
 
         # Add custom headers
         if message.headers:
@@ -199,29 +393,36 @@ class SendGridProvider(TemplateCapableProvider, BulkCapableProvider):
         return payload
 
     def _build_attachments(self, attachments: List) -> List[Dict[str, str]]:
-        """Build attachments payload."""
-        result = []
-
-        for attachment in attachments:
-            if isinstance(attachment, Path):
-                with open(attachment, 'rb') as f:
-                    content = base64.b64encode(f.read()).decode()
-                result.append({
-                    'content': content,
-                    'filename': attachment.name,
-                    'type': 'application/octet-stream',
-                    'disposition': 'attachment'
-                })
-            elif isinstance(attachment, tuple):
-                filename, content, mimetype = attachment
-                if isinstance(content, str):
-                    content = content.encode()
-                encoded = base64.b64encode(content).decode()
-                result.append({
-                    'content': encoded,
-                    'filename': filename,
-                    'type': mimetype,
-                    'disposition': 'attachment'
-                })
-
-        return result
+        """
+        Build attachments payload.
+
+        Several attachments are read and encoded in parallel; file reads and
+        pybase64 both release the GIL.
+        """
+        if len(attachments) > 1:
+            built = self._get_encode_pool().map(self._build_attachment, attachments)
+        else:
+            built = map(self._build_attachment, attachments)
+
+        return [attachment for attachment in built if attachment is not None]
+
+    @staticmethod
+    def _build_attachment(attachment) -> Optional[Dict[str, str]]:
+        if isinstance(attachment, Path):
+            return {
+                'content': encode_file_base64(attachment),
+                'filename': attachment.name,
+                'type': _guess_mime(attachment.suffix.lower()),
+                'disposition': 'attachment'
+            }
+        if isinstance(attachment, tuple):
+            filename, content, mimetype = attachment
+            if isinstance(content, str):
+                content = content.encode()
+            return {
+                'content': encode_base64(content),
+                'filename': filename,
+                'type': mimetype,
+                'disposition': 'attachment'
+            }
+        return None
@@ -1,23 +1,36 @@
+import asyncio
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.base import MIMEBase
-from email import encoders
 
+from mailbridge._encoding import dumps, encode_base64, flatten_crlf
 from mailbridge.providers.base_email_provider import TemplateCapableProvider, BulkCapableProvider
 from mailbridge.dto.email_message_dto import EmailMessageDto
 from mailbridge.dto.email_response_dto import EmailResponseDTO
 from mailbridge.dto.bulk_email_dto import BulkEmailDTO
 from mailbridge.dto.bulk_email_response_dto import BulkEmailResponseDTO
 from mailbridge.exceptions import ConfigurationError, EmailSendError
+from mailbridge.rate_limit import rate_limiter_from_config
+
+# boto3 adds a noticeable fraction of a second to import time, so it is only
+# loaded once an SESProvider is created
+BOTO3_AVAILABLE = importlib.util.find_spec('boto3') is not None
+
+# SES bulk limit is 50 destinations per SendBulkTemplatedEmail call
+_MAX_BULK_DESTINATIONS = 50
+
+
+def __getattr__(name: str):
+    # Keep ``ses_provider.boto3`` reachable without importing it up front
+    if name == 'boto3' and BOTO3_AVAILABLE:
+        import boto3
+        return boto3
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-try:
-    import boto3
-    from botocore.exceptions import ClientError, BotoCoreError
-    BOTO3_AVAILABLE = True
-except ImportError:
-    BOTO3_AVAILABLE = False
 
 class SESProvider(TemplateCapableProvider, BulkCapableProvider):
 
@@ -34,15 +47,18 @@ class SESProvider(TemplateCapableProvider, BulkCapableProvider):
             # Simple regular email
             return self._send_simple_email(message)
 
-        except ClientError as e:
-            error_code = e.response['Error']['Code']
-            error_message = e.response['Error']['Message']
-            raise EmailSendError(
-                f"SES error ({error_code}): {error_message}",
-                provider='ses',
-                original_error=e
-            )
-        except (BotoCoreError, Exception) as e:
+        except Exception as e:
+            # Already imported along with boto3 when the client was created
+            from botocore.exceptions import ClientError
+
+            if isinstance(e, ClientError):
+                error_code = e.response['Error']['Code']
+                error_message = e.response['Error']['Message']
+                raise EmailSendError(
+                    f"SES error ({error_code}): {error_message}",
+                    provider='ses',
+                    original_error=e
+                )
             raise EmailSendError(
                 f"Failed to send email via SES: {str(e)}",
                 provider='ses',
@@ -51,30 +67,20 @@ class SESProvider(TemplateCapableProvider, BulkCapableProvider):
 
     def send_bulk(self, bulk: BulkEmailDTO) -> BulkEmailResponseDTO:
         try:
-            template_messages = [m for m in bulk.messages if m.is_template_email()]
-            regular_messages = [m for m in bulk.messages if not m.is_template_email()]
-
-            responses = []
-
-            # Send template messages in bulk (group by template_id)
-            if template_messages:
-                grouped_by_template = {}
-                for msg in template_messages:
-                    if msg.template_id not in grouped_by_template:
-                        grouped_by_template[msg.template_id] = []
-                    grouped_by_template[msg.template_id].append(msg)
-
-                for template_id, messages in grouped_by_template.items():
-                    # SES bulk limit is 50 destinations
-                    for i in range(0, len(messages), 50):
-                        batch = messages[i:i + 50]
-                        response = self._send_bulk_templated(template_id, batch)
-                        responses.append(response)
-
-            # Send regular messages individually (no bulk API for non-template)
-            for msg in regular_messages:
-                response = self.send(msg)
-                responses.append(response)
+            template_batches, regular_messages = self._split_bulk(bulk.messages)
+
+            # Send template messages in bulk
+            responses = [
+                self._send_bulk_templated(template_id, batch)
+                for template_id, batch in template_batches
+            ]
+
+            # Send regular messages individually (no bulk API for non-template),
+            # several in flight at once since each call is mostly network wait
+            if regular_messages:
+                workers = min(self.config.get('concurrency', 10), len(regular_messages))
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    responses.extend(executor.map(self._send_rate_limited, regular_messages))
 
             return BulkEmailResponseDTO.from_responses(responses)
 
@@ -85,6 +91,64 @@ class SESProvider(TemplateCapableProvider, BulkCapableProvider):
                 original_error=e
             )
 
+    async def send_bulk_async(self, bulk: BulkEmailDTO) -> BulkEmailResponseDTO:
+        """
+        Send bulk messages from async code without blocking the event loop.
+
+        Template batches and regular messages all run concurrently, at most
+        ``concurrency`` (default 10) SES calls at a time, on worker threads
+        sharing the provider's boto3 client. ``max_send_rate`` applies as in
+        ``send_bulk``.
+
+        Example:
+            result = asyncio.run(provider.send_bulk_async(bulk))
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.config.get('concurrency', 10))
+
+        async def run(func, *args):
+            async with semaphore:
+                return await loop.run_in_executor(None, func, *args)
+
+        try:
+            template_batches, regular_messages = self._split_bulk(bulk.messages)
+            responses = await asyncio.gather(
+                *(run(self._send_bulk_templated, template_id, batch)
+                  for template_id, batch in template_batches),
+                *(run(self._send_rate_limited, msg) for msg in regular_messages)
+            )
+            return BulkEmailResponseDTO.from_responses(list(responses))
+
+        except Exception as e:
+            raise EmailSendError(
+                f"Failed to send bulk emails via SES: {str(e)}",
+                provider='ses',
+                original_error=e
+            )
+
+    @staticmethod
+    def _split_bulk(messages: List[EmailMessageDto]) -> tuple:
+        """
+        Split bulk messages into (template_id, batch) pairs and regular messages.
+
+        Single pass: template messages are grouped by template_id and cut into
+        batches SES accepts in one call; regular messages keep their order.
+        """
+        grouped_by_template = {}
+        regular_messages = []
+        for msg in messages:
+            if msg.is_template_email():
+                grouped_by_template.setdefault(msg.template_id, []).append(msg)
+            else:
+                regular_messages.append(msg)
+
+        template_batches = [
+            (template_id, group[i:i + _MAX_BULK_DESTINATIONS])
+            for template_id, group in grouped_by_template.items()
+            for i in range(0, len(group), _MAX_BULK_DESTINATIONS)
+        ]
+        return template_batches, regular_messages
+
     def _validate_config(self) -> None:
         if not BOTO3_AVAILABLE:
             raise ConfigurationError(
@@ -96,9 +160,36 @@ class SESProvider(TemplateCapableProvider, BulkCapableProvider):
         self.aws_secret_access_key = self.config.get('aws_secret_access_key')
         self.region_name = self.config.get('region_name', 'us-east-1')
 
+        concurrency = self.config.get('concurrency', 10)
+        if not isinstance(concurrency, int) or concurrency < 1:
+            raise ConfigurationError("SES 'concurrency' must be a positive integer")
+
+        self._rate_limiter = rate_limiter_from_config(self.config, 'SES')
+
+        try:
+            import boto3
+            from botocore.config import Config
+        except ImportError as e:
+            raise ConfigurationError(
+                f"boto3 is required for SES provider ({e}). "
+                "Install it with: pip install mailbridge[ses]"
+            )
+
         try:
             session_params = {
-                'region_name': self.region_name
+                'region_name': self.region_name,
+                'config': Config(
+                    # One pooled HTTPS connection per concurrent bulk worker
+                    max_pool_connections=concurrency,
+                    tcp_keepalive=True,
+                    connect_timeout=5,
+                    read_timeout=30,
+                    # Adaptive mode backs off and rate-limits client-side on SES throttling
+                    retries={
+                        'mode': 'adaptive',
+                        'max_attempts': self.config.get('max_retries', 10)
+                    }
+                )
             }
             if self.aws_access_key_id and self.aws_secret_access_key:
                 session_params['aws_access_key_id'] = self.aws_access_key_id
@@ -108,6 +199,12 @@ class SESProvider(TemplateCapableProvider, BulkCapableProvider):
         except Exception as e:
             raise ConfigurationError(f"Failed to create SES client: {str(e)}")
 
+    def _send_rate_limited(self, message: EmailMessageDto) -> EmailResponseDTO:
+        """Send one message, waiting first if ``max_send_rate`` is configured."""
+        if self._rate_limiter is not None:
+            self._rate_limiter.wait()
+        return self.send(message)
+
     def _send_templated_email(self, message: EmailMessageDto) -> EmailResponseDTO:
         destination = {
             'ToAddresses': message.to
@@ -146,6 +243,14 @@ class SESProvider(TemplateCapableProvider, BulkCapableProvider):
             messages: List[EmailMessageDto]
     ) -> EmailResponseDTO:
         destinations = []
+        # Campaigns often pass one shared dict to many messages; encode it once
+        serialized = {}
+
+        def serialize(data):
+            key = id(data)
+            if key not in serialized:
+                serialized[key] = self._serialize_template_data(data)
+            return serialized[key]
 
         for msg in messages:
             destination = {
@@ -156,9 +261,7 @@ class SESProvider(TemplateCapableProvider, BulkCapableProvider):
 
             # Add template data for personalization
             if msg.template_data:
-                destination['ReplacementTemplateData'] = self._serialize_template_data(
-                    msg.template_data
-                )
+                destination['ReplacementTemplateData'] = serialize(msg.template_data)
 
             # Add CC/BCC if present
             if msg.cc:
@@ -174,7 +277,7 @@ class SESProvider(TemplateCapableProvider, BulkCapableProvider):
         params = {
             'Source': messages[0].from_email or self.config.get('from_email'),
             'Template': template_id,
-            'DefaultTemplateData': self._serialize_template_data(default_template_data),
+            'DefaultTemplateData': serialize(default_template_data),
             'Destinations': destinations
         }
 
@@ -277,7 +380,7 @@ class SESProvider(TemplateCapableProvider, BulkCapableProvider):
         response = self.client.send_raw_email(
             Source=message.from_email or self.config.get('from_email'),
             Destinations=destinations,
-            RawMessage={'Data': msg.as_string()}
+            RawMessage={'Data': flatten_crlf(msg)}
         )
 
         return EmailResponseDTO(
@@ -290,11 +393,13 @@ class SESProvider(TemplateCapableProvider, BulkCapableProvider):
         )
 
     def _attach_file(self, msg: MIMEMultipart, attachment) -> None:
+        # Encode straight from the raw bytes; set_payload(bytes) followed by
+        # encoders.encode_base64 would round-trip them through a str first
         if isinstance(attachment, Path):
             with open(attachment, 'rb') as f:
                 part = MIMEBase('application', 'octet-stream')
-                part.set_payload(f.read())
-            encoders.encode_base64(part)
+                part.set_payload(encode_base64(f.read(), wrap=True))
+            part['Content-Transfer-Encoding'] = 'base64'
             part.add_header(
                 'Content-Disposition',
                 f'attachment; filename={attachment.name}'
@@ -306,8 +411,8 @@ class SESProvider(TemplateCapableProvider, BulkCapableProvider):
             part = MIMEBase(maintype, subtype)
             if isinstance(content, str):
                 content = content.encode()
-            part.set_payload(content)
-            encoders.encode_base64(part)
+            part.set_payload(encode_base64(content, wrap=True))
+            part['Content-Transfer-Encoding'] = 'base64'
             part.add_header(
                 'Content-Disposition',
                 f'attachment; filename={filename}'
@@ -315,5 +420,4 @@ class SESProvider(TemplateCapableProvider, BulkCapableProvider):
             msg.attach(part)
 
     def _serialize_template_data(self, data: Dict[str, Any]) -> str:
-        import json
-        return json.dumps(data)
\ No newline at end of file
+        return dumps(data).decode('utf-8')
\ No newline at end of file
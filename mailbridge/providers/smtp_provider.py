@@ -1,19 +1,284 @@
 """SMTP email provider implementation."""
+import asyncio
+import queue
+import secrets
 import smtplib
+import socket
 import ssl
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from email.message import Message
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
-from email import encoders
+from email import policy
+from email.charset import Charset
+from email.utils import parseaddr
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Callable, Optional
+from mailbridge._encoding import encode_base64, encode_file_base64, flatten_crlf
 from mailbridge.providers.base_email_provider import BaseEmailProvider
+from mailbridge.dto.bulk_email_dto import BulkEmailDTO
+from mailbridge.dto.bulk_email_response_dto import BulkEmailResponseDTO
 from mailbridge.dto.email_response_dto import EmailResponseDTO
 from mailbridge.dto.email_message_dto import EmailMessageDto
 from mailbridge.exceptions import ConfigurationError, EmailSendError
+from mailbridge.rate_limit import rate_limiter_from_config
+
+try:
+    import aiosmtplib
+    AIOSMTPLIB_AVAILABLE = True
+except ImportError:
+    AIOSMTPLIB_AVAILABLE = False
+
+_BODY_SUBTYPES = {True: 'html', False: 'plain'}
+
+# UTF-8 written as raw 8bit octets instead of base64, for servers with 8BITMIME
+_UTF8_8BIT = Charset('utf-8')
+_UTF8_8BIT.body_encoding = None
+
+# RFC 5321 line limit (998 octets + CRLF), which 8bit bodies must respect
+_MAX_8BIT_LINE = 998
+
+# Leading headers of a single-part us-ascii MIMEText, in the order it sets them
+_SIMPLE_MIME_HEADERS = {
+    html: (
+        f'Content-Type: text/{subtype}; charset="us-ascii"',
+        'MIME-Version: 1.0',
+        'Content-Transfer-Encoding: 7bit',
+    )
+    for html, subtype in _BODY_SUBTYPES.items()
+}
+
+# Header folding flatten_crlf applies to the compat32 MIME classes
+_HEADER_POLICY = policy.compat32.clone(linesep='\r\n')
+
+# Longer header lines are refolded when flattened, so they take the MIME path
+_MAX_HEADER_LINE = _HEADER_POLICY.max_line_length
+
+
+@lru_cache(maxsize=None)
+def _local_hostname() -> str:
+    # getfqdn() may block on a DNS lookup, so resolve it once per process
+    return socket.getfqdn()
+
+
+def _make_msgid() -> str:
+    """Message-ID in the same shape as email.utils.make_msgid, without its per-call lookups."""
+    return f'<{secrets.token_hex(12)}@{_local_hostname()}>'
+
+
+class SMTPConnectionPool:
+    """
+    Bounded pool of authenticated, keep-alive SMTP connections.
+
+    At most ``pool_size`` connections are open at once. A connection is
+    retired with QUIT once it has carried ``max_messages_per_connection``
+    messages, so relays that cap messages per session are never hit.
+    Connections idle for longer than ``idle_check_interval`` seconds are
+    probed with NOOP before reuse; recently used ones are handed out
+    directly.
+    """
+
+    def __init__(
+            self,
+            factory: Callable[[], smtplib.SMTP],
+            pool_size: int = 1,
+            max_messages_per_connection: int = 100,
+            idle_check_interval: float = 30.0
+    ):
+        self.pool_size = pool_size
+        self.max_messages_per_connection = max_messages_per_connection
+        self.idle_check_interval = idle_check_interval
+        self._factory = factory
+        self._idle = queue.LifoQueue(maxsize=pool_size)
+        self._slots = threading.BoundedSemaphore(pool_size)
+
+    @contextmanager
+    def connection(self):
+        """Check out a connection for a single message and return it afterwards."""
+        server, sent = self._acquire()
+        try:
+            yield server
+        except (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused):
+            # The server answered, so the session itself is still usable
+            self._release(server, sent + 1)
+            raise
+        except BaseException:
+            self._release(server, sent + 1, reusable=False)
+            raise
+        else:
+            self._release(server, sent + 1)
+
+    def close(self) -> None:
+        """QUIT every idle connection."""
+        while True:
+            try:
+                server, _, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._quit(server)
+
+    def _acquire(self):
+        self._slots.acquire()
+        try:
+            while True:
+                try:
+                    server, sent, released_at = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._factory(), 0
+
+                idle_for = time.monotonic() - released_at
+                if idle_for < self.idle_check_interval or self._is_alive(server):
+                    return server, sent
+                self._quit(server)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _release(self, server, sent: int, reusable: bool = True) -> None:
+        try:
+            if reusable and sent < self.max_messages_per_connection:
+                self._idle.put_nowait((server, sent, time.monotonic()))
+            else:
+                self._quit(server)
+        finally:
+            self._slots.release()
+
+    @staticmethod
+    def _is_alive(server) -> bool:
+        try:
+            return server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    @staticmethod
+    def _quit(server) -> None:
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            # Connection is already gone, nothing left to clean up
+            pass
+
+
+class _Unhashable(Exception):
+    """Raised by _BulkPreparer when a cache key cannot be hashed."""
+
+
+class _BulkPreparer:
+    """
+    Prepare bulk messages, reusing the encoded content of messages that
+    differ only in their recipients.
+
+    The first message of each (sender, subject, body, headers, attachments)
+    combination is built and flattened without To/Cc; later ones only fold
+    their own To/Cc headers between the cached header block and body.
+    Attachments are also encoded once per send, so a file attached to
+    otherwise personalised messages is not base64-encoded again for each.
+    Scoped to one bulk send, so changes to attachment files between sends
+    are always picked up.
+    """
+
+    MAX_ENTRIES = 16
+
+    def __init__(self, provider: 'SMTPProvider'):
+        self._provider = provider
+        self._cache = OrderedDict()
+        self._encoded = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __call__(self, message: EmailMessageDto) -> tuple:
+        key = (
+            message.from_email,
+            message.subject,
+            message.body,
+            bool(message.html),
+            message.reply_to,
+            tuple(message.headers.items()) if message.headers else (),
+            tuple(message.attachments or ()),
+        )
+        try:
+            from_addr, head, body = self._cached(self._cache, key, lambda: self._build(message))
+        except _Unhashable:
+            # Unhashable attachment content: build the message normally
+            return self._provider._prepare(message)
+
+        recipient_headers = [_HEADER_POLICY.fold_binary('To', ', '.join(message.to))]
+        if message.cc:
+            recipient_headers.append(_HEADER_POLICY.fold_binary('Cc', ', '.join(message.cc)))
+
+        # A custom Message-ID is part of the cached head; otherwise each copy gets its own
+        message_id = self._provider._custom_message_id(message)
+        if message_id is None:
+            message_id = _make_msgid()
+            recipient_headers.append(f'Message-ID: {message_id}\r\n'.encode('ascii'))
+
+        return (
+            message_id,
+            from_addr,
+            self._provider._get_recipients(message),
+            b''.join((head, *recipient_headers, body))
+        )
+
+    def _build(self, message: EmailMessageDto) -> tuple:
+        simple = self._provider._build_simple(message, recipients=False)
+        if simple is not None:
+            head, body = simple
+            from_addr = parseaddr(message.from_email or self._provider._default_from)[1]
+            return from_addr, head, b'\r\n' + body
+
+        msg = self._provider._build_message(message, recipients=False, encode=self._encode)
+        head, _, body = flatten_crlf(msg).partition(b'\r\n\r\n')
+        return parseaddr(msg['From'])[1], head + b'\r\n', b'\r\n' + body
+
+    def _encode(self, attachment) -> str:
+        try:
+            return self._cached(
+                self._encoded, attachment, lambda: self._provider._encode_attachment(attachment)
+            )
+        except _Unhashable:
+            return self._provider._encode_attachment(attachment)
+
+    def _cached(self, cache: OrderedDict, key, build: Callable[[], Any]):
+        """LRU lookup in one of the per-send caches, building the value on a miss."""
+        try:
+            with self._lock:
+                value = cache.get(key)
+                if value is not None:
+                    cache.move_to_end(key)
+        except TypeError:
+            raise _Unhashable from None
+
+        if value is None:
+            value = build()
+            with self._lock:
+                cache[key] = value
+                if len(cache) > self.MAX_ENTRIES:
+                    cache.popitem(last=False)
+        return value
+
 
 class SMTPProvider(BaseEmailProvider):
 
+    # Shared by every instance; pass config['ssl_context'] to override per provider
+    _SSL_CONTEXT = None
+
+    def __init__(self, **config):
+        super().__init__(**config)
+        self._default_from = self.config.get('from_email', self.config['username'])
+        self._use_8bitmime = bool(self.config.get('use_8bitmime', False))
+        self._mail_options = ('BODY=8BITMIME',) if self._use_8bitmime else ()
+        self._pool = SMTPConnectionPool(
+            self._get_smtp_connection,
+            pool_size=self.config.get('pool_size', 1),
+            max_messages_per_connection=self.config.get('max_messages_per_connection', 100),
+            idle_check_interval=self.config.get('idle_check_interval', 30.0)
+        )
+
     def _validate_config(self) -> None:
         required = ['host', 'port', 'username', 'password']
 
@@ -24,50 +289,121 @@ class SMTPProvider(BaseEmailProvider):
                 f"Missing required SMTP configuration: {', '.join(missing)}"
             )
 
+        for key in ('pool_size', 'max_messages_per_connection'):
+            value = self.config.get(key, 1)
+            if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+                raise ConfigurationError(f"SMTP '{key}' must be a positive integer")
+
+        interval = self.config.get('idle_check_interval', 30.0)
+        if isinstance(interval, bool) or not isinstance(interval, (int, float)) or interval < 0:
+            raise ConfigurationError("SMTP 'idle_check_interval' must be a non-negative number")
+
+        self._rate_limiter = rate_limiter_from_config(self.config, 'SMTP')
+
     def send(self, message: EmailMessageDto) -> EmailResponseDTO:
-        try:
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = message.subject
-            msg['From'] = message.from_email or self.config.get('from_email', self.config['username'])
-            msg['To'] = ', '.join(message.to)
+        return self._send_prepared(lambda: self._prepare(message))
 
-            if message.cc:
-                msg['Cc'] = ', '.join(message.cc)
-            if message.bcc:
-                msg['Bcc'] = ', '.join(message.bcc)
-            if message.reply_to:
-                msg['Reply-To'] = message.reply_to
-
-                # Add custom headers
-            if message.headers:
-                for key, value in message.headers.items():
-                    msg[key] = value
-
-                # Add body
-            if message.html:
-                part = MIMEText(message.body, 'html')
-            else:
-                part = MIMEText(message.body, 'plain')
-            msg.attach(part)
+    def send_bulk(self, bulk: BulkEmailDTO) -> BulkEmailResponseDTO:
+        """
+        Send messages in parallel, one worker per pooled connection.
 
-            # Add attachments
-            if message.attachments:
-                for attachment in message.attachments:
-                    self._attach_file(msg, attachment)
+        With a single connection, the next message is built and encoded on a
+        helper thread while the current one is being transmitted.
+        """
+        prepare = _BulkPreparer(self)
 
-            # Send email
-            recipients = message.to + (message.cc or []) + (message.bcc or [])
+        if self._pool.pool_size == 1:
+            return BulkEmailResponseDTO.from_responses(self._send_pipelined(bulk.messages, prepare))
 
-            with self._get_smtp_connection() as server:
-                server.send_message(msg, to_addrs=recipients)
+        with ThreadPoolExecutor(max_workers=self._pool.pool_size) as executor:
+            responses = list(executor.map(
+                lambda message: self._send_one_prepared(lambda: prepare(message)),
+                bulk.messages
+            ))
+
+        return BulkEmailResponseDTO.from_responses(responses)
+
+    async def send_bulk_async(self, bulk: BulkEmailDTO) -> BulkEmailResponseDTO:
+        """
+        Send messages concurrently using aiosmtplib.
+
+        Up to ``pool_size`` worker tasks each keep one persistent connection
+        open and pull messages from a shared queue, so the TLS/AUTH handshake
+        is paid once per worker rather than once per message.
+
+        Example:
+            result = asyncio.run(provider.send_bulk_async(bulk))
+        """
+        if not AIOSMTPLIB_AVAILABLE:
+            raise ConfigurationError(
+                "aiosmtplib is required for async SMTP sending. "
+                "Install it with: pip install mailbridge[smtp-async]"
+            )
+
+        responses = [None] * len(bulk.messages)
+        jobs = iter(enumerate(bulk.messages))
+        workers = min(self._pool.pool_size, len(bulk.messages))
+        prepare = _BulkPreparer(self)
+
+        await asyncio.gather(*(
+            self._bulk_worker_async(jobs, responses, prepare) for _ in range(workers)
+        ))
+
+        return BulkEmailResponseDTO.from_responses(responses)
+
+    def close(self) -> None:
+        """Close all pooled SMTP connections."""
+        self._pool.close()
+
+    def _prepare(self, message: EmailMessageDto) -> tuple:
+        """Build and flatten a message into (message_id, from_addr, recipients, payload)."""
+        message_id = self._custom_message_id(message)
+
+        simple = self._build_simple(message)
+        if simple is not None:
+            head, body = simple
+            if message_id is None:
+                message_id = _make_msgid()
+                head += f'Message-ID: {message_id}\r\n'.encode('ascii')
+            return (
+                message_id,
+                parseaddr(message.from_email or self._default_from)[1],
+                self._get_recipients(message),
+                head + b'\r\n' + body
+            )
+
+        msg = self._build_message(message)
+        if message_id is None:
+            message_id = _make_msgid()
+            msg['Message-ID'] = message_id
+        return (
+            message_id,
+            parseaddr(msg['From'])[1],
+            self._get_recipients(message),
+            flatten_crlf(msg)
+        )
+
+    @staticmethod
+    def _custom_message_id(message: EmailMessageDto) -> Optional[str]:
+        """Message-ID supplied through the message's custom headers, if any."""
+        if not message.headers:
+            return None
+        return next((
+            value for name, value in message.headers.items()
+            if name.lower() == 'message-id'
+        ), None)
+
+    def _send_prepared(self, prepare: Callable[[], tuple]) -> EmailResponseDTO:
+        try:
+            message_id, from_addr, recipients, payload = prepare()
+            self._deliver(from_addr, recipients, payload)
 
             return EmailResponseDTO(
                 success=True,
-                message_id=msg['Message-ID'],
+                message_id=message_id,
                 provider='smtp'
             )
 
-
         except Exception as e:
             raise EmailSendError(
                 f"Failed to send email via SMTP: {str(e)}",
@@ -75,38 +411,272 @@ class SMTPProvider(BaseEmailProvider):
                 original_error=e
             )
 
+    def _send_one_prepared(self, prepare: Callable[[], tuple]) -> EmailResponseDTO:
+        """Like _send_prepared, but honour max_send_rate and report failures as a response."""
+        if self._rate_limiter is not None:
+            self._rate_limiter.wait()
+        try:
+            return self._send_prepared(prepare)
+        except EmailSendError as e:
+            return EmailResponseDTO(
+                success=False,
+                provider=self.__class__.__name__,
+                error=str(e)
+            )
+
+    def _send_pipelined(self, messages: list, prepare: Callable[[EmailMessageDto], tuple]) -> list:
+        responses = []
+
+        with ThreadPoolExecutor(max_workers=1) as builder:
+            upcoming = builder.submit(prepare, messages[0]) if messages else None
+
+            for index in range(len(messages)):
+                current = upcoming
+                if index + 1 < len(messages):
+                    upcoming = builder.submit(prepare, messages[index + 1])
+
+                responses.append(self._send_one_prepared(current.result))
+
+        return responses
+
+    def _deliver(self, from_addr: str, recipients: list, payload: bytes) -> None:
+        try:
+            with self._pool.connection() as server:
+                server.sendmail(from_addr, recipients, payload, mail_options=self._mail_options)
+        except smtplib.SMTPServerDisconnected:
+            # The pooled session dropped mid-send; retry once on a fresh
+            # connection with the bytes we already flattened
+            with self._pool.connection() as server:
+                server.sendmail(from_addr, recipients, payload, mail_options=self._mail_options)
+
+    def _build_simple(self, message: EmailMessageDto, recipients: bool = True) -> Optional[tuple]:
+        """
+        Assemble a plain single-part message as (head, body) wire bytes.
+
+        Produces the same bytes as flattening _build_message's MIMEText, without
+        going through email.message for the common case. Returns None when the
+        message has attachments, non-ASCII text, or a header that would be
+        folded, so the caller falls back to the MIME builder.
+        """
+        if message.attachments or not message.body.isascii():
+            return None
+
+        headers = [
+            ('Subject', message.subject),
+            ('From', message.from_email or self._default_from),
+        ]
+        if recipients:
+            headers.append(('To', ', '.join(message.to)))
+            if message.cc:
+                headers.append(('Cc', ', '.join(message.cc)))
+        if message.reply_to:
+            headers.append(('Reply-To', message.reply_to))
+        if message.headers:
+            headers.extend(message.headers.items())
+
+        lines = list(_SIMPLE_MIME_HEADERS[bool(message.html)])
+        append = lines.append
+        for name, value in headers:
+            if not isinstance(value, str):
+                return None
+            line = f'{name}: {value}'
+            if len(line) > _MAX_HEADER_LINE or not (line.isascii() and line.isprintable()):
+                return None
+            append(line)
+        append('')
+
+        # flatten_crlf writes every line ending in the body as CRLF
+        body = message.body.replace('\r\n', '\n').replace('\r', '\n').replace('\n', '\r\n')
+        return '\r\n'.join(lines).encode('ascii'), body.encode('ascii')
+
+    def _build_message(
+            self,
+            message: EmailMessageDto,
+            recipients: bool = True,
+            encode: Callable[[Any], str] = None
+    ) -> Message:
+        charset = self._body_charset(message.body)
+        body = MIMEText(message.body, _BODY_SUBTYPES[bool(message.html)], charset)
+
+        if message.attachments:
+            msg = MIMEMultipart('alternative')
+            msg.attach(body)
+            for attachment in message.attachments:
+                self._attach_file(msg, attachment, encode)
+        else:
+            # Without attachments the body is the whole message: no boundaries to write
+            msg = body
+
+        msg['Subject'] = message.subject
+        msg['From'] = message.from_email or self._default_from
+
+        if recipients:
+            msg['To'] = ', '.join(message.to)
+            if message.cc:
+                msg['Cc'] = ', '.join(message.cc)
+
+        if message.reply_to:
+            msg['Reply-To'] = message.reply_to
+
+        # BCC recipients only go on the envelope, never into the headers
+
+        # Add custom headers
+        if message.headers:
+            for key, value in message.headers.items():
+                msg[key] = value
+
+        return msg
+
+    def _body_charset(self, body: str):
+        """
+        Pure ASCII stays 7bit instead of being base64-encoded as utf-8. With
+        ``use_8bitmime`` other text is sent as raw UTF-8 when every line fits
+        the SMTP line limit, skipping base64 and its one-third size overhead.
+        """
+        if body.isascii():
+            return 'us-ascii'
+        if self._use_8bitmime and all(
+                len(line) <= _MAX_8BIT_LINE for line in body.encode('utf-8').splitlines()
+        ):
+            return _UTF8_8BIT
+        return 'utf-8'
+
+    @staticmethod
+    def _get_recipients(message: EmailMessageDto) -> list:
+        recipients = list(message.to)
+        if message.cc:
+            recipients.extend(message.cc)
+        if message.bcc:
+            recipients.extend(message.bcc)
+        return recipients
+
+    async def _bulk_worker_async(self, jobs, responses: list, prepare) -> None:
+        """Drain the shared job iterator over a single pinned connection."""
+        loop = asyncio.get_running_loop()
+        client = None
+        sent = 0
+
+        try:
+            for index, message in jobs:
+                try:
+                    if client is None:
+                        client = await self._get_async_connection()
+                        sent = 0
+
+                    # Encode off the event loop so other workers keep transmitting
+                    message_id, from_addr, recipients, payload = await loop.run_in_executor(
+                        None, prepare, message
+                    )
+                    if self._rate_limiter is not None:
+                        await self._rate_limiter.wait_async()
+                    await client.sendmail(
+                        from_addr, recipients, payload, mail_options=self._mail_options
+                    )
+                    responses[index] = EmailResponseDTO(
+                        success=True,
+                        message_id=message_id,
+                        provider='smtp'
+                    )
+                except Exception as e:
+                    responses[index] = EmailResponseDTO(
+                        success=False,
+                        provider=self.__class__.__name__,
+                        error=f"Failed to send email via SMTP: {str(e)}"
+                    )
+                    if client is None or not client.is_connected:
+                        client = None
+                        continue
+
+                sent += 1
+                if sent >= self._pool.max_messages_per_connection:
+                    await self._quit_async(client)
+                    client = None
+        finally:
+            if client is not None:
+                await self._quit_async(client)
+
+    async def _get_async_connection(self):
+        use_tls = self.config.get('use_tls', True)
+        use_ssl = self.config.get('use_ssl', False)
+
+        client = aiosmtplib.SMTP(
+            hostname=self.config['host'],
+            port=self.config['port'],
+            username=self.config['username'],
+            password=self.config['password'],
+            use_tls=use_ssl,
+            start_tls=use_tls and not use_ssl,
+            tls_context=self.config.get('ssl_context') or self._get_ssl_context()
+        )
+        await client.connect()
+        return client
+
+    @staticmethod
+    async def _quit_async(client) -> None:
+        try:
+            await client.quit()
+        except (aiosmtplib.SMTPException, OSError):
+            # Connection is already gone, nothing left to clean up
+            pass
 
     def _get_smtp_connection(self):
         use_tls = self.config.get('use_tls', True)
         use_ssl = self.config.get('use_ssl', False)
 
         if use_ssl:
-            context = ssl.create_default_context()
+            context = self.config.get('ssl_context') or self._get_ssl_context()
             server = smtplib.SMTP_SSL(
                 self.config['host'],
                 self.config['port'],
                 context=context
             )
+            self._set_tcp_nodelay(server)
         else:
             server = smtplib.SMTP(
                 self.config['host'],
                 self.config['port']
             )
+            self._set_tcp_nodelay(server)
 
             if use_tls:
-                context = ssl.create_default_context()
+                context = self.config.get('ssl_context') or self._get_ssl_context()
                 server.starttls(context=context)
 
         server.login(self.config['username'], self.config['password'])
         return server
 
-    def _attach_file(self, msg: MIMEMultipart, attachment) -> None:
-        if isinstance(attachment, Path):
-            with open(attachment, 'rb') as f:
-                part = MIMEBase('application', 'octet-stream')
-                part.set_payload(f.read())
+    @classmethod
+    def _get_ssl_context(cls) -> ssl.SSLContext:
+        """Build the default SSL context once; loading the CA bundle is expensive."""
+        if cls._SSL_CONTEXT is None:
+            context = ssl.create_default_context()
+            # Already the default from Python 3.10; older versions still allow TLS 1.0/1.1
+            context.minimum_version = ssl.TLSVersion.TLSv1_2
+            cls._SSL_CONTEXT = context
+        return cls._SSL_CONTEXT
+
+    def _set_tcp_nodelay(self, server) -> None:
+        """Disable Nagle's algorithm so small SMTP commands are not held back."""
+        if not self.config.get('tcp_nodelay', True):
+            return
+
+        try:
+            server.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except (AttributeError, OSError):
+            # Not a TCP socket - nothing to tune
+            pass
 
-            encoders.encode_base64(part)
+    def _attach_file(
+            self,
+            msg: MIMEMultipart,
+            attachment,
+            encode: Callable[[Any], str] = None
+    ) -> None:
+        encode = encode or self._encode_attachment
+        if isinstance(attachment, Path):
+            part = MIMEBase('application', 'octet-stream')
+            part.set_payload(encode(attachment))
+            part['Content-Transfer-Encoding'] = 'base64'
             part.add_header(
                 'Content-Disposition',
                 f'attachment; filename={attachment.name}'
@@ -116,12 +686,20 @@ class SMTPProvider(BaseEmailProvider):
             filename, content, mimetype = attachment
             maintype, subtype = mimetype.split('/', 1)
             part = MIMEBase(maintype, subtype)
-            if isinstance(content, str):
-                content = content.encode()
-            part.set_payload(content)
-            encoders.encode_base64(part)
+            part.set_payload(encode(attachment))
+            part['Content-Transfer-Encoding'] = 'base64'
             part.add_header(
                 'Content-Disposition',
                 f'attachment; filename={filename}'
             )
             msg.attach(part)
+
+    @staticmethod
+    def _encode_attachment(attachment) -> str:
+        """Base64 payload of a Path or (filename, content, mimetype) attachment."""
+        if isinstance(attachment, Path):
+            return encode_file_base64(attachment, wrap=True)
+        content = attachment[1]
+        if isinstance(content, str):
+            content = content.encode()
+        return encode_base64(content, wrap=True)
@@ -0,0 +1,53 @@
+"""Outbound send-rate limiting shared by the providers."""
+import asyncio
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from mailbridge.exceptions import ConfigurationError
+
+
+class RateLimiter:
+    """
+    Space calls at least ``1 / rate`` seconds apart across threads and tasks.
+
+    Each caller reserves the next free slot under a lock and sleeps outside
+    it, so waiting callers never hold each other up on the lock. The schedule
+    is kept in integer nanoseconds from ``time.monotonic_ns``, so it does not
+    drift over long bulk sends and is unaffected by wall-clock changes.
+    """
+
+    def __init__(self, rate: float):
+        self._interval = round(1e9 / rate)
+        self._next = time.monotonic_ns()
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """Block the calling thread until its send slot comes up."""
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def wait_async(self) -> None:
+        """Like ``wait``, but suspend only the calling task."""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _reserve(self) -> float:
+        """Claim the next slot and return the seconds left until it starts."""
+        with self._lock:
+            now = time.monotonic_ns()
+            start = max(now, self._next)
+            self._next = start + self._interval
+        return (start - now) / 1e9
+
+
+def rate_limiter_from_config(config: Dict[str, Any], provider: str) -> Optional[RateLimiter]:
+    """Build the limiter for a provider's ``max_send_rate`` option, if set."""
+    rate = config.get('max_send_rate')
+    if rate is None:
+        return None
+    if isinstance(rate, bool) or not isinstance(rate, (int, float)) or rate <= 0:
+        raise ConfigurationError(f"{provider} 'max_send_rate' must be a positive number")
+    return RateLimiter(rate)
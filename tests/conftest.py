@@ -0,0 +1,142 @@
+"""
+Shared fixtures for the provider test suites.
+
+Providers hold no state beyond their config and every network call is
+mocked, so the HTTP providers and the common message are built once per
+session. The SMTP provider is shared too, with its connection pool drained
+after each test. Provider-specific fixtures (template messages, mock
+responses) stay in their own test modules.
+"""
+
+import io
+from pathlib import Path
+from types import MappingProxyType
+
+import pytest
+
+from mailbridge.dto.email_message_dto import EmailMessageDto
+from mailbridge.providers.mailgun_provider import MailgunProvider
+from mailbridge.providers.postmark_provider import PostmarkProvider
+from mailbridge.providers.sendgrid_provider import SendGridProvider
+from mailbridge.providers.smtp_provider import SMTPProvider
+
+
+# =============================================================================
+# MESSAGES
+# =============================================================================
+
+@pytest.fixture(scope='session')
+def simple_message():
+    """Simple email message fixture."""
+    return EmailMessageDto(
+        to='recipient@example.com',
+        subject='Test Email',
+        body='<h1>Hello World</h1>',
+        html=True
+    )
+
+
+@pytest.fixture(scope='session')
+def sample_attachment_file(tmp_path_factory):
+    """Read-only text attachment written once per session."""
+    path = tmp_path_factory.mktemp('attachments') / 'test.txt'
+    path.write_text('Test content')
+    return path
+
+
+@pytest.fixture
+def in_memory_files(monkeypatch):
+    """Serve a provider module's attachment reads from memory.
+
+    Call ``in_memory_files(module, {'name.txt': b'...'})``; ``open()`` inside
+    that module then returns a BytesIO keyed on the path's file name.
+    """
+    def install(module, contents):
+        def fake_open(path, mode='r'):
+            return io.BytesIO(contents[Path(path).name])
+        monkeypatch.setattr(module, 'open', fake_open, raising=False)
+    return install
+
+
+# =============================================================================
+# PROVIDERS
+# =============================================================================
+
+@pytest.fixture(scope='session')
+def mailgun_config():
+    """Valid Mailgun config."""
+    return {
+        'api_key': 'key-test-123',
+        'endpoint': 'https://api.mailgun.net/v3/example.com',
+        'from_email': 'no-reply@example.com',
+    }
+
+
+@pytest.fixture(scope='session')
+def mailgun_provider(mailgun_config):
+    """Mailgun provider fixture."""
+    return MailgunProvider(**mailgun_config)
+
+
+@pytest.fixture(scope='session')
+def postmark_config():
+    """Postmark configuration fixture."""
+    return {
+        'server_token': 'test-server-token-12345',
+        'from_email': 'sender@example.com'
+    }
+
+
+@pytest.fixture(scope='session')
+def postmark_provider(postmark_config):
+    """Postmark provider fixture."""
+    return PostmarkProvider(**postmark_config)
+
+
+@pytest.fixture(scope='session')
+def sendgrid_config():
+    """SendGrid configuration fixture."""
+    return {
+        'api_key': 'SG.test_api_key_12345',
+        'from_email': 'sender@example.com'
+    }
+
+
+@pytest.fixture(scope='session')
+def sendgrid_provider(sendgrid_config):
+    """SendGrid provider fixture."""
+    return SendGridProvider(**sendgrid_config)
+
+
+# Read-only: the session-wide SMTP provider is built from it
+_SMTP_CONFIG = MappingProxyType({
+    'host': 'smtp.example.com',
+    'port': 587,
+    'username': 'user@example.com',
+    'password': 'password123',
+    'from_email': 'sender@example.com',
+    'use_tls': True,
+    'use_ssl': False
+})
+
+
+@pytest.fixture
+def smtp_config():
+    """SMTP configuration fixture; a fresh copy, since tests tweak it."""
+    return dict(_SMTP_CONFIG)
+
+
+@pytest.fixture(scope='session')
+def _shared_smtp_provider():
+    return SMTPProvider(**_SMTP_CONFIG)
+
+
+@pytest.fixture
+def smtp_provider(_shared_smtp_provider):
+    """SMTP provider fixture.
+
+    Shared across the session; idle pooled connections are closed after each
+    test so the next one starts from an empty pool with its own SMTP mock.
+    """
+    yield _shared_smtp_provider
+    _shared_smtp_provider.close()
@@ -0,0 +1,15 @@
+"""Plain test helpers shared by the provider test suites."""
+
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True)
+class FakeResp:
+    """Minimal stand-in for requests.Response in mocked HTTP calls."""
+    status_code: int = 200
+    _json: dict = field(default_factory=dict)
+    text: str = ''
+    headers: dict = field(default_factory=dict)
+
+    def json(self):
+        return self._json
@@ -14,13 +14,16 @@ Run with: pytest tests/test_brevo_provider.py -v
 """
 
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import patch
 import base64
+from pathlib import Path
 
 from mailbridge.providers.brevo_provider import BrevoProvider
+from mailbridge.providers import brevo_provider as brevo_provider_module
 from mailbridge.dto.email_message_dto import EmailMessageDto
 from mailbridge.dto.bulk_email_dto import BulkEmailDTO
 from mailbridge.exceptions import ConfigurationError, EmailSendError
+from tests.helpers import FakeResp
 
 
 # =============================================================================
@@ -69,10 +72,7 @@ def template_message():
 @pytest.fixture
 def mock_response_success():
     """Mock successful Brevo response."""
-    mock_resp = Mock()
-    mock_resp.status_code = 201
-    mock_resp.json.return_value = {'messageId': 'brevo_message_123'}
-    return mock_resp
+    return FakeResp(status_code=201, _json={'messageId': 'brevo_message_123'})
 
 
 # =============================================================================
@@ -105,7 +105,7 @@ class TestBrevoConfiguration:
 class TestBrevoRegularEmail:
     """Test sending of regular Brevo emails."""
 
-    @patch('mailbridge.providers.brevo_provider.requests.post')
+    @patch.object(brevo_provider_module.requests, 'post')
     def test_send_simple_email(self, mock_post, brevo_provider, simple_message, mock_response_success):
         mock_post.return_value = mock_response_success
 
@@ -127,7 +127,7 @@ class TestBrevoRegularEmail:
         assert payload['subject'] == 'Test Email'
         assert payload['htmlContent'] == '<h1>Hello Brevo</h1>'
 
-    @patch('mailbridge.providers.brevo_provider.requests.post')
+    @patch.object(brevo_provider_module.requests, 'post')
     def test_send_with_cc_bcc_replyto(self, mock_post, brevo_provider, mock_response_success):
         mock_post.return_value = mock_response_success
 
@@ -148,7 +148,7 @@ class TestBrevoRegularEmail:
         assert payload['bcc'][0]['email'] == 'bcc1@example.com'
         assert payload['replyTo']['email'] == 'reply@example.com'
 
-    @patch('mailbridge.providers.brevo_provider.requests.post')
+    @patch.object(brevo_provider_module.requests, 'post')
     def test_send_with_headers(self, mock_post, brevo_provider, mock_response_success):
         mock_post.return_value = mock_response_success
 
@@ -163,7 +163,7 @@ class TestBrevoRegularEmail:
         payload = mock_post.call_args[1]['json']
         assert payload['headers']['X-Custom'] == 'Yes'
 
-    @patch('mailbridge.providers.brevo_provider.requests.post')
+    @patch.object(brevo_provider_module.requests, 'post')
     def test_send_plain_text(self, mock_post, brevo_provider, mock_response_success):
         mock_post.return_value = mock_response_success
 
@@ -179,12 +179,12 @@ class TestBrevoRegularEmail:
         assert payload['textContent'] == 'Plain body'
         assert 'htmlContent' not in payload
 
-    @patch('mailbridge.providers.brevo_provider.requests.post')
-    def test_send_with_attachment_file(self, mock_post, brevo_provider, mock_response_success, tmp_path):
+    @patch.object(brevo_provider_module.requests, 'post')
+    def test_send_with_attachment_file(self, mock_post, brevo_provider, mock_response_success, in_memory_files):
         mock_post.return_value = mock_response_success
 
-        test_file = tmp_path / "test.txt"
-        test_file.write_text("File content")
+        test_file = Path("test.txt")
+        in_memory_files(brevo_provider_module, {"test.txt": b"File content"})
 
         message = EmailMessageDto(
             to='recipient@example.com',
@@ -200,7 +200,7 @@ class TestBrevoRegularEmail:
         decoded = base64.b64decode(payload['attachment'][0]['content']).decode()
         assert decoded == 'File content'
 
-    @patch('mailbridge.providers.brevo_provider.requests.post')
+    @patch.object(brevo_provider_module.requests, 'post')
     def test_send_with_tuple_attachment(self, mock_post, brevo_provider, mock_response_success):
         mock_post.return_value = mock_response_success
 
@@ -218,19 +218,19 @@ class TestBrevoRegularEmail:
         decoded = base64.b64decode(payload['attachment'][0]['content']).decode()
         assert decoded == 'data123'
 
-    @patch('mailbridge.providers.brevo_provider.requests.post')
+    @patch.object(brevo_provider_module.requests, 'post')
     def test_send_api_error(self, mock_post, brevo_provider, simple_message):
-        mock_resp = Mock()
-        mock_resp.status_code = 400
-        mock_resp.json.return_value = {'code': 'invalid_email', 'message': 'Invalid email address'}
-        mock_post.return_value = mock_resp
+        mock_post.return_value = FakeResp(
+            status_code=400,
+            _json={'code': 'invalid_email', 'message': 'Invalid email address'}
+        )
 
         with pytest.raises(EmailSendError) as exc:
             brevo_provider.send(simple_message)
         assert 'Brevo API error' in str(exc.value)
         assert 'invalid_email' in str(exc.value)
 
-    @patch('mailbridge.providers.brevo_provider.requests.post')
+    @patch.object(brevo_provider_module.requests, 'post')
     def test_send_network_error(self, mock_post, brevo_provider, simple_message):
         import requests
         mock_post.side_effect = requests.ConnectionError('Network down')
@@ -247,7 +247,7 @@ class TestBrevoRegularEmail:
 class TestBrevoTemplateEmail:
     """Test template email sending."""
 
-    @patch('mailbridge.providers.brevo_provider.requests.post')
+    @patch.object(brevo_provider_module.requests, 'post')
     def test_send_template_email(self, mock_post, brevo_provider, template_message, mock_response_success):
         mock_post.return_value = mock_response_success
 
@@ -258,7 +258,7 @@ class TestBrevoTemplateEmail:
         assert payload['templateId'] == 12
         assert payload['params'] == {'name': 'John Doe', 'company': 'Acme Corp'}
 
-    @patch('mailbridge.providers.brevo_provider.requests.post')
+    @patch.object(brevo_provider_module.requests, 'post')
     def test_template_with_empty_data(self, mock_post, brevo_provider, mock_response_success):
         mock_post.return_value = mock_response_success
 
@@ -283,12 +283,12 @@ class TestBrevoTemplateEmail:
 class TestBrevoBulkEmail:
     """Test bulk email sending."""
 
-    @patch('mailbridge.providers.brevo_provider.requests.post')
+    @patch.object(brevo_provider_module.requests, 'post')
     def test_send_bulk_success(self, mock_post, brevo_provider):
-        mock_resp = Mock()
-        mock_resp.status_code = 201
-        mock_resp.json.return_value = {'messageId': ['msg1', 'msg2', 'msg3']}
-        mock_post.return_value = mock_resp
+        mock_post.return_value = FakeResp(
+            status_code=201,
+            _json={'messageId': ['msg1', 'msg2', 'msg3']}
+        )
 
         messages = [
             EmailMessageDto(to='a@example.com', subject='S1', body='Body1'),
@@ -304,12 +304,12 @@ class TestBrevoBulkEmail:
         assert result.failed == 0
         assert mock_post.call_count == 1
 
-    @patch('mailbridge.providers.brevo_provider.requests.post')
+    @patch.object(brevo_provider_module.requests, 'post')
     def test_send_bulk_api_error(self, mock_post, brevo_provider):
-        mock_resp = Mock()
-        mock_resp.status_code = 400
-        mock_resp.json.return_value = {'code': 'invalid_data', 'message': 'Bad payload'}
-        mock_post.return_value = mock_resp
+        mock_post.return_value = FakeResp(
+            status_code=400,
+            _json={'code': 'invalid_data', 'message': 'Bad payload'}
+        )
 
         bulk = BulkEmailDTO(messages=[
             EmailMessageDto(to='a@example.com', subject='S1', body='Body1')
@@ -349,9 +349,9 @@ class TestBrevoHelpers:
         assert payload['templateId'] == 88
         assert payload['params'] == {'x': 'y'}
 
-    def test_build_attachments(self, brevo_provider, tmp_path):
-        file_path = tmp_path / "a.txt"
-        file_path.write_text("content")
+    def test_build_attachments(self, brevo_provider, in_memory_files):
+        file_path = Path("a.txt")
+        in_memory_files(brevo_provider_module, {"a.txt": b"content"})
 
         result = brevo_provider._build_attachments([file_path])
         assert len(result) == 1
@@ -0,0 +1,111 @@
+"""
+Unit tests for the shared payload encoding helpers.
+
+Tests cover:
+- Compact UTF-8 JSON with and without orjson
+- Values orjson rejects by default
+- Wrapped and unwrapped base64 for files and in-memory data
+- CRLF message flattening with non-ASCII headers
+
+Run with: pytest tests/test_encoding.py -v
+"""
+
+import base64
+import json
+import pytest
+from email.mime.text import MIMEText
+from unittest.mock import patch
+
+from mailbridge import _encoding
+from mailbridge._encoding import dumps, encode_base64, encode_file_base64, flatten_crlf
+
+ORJSON_PARAMS = [
+    pytest.param(True, marks=pytest.mark.skipif(
+        not _encoding.ORJSON_AVAILABLE, reason='orjson not installed'
+    )),
+    False,
+]
+
+
+# =============================================================================
+# JSON TESTS
+# =============================================================================
+
+class TestDumps:
+    """Test JSON serialization."""
+
+    @pytest.mark.parametrize('orjson_available', ORJSON_PARAMS, ids=['orjson', 'stdlib'])
+    def test_dumps_compact_utf8(self, orjson_available):
+        """Test payloads serialize to compact UTF-8 JSON with or without orjson."""
+        payload = {'subject': 'Zdravo svete — ćao', 'personalizations': [{'to': [{'email': 'a@b.com'}]}]}
+
+        with patch.object(_encoding, 'ORJSON_AVAILABLE', orjson_available):
+            body = dumps(payload)
+
+        assert isinstance(body, bytes)
+        assert json.loads(body) == payload
+        assert b', ' not in body and b'": ' not in body
+        assert 'ć'.encode('utf-8') in body
+
+    @pytest.mark.parametrize('orjson_available', ORJSON_PARAMS, ids=['orjson', 'stdlib'])
+    @pytest.mark.parametrize('data,expected', [
+        ({1: 'a'}, {'1': 'a'}),
+        ({'big': 2 ** 70}, {'big': 2 ** 70}),
+        ({1: 2 ** 70}, {'1': 2 ** 70}),
+    ], ids=['int-key', 'big-int', 'both'])
+    def test_dumps_matches_json(self, orjson_available, data, expected):
+        """Test non-str keys and ints wider than 64 bits encode as json would."""
+        with patch.object(_encoding, 'ORJSON_AVAILABLE', orjson_available):
+            body = dumps(data)
+
+        assert json.loads(body) == expected
+
+
+# =============================================================================
+# BASE64 TESTS
+# =============================================================================
+
+class TestBase64:
+    """Test base64 encoding of attachment data."""
+
+    @pytest.mark.parametrize('size', [0, 1, 56, 57, 58, 570, 1000])
+    @pytest.mark.parametrize('wrap,expected', [
+        (False, lambda data: base64.b64encode(data).decode()),
+        (True, lambda data: base64.encodebytes(data).decode().rstrip('\n')),
+    ], ids=['single-line', 'wrapped'])
+    def test_encode_file_matches_stdlib(self, tmp_path, monkeypatch, size, wrap, expected):
+        """Test chunked file encoding matches encoding the whole file at once."""
+        data = bytes(range(256)) * 4
+        path = tmp_path / 'blob.bin'
+        path.write_bytes(data[:size])
+        monkeypatch.setattr(_encoding, 'FILE_CHUNK_SIZE', 114)
+
+        assert encode_file_base64(path, wrap=wrap) == expected(data[:size])
+
+    def test_encode_base64(self):
+        """Test in-memory data is wrapped at 76 characters only when asked."""
+        data = bytes(range(256))
+
+        assert encode_base64(data) == base64.b64encode(data).decode()
+        assert encode_base64(data, wrap=True) == base64.encodebytes(data).decode()
+
+
+# =============================================================================
+# MESSAGE TESTS
+# =============================================================================
+
+class TestFlattenCrlf:
+    """Test flattening MIME messages to wire bytes."""
+
+    def test_flatten_crlf(self):
+        """Test every line ends in CRLF and non-ASCII headers are RFC 2047-encoded."""
+        msg = MIMEText('line one\nline two', 'plain', 'us-ascii')
+        msg['Subject'] = 'Héllo'
+        msg['X-Name'] = 'Zoë'
+
+        raw = flatten_crlf(msg)
+
+        assert raw.isascii()
+        assert raw.count(b'\n') == raw.count(b'\r\n')
+        assert b'Subject: =?utf-8?b?SMOpbGxv?=\r\n' in raw
+        assert raw.endswith(b'\r\n\r\nline one\r\nline two')
@@ -1,14 +1,19 @@
 """
-Unit tests for MailBridge client class - FINAL WORKING VERSION
+Unit tests for MailBridge client class.
 
-The key insight: We must mock the provider class IN the MailBridge.PROVIDERS dict
-BEFORE instantiating MailBridge, not the module-level class.
+Mock providers are registered in the MailBridge._CUSTOM_PROVIDERS overlay
+(which shadows the built-ins) before MailBridge is instantiated, rather
+than patching the module-level provider classes.
 
 Run with: pytest tests/test_mailbridge_client.py -v
 """
 
+import sys
+import threading
+import time
 import pytest
-from unittest.mock import Mock, MagicMock
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, MagicMock, patch
 from pathlib import Path
 
 from mailbridge.client import MailBridge
@@ -24,13 +29,8 @@ from mailbridge.providers.base_email_provider import BaseEmailProvider
 # HELPER FUNCTIONS
 # =============================================================================
 
-def create_mock_provider_class():
-    """
-    Create a mock provider CLASS (not instance) that returns a mock provider instance.
-
-    This simulates: SendGridProvider(**config) -> returns mock instance
-    """
-    mock_instance = Mock(spec=BaseEmailProvider)
+def configure_mock_provider(mock_instance):
+    """Apply the default return values every test starts from."""
     mock_instance.send.return_value = EmailResponseDTO(
         success=True,
         message_id='test-message-id-123',
@@ -44,12 +44,122 @@ def create_mock_provider_class():
     mock_instance.supports_bulk_sending.return_value = True
     mock_instance.close.return_value = None
 
+
+def create_mock_provider_class():
+    """
+    Create a mock provider CLASS (not instance) that returns a mock provider instance.
+
+    This simulates: SendGridProvider(**config) -> returns mock instance
+    """
+    mock_instance = Mock(spec_set=BaseEmailProvider)
+    configure_mock_provider(mock_instance)
+
     # Create a mock CLASS that returns the mock instance when called
     mock_class = Mock(return_value=mock_instance)
 
     return mock_class, mock_instance
 
 
+class CustomProvider(BaseEmailProvider):
+    """Minimal concrete provider used by the registration tests."""
+
+    def _validate_config(self):
+        pass
+
+    def send(self, message):
+        return EmailResponseDTO(success=True, provider='custom')
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+@pytest.fixture
+def isolated_providers():
+    """Undo any custom provider registrations the test makes."""
+    saved = dict(MailBridge._CUSTOM_PROVIDERS)
+    yield
+    MailBridge._CUSTOM_PROVIDERS.clear()
+    MailBridge._CUSTOM_PROVIDERS.update(saved)
+
+
+@pytest.fixture(scope='module')
+def sample_messages():
+    """Two plain messages; only for tests that don't apply default_from or tags."""
+    return [
+        EmailMessageDto(to='user1@example.com', subject='Test 1', body='Body 1'),
+        EmailMessageDto(to='user2@example.com', subject='Test 2', body='Body 2'),
+    ]
+
+
+@pytest.fixture(scope='module')
+def sample_bulk_response():
+    """Bulk result with two successful sends."""
+    return BulkEmailResponseDTO.from_responses([
+        EmailResponseDTO(success=True, message_id='msg1', provider='sendgrid'),
+        EmailResponseDTO(success=True, message_id='msg2', provider='sendgrid'),
+    ])
+
+
+@pytest.fixture(scope='module')
+def single_bulk_response():
+    """Bulk result with one successful send."""
+    return BulkEmailResponseDTO.from_responses([
+        EmailResponseDTO(success=True, message_id='msg1', provider='sendgrid'),
+    ])
+
+
+@pytest.fixture(scope='class')
+def _class_mailer():
+    """One mailer per test class, backed by its own mock provider."""
+    mock_class, _ = create_mock_provider_class()
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setitem(MailBridge._CUSTOM_PROVIDERS, 'smtp', mock_class)
+        return MailBridge(
+            provider='smtp',
+            host='smtp.example.com',
+            port=587,
+            username='user',
+            password='pass'
+        )
+
+
+@pytest.fixture
+def mailer(_class_mailer):
+    """The class's mailer; its mock provider is reset after every test."""
+    yield _class_mailer
+    _class_mailer.provider.reset_mock(return_value=True, side_effect=True)
+    configure_mock_provider(_class_mailer.provider)
+
+
+@pytest.fixture
+def mock_sendgrid(monkeypatch):
+    """Replace the SendGrid provider with a mock; restored automatically on teardown."""
+    mock_class, mock_instance = create_mock_provider_class()
+    monkeypatch.setitem(MailBridge._CUSTOM_PROVIDERS, 'sendgrid', mock_class)
+    return mock_class, mock_instance
+
+
+# =============================================================================
+# MOCK PROVIDER TESTS
+# =============================================================================
+
+class TestMockProvider:
+    """Guard the shared mock against drifting from the provider interface."""
+
+    pytestmark = pytest.mark.xdist_group(name='mailbridge_mock')
+
+    def test_mock_has_no_unexpected_attrs(self):
+        """Test the mock only exposes attributes BaseEmailProvider defines."""
+        _, mock_instance = create_mock_provider_class()
+
+        assert hasattr(mock_instance, 'send')
+        assert hasattr(mock_instance, 'foo') is False
+
+        with pytest.raises(AttributeError):
+            mock_instance.foo = 'bar'
+
+
 # =============================================================================
 # INITIALIZATION TESTS
 # =============================================================================
@@ -57,57 +167,52 @@ def create_mock_provider_class():
 class TestMailBridgeInitialization:
     """Test MailBridge initialization."""
 
-    def test_initialize_with_sendgrid(self):
-        """Test initializing with SendGrid provider."""
-        mock_class, mock_instance = create_mock_provider_class()
+    pytestmark = pytest.mark.xdist_group(name='mailbridge_init')
 
-        # Store original and replace
-        original = MailBridge.PROVIDERS['sendgrid']
-        MailBridge.PROVIDERS['sendgrid'] = mock_class
+    def test_initialize_with_sendgrid(self, mock_sendgrid):
+        """Test initializing with SendGrid provider."""
+        mock_class, mock_instance = mock_sendgrid
 
-        try:
-            mailer = MailBridge(provider='sendgrid', api_key='test-key')
+        mailer = MailBridge(provider='sendgrid', api_key='test-key')
 
-            # Should call mock class with config
-            mock_class.assert_called_once_with(api_key='test-key')
-            assert mailer.provider_name == 'sendgrid'
-            assert mailer.provider == mock_instance
-        finally:
-            # Restore original
-            MailBridge.PROVIDERS['sendgrid'] = original
+        # Should call mock class with config
+        mock_class.assert_called_once_with(api_key='test-key')
+        assert mailer.provider_name == 'sendgrid'
+        assert mailer.provider == mock_instance
 
-    def test_initialize_with_mailgun(self):
+    def test_initialize_with_mailgun(self, monkeypatch):
         """Test initializing with Mailgun provider."""
-        mock_class, mock_instance = create_mock_provider_class()
-
-        original = MailBridge.PROVIDERS['mailgun']
-        MailBridge.PROVIDERS['mailgun'] = mock_class
+        mock_class, _ = create_mock_provider_class()
+        monkeypatch.setitem(MailBridge._CUSTOM_PROVIDERS, 'mailgun', mock_class)
 
-        try:
-            mailer = MailBridge(provider='mailgun', api_key='key', domain='example.com')
+        mailer = MailBridge(provider='mailgun', api_key='key', domain='example.com')
 
-            mock_class.assert_called_once_with(api_key='key', domain='example.com')
-            assert mailer.provider_name == 'mailgun'
-        finally:
-            MailBridge.PROVIDERS['mailgun'] = original
+        mock_class.assert_called_once_with(api_key='key', domain='example.com')
+        assert mailer.provider_name == 'mailgun'
 
-    def test_case_insensitive_provider_name(self):
+    def test_case_insensitive_provider_name(self, mock_sendgrid):
         """Test provider name is case-insensitive."""
-        mock_class, _ = create_mock_provider_class()
+        mailer1 = MailBridge(provider='SendGrid', api_key='key')
+        mailer2 = MailBridge(provider='SENDGRID', api_key='key')
+        mailer3 = MailBridge(provider='sendgrid', api_key='key')
+
+        assert mailer1.provider_name == 'sendgrid'
+        assert mailer2.provider_name == 'sendgrid'
+        assert mailer3.provider_name == 'sendgrid'
 
-        original = MailBridge.PROVIDERS['sendgrid']
-        MailBridge.PROVIDERS['sendgrid'] = mock_class
+    def test_provider_name_normalized_once(self, mock_sendgrid):
+        """Test the provider name is case-folded exactly once per construction."""
+        class TrackedStr(str):
+            calls = 0
 
-        try:
-            mailer1 = MailBridge(provider='SendGrid', api_key='key')
-            mailer2 = MailBridge(provider='SENDGRID', api_key='key')
-            mailer3 = MailBridge(provider='sendgrid', api_key='key')
+            def casefold(self):
+                TrackedStr.calls += 1
+                return super().casefold()
 
-            assert mailer1.provider_name == 'sendgrid'
-            assert mailer2.provider_name == 'sendgrid'
-            assert mailer3.provider_name == 'sendgrid'
-        finally:
-            MailBridge.PROVIDERS['sendgrid'] = original
+        mailer = MailBridge(provider=TrackedStr('SendGrid'), api_key='key')
+
+        assert mailer.provider_name == 'sendgrid'
+        assert TrackedStr.calls == 1
 
     def test_invalid_provider_raises_error(self):
         """Test initializing with invalid provider raises error."""
@@ -128,222 +233,193 @@ class TestMailBridgeInitialization:
         assert 'brevo' in providers
         assert 'smtp' in providers
 
+    def test_available_providers_is_cached(self):
+        """Test repeated calls return the same cached tuple."""
+        assert MailBridge.available_providers() is MailBridge.available_providers()
+
 
 # =============================================================================
-# SEND METHOD TESTS
+# SHARED PROVIDER TESTS
 # =============================================================================
 
-class TestMailBridgeSend:
-    """Test MailBridge send() method."""
-
-    def test_send_simple_email(self):
-        """Test sending a simple email."""
-        mock_class, mock_instance = create_mock_provider_class()
-        mock_instance.send.return_value = EmailResponseDTO(
-            success=True,
-            message_id='msg-123',
-            provider='sendgrid'
-        )
-
-        original = MailBridge.PROVIDERS['sendgrid']
-        MailBridge.PROVIDERS['sendgrid'] = mock_class
-
-        try:
-            mailer = MailBridge(provider='sendgrid', api_key='key')
-
-            response = mailer.send(
-                to='recipient@example.com',
-                subject='Test Email',
-                body='<h1>Hello</h1>'
-            )
-
-            assert response.success is True
-            assert response.message_id == 'msg-123'
-
-            mock_instance.send.assert_called_once()
-
-            call_args = mock_instance.send.call_args[0][0]
-            assert isinstance(call_args, EmailMessageDto)
-            assert call_args.to == ['recipient@example.com']
-            assert call_args.subject == 'Test Email'
-            assert call_args.body == '<h1>Hello</h1>'
-            assert call_args.html is True
-        finally:
-            MailBridge.PROVIDERS['sendgrid'] = original
-
-    def test_send_with_multiple_recipients(self):
-        """Test sending to multiple recipients."""
-        mock_class, mock_instance = create_mock_provider_class()
+class TestMailBridgeSharedProvider:
+    """Test opt-in provider reuse across MailBridge instances."""
 
-        original = MailBridge.PROVIDERS['sendgrid']
-        MailBridge.PROVIDERS['sendgrid'] = mock_class
+    pytestmark = pytest.mark.xdist_group(name='mailbridge_shared')
 
-        try:
-            mailer = MailBridge(provider='sendgrid', api_key='key')
+    @pytest.fixture(autouse=True)
+    def empty_provider_cache(self, monkeypatch):
+        monkeypatch.setattr(MailBridge, '_provider_cache', {})
 
-            response = mailer.send(
-                to=['user1@example.com', 'user2@example.com'],
-                subject='Test',
-                body='Body'
-            )
+    def test_same_config_shares_provider(self, mock_sendgrid):
+        """Test identical config reuses the first provider instance."""
+        mock_class, _ = mock_sendgrid
 
-            assert response.success is True
+        mailer1 = MailBridge(provider='sendgrid', share_provider=True, api_key='k')
+        mailer2 = MailBridge(provider='SendGrid', share_provider=True, api_key='k')
 
-            call_args = mock_instance.send.call_args[0][0]
-            assert call_args.to == ['user1@example.com', 'user2@example.com']
-        finally:
-            MailBridge.PROVIDERS['sendgrid'] = original
+        assert mailer1.provider is mailer2.provider
+        mock_class.assert_called_once_with(api_key='k')
 
-    def test_send_with_cc_bcc(self):
-        """Test sending with CC and BCC."""
-        mock_class, mock_instance = create_mock_provider_class()
+    def test_different_config_gets_own_provider(self, mock_sendgrid):
+        """Test a different config builds a separate provider."""
+        mock_class, _ = mock_sendgrid
 
-        original = MailBridge.PROVIDERS['sendgrid']
-        MailBridge.PROVIDERS['sendgrid'] = mock_class
+        MailBridge(provider='sendgrid', share_provider=True, api_key='k1')
+        MailBridge(provider='sendgrid', share_provider=True, api_key='k2')
 
-        try:
-            mailer = MailBridge(provider='sendgrid', api_key='key')
+        assert mock_class.call_count == 2
 
-            response = mailer.send(
-                to='recipient@example.com',
-                subject='Test',
-                body='Body',
-                cc=['cc@example.com'],
-                bcc=['bcc@example.com']
-            )
-
-            assert response.success is True
+    def test_not_shared_by_default(self, mock_sendgrid):
+        """Test providers are only shared when asked for."""
+        mock_class, _ = mock_sendgrid
 
-            call_args = mock_instance.send.call_args[0][0]
-            assert call_args.cc == ['cc@example.com']
-            assert call_args.bcc == ['bcc@example.com']
-        finally:
-            MailBridge.PROVIDERS['sendgrid'] = original
-
-    def test_send_with_attachments(self, tmp_path):
-        """Test sending with attachments."""
-        mock_class, mock_instance = create_mock_provider_class()
-
-        test_file = tmp_path / "document.pdf"
-        test_file.write_bytes(b'PDF content')
+        MailBridge(provider='sendgrid', api_key='k')
+        MailBridge(provider='sendgrid', api_key='k')
 
-        original = MailBridge.PROVIDERS['sendgrid']
-        MailBridge.PROVIDERS['sendgrid'] = mock_class
+        assert mock_class.call_count == 2
+        assert MailBridge._provider_cache == {}
 
-        try:
-            mailer = MailBridge(provider='sendgrid', api_key='key')
+    def test_unhashable_config_is_not_cached(self, mock_sendgrid):
+        """Test config with unhashable values falls back to a fresh provider."""
+        mock_class, _ = mock_sendgrid
 
-            response = mailer.send(
-                to='recipient@example.com',
-                subject='With Attachment',
-                body='See attached',
-                attachments=[test_file]
-            )
+        MailBridge(provider='sendgrid', share_provider=True, api_key='k', categories=['a'])
+        MailBridge(provider='sendgrid', share_provider=True, api_key='k', categories=['a'])
 
-            assert response.success is True
+        assert mock_class.call_count == 2
 
-            call_args = mock_instance.send.call_args[0][0]
-            assert call_args.attachments == [test_file]
-        finally:
-            MailBridge.PROVIDERS['sendgrid'] = original
+    def test_concurrent_instances_build_one_provider(self, mock_sendgrid):
+        """Test racing share_provider=True callers construct the provider only once."""
+        mock_class, mock_instance = mock_sendgrid
+        start = threading.Barrier(8)
 
-    def test_send_plain_text(self):
-        """Test sending plain text email."""
-        mock_class, mock_instance = create_mock_provider_class()
+        def slow_provider(**config):
+            # Widen the window between the cache miss and the insert
+            time.sleep(0.01)
+            return mock_instance
 
-        original = MailBridge.PROVIDERS['sendgrid']
-        MailBridge.PROVIDERS['sendgrid'] = mock_class
+        mock_class.side_effect = slow_provider
 
-        try:
-            mailer = MailBridge(provider='sendgrid', api_key='key')
+        def create_mailer(_):
+            start.wait()
+            return MailBridge(provider='sendgrid', share_provider=True, api_key='k')
 
-            response = mailer.send(
-                to='recipient@example.com',
-                subject='Plain Text',
-                body='Plain text content',
-                html=False
-            )
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            mailers = list(executor.map(create_mailer, range(8)))
 
-            assert response.success is True
+        mock_class.assert_called_once_with(api_key='k')
+        assert all(m.provider is mock_instance for m in mailers)
 
-            call_args = mock_instance.send.call_args[0][0]
-            assert call_args.html is False
-        finally:
-            MailBridge.PROVIDERS['sendgrid'] = original
+    def test_clear_provider_cache_closes_providers(self, mock_sendgrid):
+        """Test clearing the cache closes shared providers."""
+        _, mock_instance = mock_sendgrid
+        MailBridge(provider='sendgrid', share_provider=True, api_key='k')
 
-    def test_send_with_template(self):
-        """Test sending template email."""
-        mock_class, mock_instance = create_mock_provider_class()
+        MailBridge.clear_provider_cache()
 
-        original = MailBridge.PROVIDERS['sendgrid']
-        MailBridge.PROVIDERS['sendgrid'] = mock_class
+        mock_instance.close.assert_called_once()
+        assert MailBridge._provider_cache == {}
 
-        try:
-            mailer = MailBridge(provider='sendgrid', api_key='key')
 
-            response = mailer.send(
-                to='recipient@example.com',
-                subject='',
-                body='',
-                template_id='welcome-template',
-                template_data={'name': 'John', 'company': 'Acme'}
-            )
-
-            assert response.success is True
-
-            call_args = mock_instance.send.call_args[0][0]
-            assert call_args.template_id == 'welcome-template'
-            assert call_args.template_data == {'name': 'John', 'company': 'Acme'}
-        finally:
-            MailBridge.PROVIDERS['sendgrid'] = original
-
-    def test_send_with_custom_headers(self):
-        """Test sending with custom headers."""
-        mock_class, mock_instance = create_mock_provider_class()
-
-        original = MailBridge.PROVIDERS['sendgrid']
-        MailBridge.PROVIDERS['sendgrid'] = mock_class
+# =============================================================================
+# SEND METHOD TESTS
+# =============================================================================
 
-        try:
-            mailer = MailBridge(provider='sendgrid', api_key='key')
+class TestMailBridgeSend:
+    """Test MailBridge send() method."""
 
-            response = mailer.send(
-                to='recipient@example.com',
-                subject='Test',
-                body='Body',
-                headers={'X-Custom': 'value'}
-            )
+    pytestmark = pytest.mark.xdist_group(name='mailbridge_send')
 
-            assert response.success is True
+    def test_send_simple_email(self, mock_sendgrid):
+        """Test sending a simple email."""
+        _, mock_instance = mock_sendgrid
+        mock_instance.send.return_value = EmailResponseDTO(
+            success=True,
+            message_id='msg-123',
+            provider='sendgrid'
+        )
 
-            call_args = mock_instance.send.call_args[0][0]
-            assert call_args.headers == {'X-Custom': 'value'}
-        finally:
-            MailBridge.PROVIDERS['sendgrid'] = original
+        mailer = MailBridge(provider='sendgrid', api_key='key')
 
-    def test_send_with_tags(self):
-        """Test sending with tags."""
-        mock_class, mock_instance = create_mock_provider_class()
+        response = mailer.send(
+            to='recipient@example.com',
+            subject='Test Email',
+            body='<h1>Hello</h1>'
+        )
 
-        original = MailBridge.PROVIDERS['sendgrid']
-        MailBridge.PROVIDERS['sendgrid'] = mock_class
+        assert response.success is True
+        assert response.message_id == 'msg-123'
+
+        mock_instance.send.assert_called_once()
+
+        call_args = mock_instance.send.call_args[0][0]
+        assert isinstance(call_args, EmailMessageDto)
+        assert call_args.to == ['recipient@example.com']
+        assert call_args.subject == 'Test Email'
+        assert call_args.body == '<h1>Hello</h1>'
+        assert call_args.html is True
+
+    @pytest.mark.parametrize('kwargs,expected', [
+        pytest.param(
+            {'to': ['user1@example.com', 'user2@example.com']},
+            {'to': ['user1@example.com', 'user2@example.com']},
+            id='multiple_recipients'
+        ),
+        pytest.param(
+            {'cc': ['cc@example.com'], 'bcc': ['bcc@example.com']},
+            {'cc': ['cc@example.com'], 'bcc': ['bcc@example.com']},
+            id='cc_bcc'
+        ),
+        pytest.param(
+            {'attachments': [Path('document.pdf')]},
+            {'attachments': [Path('document.pdf')]},
+            id='attachments'
+        ),
+        pytest.param(
+            {'body': 'Plain text content', 'html': False},
+            {'html': False},
+            id='plain_text'
+        ),
+        pytest.param(
+            {
+                'subject': '',
+                'body': '',
+                'template_id': 'welcome-template',
+                'template_data': {'name': 'John', 'company': 'Acme'}
+            },
+            {'template_id': 'welcome-template', 'template_data': {'name': 'John', 'company': 'Acme'}},
+            id='template'
+        ),
+        pytest.param(
+            {'headers': {'X-Custom': 'value'}},
+            {'headers': {'X-Custom': 'value'}},
+            id='custom_headers'
+        ),
+        pytest.param(
+            {'tags': ['campaign', 'november']},
+            {'tags': ['campaign', 'november']},
+            id='tags'
+        ),
+    ])
+    def test_send_variants(self, mock_sendgrid, kwargs, expected):
+        """Test send() passes every optional field through to the provider."""
+        _, mock_instance = mock_sendgrid
 
-        try:
-            mailer = MailBridge(provider='sendgrid', api_key='key')
+        mailer = MailBridge(provider='sendgrid', api_key='key')
 
-            response = mailer.send(
-                to='recipient@example.com',
-                subject='Test',
-                body='Body',
-                tags=['campaign', 'november']
-            )
+        response = mailer.send(**{
+            'to': 'recipient@example.com',
+            'subject': 'Test',
+            'body': 'Body',
+            **kwargs
+        })
 
-            assert response.success is True
+        assert response.success is True
 
-            call_args = mock_instance.send.call_args[0][0]
-            assert call_args.tags == ['campaign', 'november']
-        finally:
-            MailBridge.PROVIDERS['sendgrid'] = original
+        call_args = mock_instance.send.call_args[0][0]
+        for field, value in expected.items():
+            assert getattr(call_args, field) == value
 
 
 # =============================================================================
@@ -353,118 +429,90 @@ class TestMailBridgeSend:
 class TestMailBridgeSendBulk:
     """Test MailBridge send_bulk() method."""
 
-    def test_send_bulk_with_list(self):
-        """Test bulk sending with list of messages."""
-        mock_class, mock_instance = create_mock_provider_class()
-        mock_instance.send_bulk.return_value = BulkEmailResponseDTO.from_responses([
-            EmailResponseDTO(success=True, message_id='msg1', provider='sendgrid'),
-            EmailResponseDTO(success=True, message_id='msg2', provider='sendgrid'),
-        ])
-
-        original = MailBridge.PROVIDERS['sendgrid']
-        MailBridge.PROVIDERS['sendgrid'] = mock_class
+    pytestmark = pytest.mark.xdist_group(name='mailbridge_bulk')
 
-        try:
-            mailer = MailBridge(provider='sendgrid', api_key='key')
+    def test_send_bulk_with_list(self, mock_sendgrid, sample_messages, sample_bulk_response):
+        """Test bulk sending with list of messages."""
+        _, mock_instance = mock_sendgrid
+        mock_instance.send_bulk.return_value = sample_bulk_response
 
-            messages = [
-                EmailMessageDto(to='user1@example.com', subject='Test 1', body='Body 1'),
-                EmailMessageDto(to='user2@example.com', subject='Test 2', body='Body 2'),
-            ]
+        mailer = MailBridge(provider='sendgrid', api_key='key')
 
-            result = mailer.send_bulk(messages)
+        result = mailer.send_bulk(sample_messages)
 
-            assert result.total == 2
-            assert result.successful == 2
-            assert result.failed == 0
+        assert result.total == 2
+        assert result.successful == 2
+        assert result.failed == 0
 
-            mock_instance.send_bulk.assert_called_once()
+        mock_instance.send_bulk.assert_called_once()
 
-            call_args = mock_instance.send_bulk.call_args[0][0]
-            assert isinstance(call_args, BulkEmailDTO)
-            assert len(call_args.messages) == 2
-        finally:
-            MailBridge.PROVIDERS['sendgrid'] = original
+        call_args = mock_instance.send_bulk.call_args[0][0]
+        assert isinstance(call_args, BulkEmailDTO)
+        assert len(call_args.messages) == 2
 
-    def test_send_bulk_with_bulk_dto(self):
+    def test_send_bulk_with_bulk_dto(self, mock_sendgrid, single_bulk_response):
         """Test bulk sending with BulkEmailDTO."""
-        mock_class, mock_instance = create_mock_provider_class()
-        mock_instance.send_bulk.return_value = BulkEmailResponseDTO.from_responses([
-            EmailResponseDTO(success=True, message_id='msg1', provider='sendgrid'),
-        ])
+        _, mock_instance = mock_sendgrid
+        mock_instance.send_bulk.return_value = single_bulk_response
 
-        original = MailBridge.PROVIDERS['sendgrid']
-        MailBridge.PROVIDERS['sendgrid'] = mock_class
+        mailer = MailBridge(provider='sendgrid', api_key='key')
 
-        try:
-            mailer = MailBridge(provider='sendgrid', api_key='key')
-
-            bulk = BulkEmailDTO(
-                messages=[
-                    EmailMessageDto(to='user@example.com', subject='Test', body='Body')
-                ],
-                default_from='sender@example.com',
-                tags=['bulk']
-            )
+        bulk = BulkEmailDTO(
+            messages=[
+                EmailMessageDto(to='user@example.com', subject='Test', body='Body')
+            ],
+            default_from='sender@example.com',
+            tags=['bulk']
+        )
 
-            result = mailer.send_bulk(bulk)
+        result = mailer.send_bulk(bulk)
 
-            assert result.successful == 1
-            mock_instance.send_bulk.assert_called_once_with(bulk)
-        finally:
-            MailBridge.PROVIDERS['sendgrid'] = original
+        assert result.successful == 1
+        mock_instance.send_bulk.assert_called_once_with(bulk)
 
-    def test_send_bulk_with_default_from(self):
+    def test_send_bulk_with_default_from(self, mock_sendgrid, single_bulk_response):
         """Test bulk sending with default_from."""
-        mock_class, mock_instance = create_mock_provider_class()
-        mock_instance.send_bulk.return_value = BulkEmailResponseDTO.from_responses([
-            EmailResponseDTO(success=True, message_id='msg1', provider='sendgrid'),
-        ])
-
-        original = MailBridge.PROVIDERS['sendgrid']
-        MailBridge.PROVIDERS['sendgrid'] = mock_class
+        _, mock_instance = mock_sendgrid
+        mock_instance.send_bulk.return_value = single_bulk_response
 
-        try:
-            mailer = MailBridge(provider='sendgrid', api_key='key')
+        mailer = MailBridge(provider='sendgrid', api_key='key')
 
-            messages = [
-                EmailMessageDto(to='user@example.com', subject='Test', body='Body')
-            ]
+        messages = [
+            EmailMessageDto(to='user@example.com', subject='Test', body='Body')
+        ]
 
-            result = mailer.send_bulk(messages, default_from='noreply@example.com')
+        result = mailer.send_bulk(messages, default_from='noreply@example.com')
 
-            assert result.successful == 1
+        assert result.successful == 1
 
-            call_args = mock_instance.send_bulk.call_args[0][0]
-            assert call_args.default_from == 'noreply@example.com'
-        finally:
-            MailBridge.PROVIDERS['sendgrid'] = original
+        call_args = mock_instance.send_bulk.call_args[0][0]
+        assert call_args.default_from == 'noreply@example.com'
 
-    def test_send_bulk_with_tags(self):
+    def test_send_bulk_with_tags(self, mock_sendgrid, single_bulk_response):
         """Test bulk sending with tags."""
-        mock_class, mock_instance = create_mock_provider_class()
-        mock_instance.send_bulk.return_value = BulkEmailResponseDTO.from_responses([
-            EmailResponseDTO(success=True, message_id='msg1', provider='sendgrid'),
-        ])
+        _, mock_instance = mock_sendgrid
+        mock_instance.send_bulk.return_value = single_bulk_response
 
-        original = MailBridge.PROVIDERS['sendgrid']
-        MailBridge.PROVIDERS['sendgrid'] = mock_class
+        mailer = MailBridge(provider='sendgrid', api_key='key')
 
-        try:
-            mailer = MailBridge(provider='sendgrid', api_key='key')
+        messages = [
+            EmailMessageDto(to='user@example.com', subject='Test', body='Body')
+        ]
 
-            messages = [
-                EmailMessageDto(to='user@example.com', subject='Test', body='Body')
-            ]
+        result = mailer.send_bulk(messages, tags=['campaign', 'november'])
 
-            result = mailer.send_bulk(messages, tags=['campaign', 'november'])
+        assert result.successful == 1
 
-            assert result.successful == 1
+        call_args = mock_instance.send_bulk.call_args[0][0]
+        assert call_args.tags == ['campaign', 'november']
 
-            call_args = mock_instance.send_bulk.call_args[0][0]
-            assert call_args.tags == ['campaign', 'november']
-        finally:
-            MailBridge.PROVIDERS['sendgrid'] = original
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason='dataclass slots need Python 3.10+')
+    def test_bulk_responses_use_slots(self, sample_bulk_response):
+        """Test per-message responses carry no instance __dict__."""
+        response = sample_bulk_response.responses[0]
+
+        assert not hasattr(response, '__dict__')
+        assert response.message_id == 'msg1'
 
 
 # =============================================================================
@@ -474,58 +522,27 @@ class TestMailBridgeSendBulk:
 class TestMailBridgeCapabilities:
     """Test capability checking methods."""
 
-    def test_supports_templates(self):
-        """Test checking template support."""
-        mock_class, mock_instance = create_mock_provider_class()
-        mock_instance.supports_templates.return_value = True
-
-        original = MailBridge.PROVIDERS['sendgrid']
-        MailBridge.PROVIDERS['sendgrid'] = mock_class
+    pytestmark = pytest.mark.xdist_group(name='mailbridge_capabilities')
 
-        try:
-            mailer = MailBridge(provider='sendgrid', api_key='key')
+    def test_supports_templates(self, mailer):
+        """Test checking template support."""
+        mailer.provider.supports_templates.return_value = True
 
-            assert mailer.supports_templates() is True
-            mock_instance.supports_templates.assert_called_once()
-        finally:
-            MailBridge.PROVIDERS['sendgrid'] = original
+        assert mailer.supports_templates() is True
+        mailer.provider.supports_templates.assert_called_once()
 
-    def test_does_not_support_templates(self):
+    def test_does_not_support_templates(self, mailer):
         """Test provider that doesn't support templates."""
-        mock_class, mock_instance = create_mock_provider_class()
-        mock_instance.supports_templates.return_value = False
-
-        original = MailBridge.PROVIDERS['smtp']
-        MailBridge.PROVIDERS['smtp'] = mock_class
-
-        try:
-            mailer = MailBridge(
-                provider='smtp',
-                host='smtp.example.com',
-                port=587,
-                username='user',
-                password='pass'
-            )
-
-            assert mailer.supports_templates() is False
-        finally:
-            MailBridge.PROVIDERS['smtp'] = original
-
-    def test_supports_bulk_sending(self):
-        """Test checking bulk sending support."""
-        mock_class, mock_instance = create_mock_provider_class()
-        mock_instance.supports_bulk_sending.return_value = True
+        mailer.provider.supports_templates.return_value = False
 
-        original = MailBridge.PROVIDERS['sendgrid']
-        MailBridge.PROVIDERS['sendgrid'] = mock_class
+        assert mailer.supports_templates() is False
 
-        try:
-            mailer = MailBridge(provider='sendgrid', api_key='key')
+    def test_supports_bulk_sending(self, mailer):
+        """Test checking bulk sending support."""
+        mailer.provider.supports_bulk_sending.return_value = True
 
-            assert mailer.supports_bulk_sending() is True
-            mock_instance.supports_bulk_sending.assert_called_once()
-        finally:
-            MailBridge.PROVIDERS['sendgrid'] = original
+        assert mailer.supports_bulk_sending() is True
+        mailer.provider.supports_bulk_sending.assert_called_once()
 
 
 # =============================================================================
@@ -535,36 +552,26 @@ class TestMailBridgeCapabilities:
 class TestMailBridgeContextManager:
     """Test context manager support."""
 
-    def test_context_manager(self):
-        """Test using MailBridge as context manager."""
-        mock_class, mock_instance = create_mock_provider_class()
+    pytestmark = pytest.mark.xdist_group(name='mailbridge_context')
 
-        original = MailBridge.PROVIDERS['sendgrid']
-        MailBridge.PROVIDERS['sendgrid'] = mock_class
+    def test_context_manager(self, mock_sendgrid):
+        """Test using MailBridge as context manager."""
+        _, mock_instance = mock_sendgrid
 
-        try:
-            with MailBridge(provider='sendgrid', api_key='key') as mailer:
-                assert mailer is not None
-                assert isinstance(mailer, MailBridge)
+        with MailBridge(provider='sendgrid', api_key='key') as mailer:
+            assert mailer is not None
+            assert isinstance(mailer, MailBridge)
 
-            mock_instance.close.assert_called_once()
-        finally:
-            MailBridge.PROVIDERS['sendgrid'] = original
+        mock_instance.close.assert_called_once()
 
-    def test_close_method(self):
+    def test_close_method(self, mock_sendgrid):
         """Test explicit close() method."""
-        mock_class, mock_instance = create_mock_provider_class()
-
-        original = MailBridge.PROVIDERS['sendgrid']
-        MailBridge.PROVIDERS['sendgrid'] = mock_class
+        _, mock_instance = mock_sendgrid
 
-        try:
-            mailer = MailBridge(provider='sendgrid', api_key='key')
-            mailer.close()
+        mailer = MailBridge(provider='sendgrid', api_key='key')
+        mailer.close()
 
-            mock_instance.close.assert_called_once()
-        finally:
-            MailBridge.PROVIDERS['sendgrid'] = original
+        mock_instance.close.assert_called_once()
 
 
 # =============================================================================
@@ -574,15 +581,10 @@ class TestMailBridgeContextManager:
 class TestMailBridgeCustomProvider:
     """Test custom provider registration."""
 
-    def test_register_custom_provider(self):
-        """Test registering a custom provider."""
-        class CustomProvider(BaseEmailProvider):
-            def _validate_config(self):
-                pass
-
-            def send(self, message):
-                return EmailResponseDTO(success=True, provider='custom')
+    pytestmark = pytest.mark.xdist_group(name='mailbridge_custom')
 
+    def test_register_custom_provider(self, isolated_providers):
+        """Test registering a custom provider."""
         MailBridge.register_provider('custom', CustomProvider)
 
         # Should be able to use custom provider
@@ -590,29 +592,61 @@ class TestMailBridgeCustomProvider:
         assert mailer.provider_name == 'custom'
         assert isinstance(mailer.provider, CustomProvider)
 
-        # Clean up
-        del MailBridge.PROVIDERS['custom']
-
-    def test_register_provider_case_insensitive(self):
+    def test_register_provider_case_insensitive(self, isolated_providers):
         """Test provider registration is case-insensitive."""
-        class CustomProvider(BaseEmailProvider):
-            def _validate_config(self):
-                pass
-
-            def send(self, message):
-                return EmailResponseDTO(success=True, provider='custom')
-
         MailBridge.register_provider('MyCustomProvider', CustomProvider)
 
         # Should be stored as lowercase
-        assert 'mycustomprovider' in MailBridge.PROVIDERS
+        assert 'mycustomprovider' in MailBridge._CUSTOM_PROVIDERS
 
         # Should be able to initialize with any case
         mailer = MailBridge(provider='MYCUSTOMPROVIDER', api_key='key')
         assert mailer.provider_name == 'mycustomprovider'
 
-        # Clean up
-        del MailBridge.PROVIDERS['mycustomprovider']
+    def test_register_provider_unicode_name(self, isolated_providers):
+        """Test non-ASCII provider names match regardless of case form."""
+        MailBridge.register_provider('Straße', CustomProvider)
+
+        mailer = MailBridge(provider='STRASSE', api_key='key')
+        assert isinstance(mailer.provider, CustomProvider)
+
+    def test_register_does_not_mutate_builtins(self, isolated_providers):
+        """Test custom registrations go to the overlay, never the built-ins."""
+        builtin_smtp = MailBridge._BUILTIN_PROVIDERS['smtp']
+
+        MailBridge.register_provider('smtp', CustomProvider)
+
+        assert MailBridge._BUILTIN_PROVIDERS['smtp'] is builtin_smtp
+        assert isinstance(MailBridge(provider='smtp').provider, CustomProvider)
+        with pytest.raises(TypeError):
+            MailBridge._BUILTIN_PROVIDERS['custom'] = CustomProvider
+
+    def test_providers_view_includes_custom(self, isolated_providers):
+        """Test the combined PROVIDERS view reflects registrations."""
+        MailBridge.register_provider('custom', CustomProvider)
+
+        assert MailBridge.PROVIDERS['custom'] is CustomProvider
+        assert MailBridge.PROVIDERS['sendgrid'] is MailBridge._BUILTIN_PROVIDERS['sendgrid']
+
+    def test_providers_view_is_read_only(self, isolated_providers):
+        """Test PROVIDERS rejects writes instead of turning them into custom entries."""
+        with pytest.raises(TypeError):
+            MailBridge.PROVIDERS['custom'] = CustomProvider
+        with pytest.raises(TypeError):
+            with patch.dict(MailBridge.PROVIDERS, {'custom': CustomProvider}):
+                pass
+
+        assert 'custom' not in MailBridge._CUSTOM_PROVIDERS
+
+    def test_replaced_providers_used_for_lookup(self, isolated_providers):
+        """Test replacing MailBridge.PROVIDERS changes which providers resolve."""
+        with patch.object(MailBridge, 'PROVIDERS', {'custom': CustomProvider}):
+            assert isinstance(MailBridge(provider='custom').provider, CustomProvider)
+            assert MailBridge.available_providers() == ('custom',)
+            with pytest.raises(ProviderNotFoundError):
+                MailBridge(provider='smtp')
+
+        assert 'smtp' in MailBridge.available_providers()
 
     def test_register_invalid_provider_class(self):
         """Test registering invalid provider class raises error."""
@@ -625,23 +659,14 @@ class TestMailBridgeCustomProvider:
 
         assert 'must inherit from EmailProvider' in str(exc_info.value)
 
-    def test_available_providers_includes_custom(self):
+    def test_available_providers_includes_custom(self, isolated_providers):
         """Test available_providers includes custom providers."""
-        class CustomProvider(BaseEmailProvider):
-            def _validate_config(self):
-                pass
-
-            def send(self, message):
-                return EmailResponseDTO(success=True, provider='custom')
-
+        MailBridge.available_providers()
         MailBridge.register_provider('mytest', CustomProvider)
 
         providers = MailBridge.available_providers()
         assert 'mytest' in providers
 
-        # Clean up
-        del MailBridge.PROVIDERS['mytest']
-
 
 # =============================================================================
 # INTEGRATION-LIKE TESTS
@@ -650,54 +675,43 @@ class TestMailBridgeCustomProvider:
 class TestMailBridgeIntegration:
     """Integration-like tests (still using mocks)."""
 
-    def test_full_workflow(self):
+    pytestmark = pytest.mark.xdist_group(name='mailbridge_integration')
+
+    def test_full_workflow(self, mock_sendgrid, sample_messages, sample_bulk_response):
         """Test complete workflow: initialize, send, bulk, close."""
-        mock_class, mock_instance = create_mock_provider_class()
+        _, mock_instance = mock_sendgrid
         mock_instance.send.return_value = EmailResponseDTO(
             success=True,
             message_id='msg-single',
             provider='sendgrid'
         )
-        mock_instance.send_bulk.return_value = BulkEmailResponseDTO.from_responses([
-            EmailResponseDTO(success=True, message_id='msg-bulk-1', provider='sendgrid'),
-            EmailResponseDTO(success=True, message_id='msg-bulk-2', provider='sendgrid'),
-        ])
+        mock_instance.send_bulk.return_value = sample_bulk_response
         mock_instance.supports_templates.return_value = True
         mock_instance.supports_bulk_sending.return_value = True
 
-        original = MailBridge.PROVIDERS['sendgrid']
-        MailBridge.PROVIDERS['sendgrid'] = mock_class
-
-        try:
-            # Initialize
-            mailer = MailBridge(provider='sendgrid', api_key='test-key')
-
-            # Check capabilities
-            assert mailer.supports_templates() is True
-            assert mailer.supports_bulk_sending() is True
-
-            # Send single email
-            response = mailer.send(
-                to='user@example.com',
-                subject='Test',
-                body='Body'
-            )
-            assert response.success is True
-            assert response.message_id == 'msg-single'
-
-            # Send bulk
-            messages = [
-                EmailMessageDto(to='user1@example.com', subject='Bulk 1', body='Body 1'),
-                EmailMessageDto(to='user2@example.com', subject='Bulk 2', body='Body 2'),
-            ]
-            result = mailer.send_bulk(messages)
-            assert result.successful == 2
-
-            # Close
-            mailer.close()
-            mock_instance.close.assert_called_once()
-        finally:
-            MailBridge.PROVIDERS['sendgrid'] = original
+        # Initialize
+        mailer = MailBridge(provider='sendgrid', api_key='test-key')
+
+        # Check capabilities
+        assert mailer.supports_templates() is True
+        assert mailer.supports_bulk_sending() is True
+
+        # Send single email
+        response = mailer.send(
+            to='user@example.com',
+            subject='Test',
+            body='Body'
+        )
+        assert response.success is True
+        assert response.message_id == 'msg-single'
+
+        # Send bulk
+        result = mailer.send_bulk(sample_messages)
+        assert result.successful == 2
+
+        # Close
+        mailer.close()
+        mock_instance.close.assert_called_once()
 
 
 # =============================================================================
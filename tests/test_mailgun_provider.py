@@ -14,35 +14,48 @@ Run with: pytest tests/test_mailgun_provider.py -v
 """
 
 import pytest
-from unittest.mock import patch, Mock
+from unittest.mock import patch
 from pathlib import Path
 import json
 import io
 
 from mailbridge.providers.mailgun_provider import MailgunProvider
+from mailbridge.providers import mailgun_provider as mailgun_provider_module
 from mailbridge.dto.email_message_dto import EmailMessageDto
 from mailbridge.dto.bulk_email_dto import BulkEmailDTO
 from mailbridge.exceptions import ConfigurationError, EmailSendError
+from tests.helpers import FakeResp
 
 
 # =============================================================================
 # FIXTURES
 # =============================================================================
 
-@pytest.fixture
-def mailgun_config():
-    """Valid Mailgun config."""
-    return {
-        "api_key": "key-test-123",
-        "endpoint": "https://api.mailgun.net/v3/example.com",
-        "from_email": "no-reply@example.com",
-    }
+EXPECTED_TEMPLATE_VARS = {"name": "John", "promo": "DISCOUNT20"}
 
+BULK_MESSAGES = tuple(
+    EmailMessageDto(to=f"user{i}@example.com", subject="S", body="B")
+    for i in range(3)
+)
+
+
+def _tvars(data):
+    """Decode the template variables Mailgun receives as a JSON string."""
+    return json.loads(data["t:variables"])
+
+
+@pytest.fixture(scope="module")
+def _patched_post():
+    """Patch requests.post once for the whole module."""
+    with patch.object(mailgun_provider_module.requests, "post") as mock:
+        yield mock
 
-@pytest.fixture
-def mailgun_provider(mailgun_config):
-    """Provider instance."""
-    return MailgunProvider(**mailgun_config)
+
+@pytest.fixture(autouse=True)
+def mock_post(_patched_post):
+    """Module-wide requests.post mock, reset before every test."""
+    _patched_post.reset_mock(return_value=True, side_effect=True)
+    return _patched_post
 
 
 @pytest.fixture
@@ -66,16 +79,13 @@ def template_message():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_success_response():
     """Mock Mailgun successful response."""
-    mock_resp = Mock()
-    mock_resp.status_code = 200
-    mock_resp.json.return_value = {
+    return FakeResp(_json={
         "id": "<20231110@mailgun.org>",
         "message": "Queued. Thank you."
-    }
-    return mock_resp
+    })
 
 
 # =============================================================================
@@ -84,10 +94,11 @@ def mock_success_response():
 
 class TestMailgunConfiguration:
 
-    def test_valid_config(self, mailgun_config):
-        provider = MailgunProvider(**mailgun_config)
-        assert provider.config["api_key"] == "key-test-123"
-        assert provider.endpoint == "https://api.mailgun.net/v3/example.com"
+    pytestmark = pytest.mark.xdist_group(name='mailgun_configuration')
+
+    def test_valid_config(self, mailgun_provider):
+        assert mailgun_provider.config["api_key"] == "key-test-123"
+        assert mailgun_provider.endpoint == "https://api.mailgun.net/v3/example.com"
 
     def test_missing_api_key(self):
         with pytest.raises(ConfigurationError):
@@ -97,8 +108,8 @@ class TestMailgunConfiguration:
         with pytest.raises(ConfigurationError):
             MailgunProvider(api_key="key-xyz")
 
-    def test_context_manager(self, mailgun_config):
-        with MailgunProvider(**mailgun_config) as p:
+    def test_context_manager(self, mailgun_provider):
+        with mailgun_provider as p:
             assert isinstance(p, MailgunProvider)
 
 
@@ -108,7 +119,6 @@ class TestMailgunConfiguration:
 
 class TestMailgunSend:
 
-    @patch("mailbridge.providers.mailgun_provider.requests.post")
     def test_send_success(self, mock_post, mailgun_provider, simple_message, mock_success_response):
         mock_post.return_value = mock_success_response
 
@@ -127,55 +137,19 @@ class TestMailgunSend:
         assert data["subject"] == "Mailgun Test"
         assert data["text"] == "Hello Mailgun"
 
-    @patch("mailbridge.providers.mailgun_provider.requests.post")
-    def test_send_html_body(self, mock_post, mailgun_provider, mock_success_response):
-        mock_post.return_value = mock_success_response
+    def test_send_html_body(self, mailgun_provider):
         message = EmailMessageDto(
             to="x@example.com", subject="HTML", body="<h1>Hi</h1>", html=True
         )
-        mailgun_provider.send(message)
-        data = mock_post.call_args[1]["data"]
+        data = mailgun_provider._build_from_data(message)
         assert "html" in data
         assert data["html"] == "<h1>Hi</h1>"
 
-    @patch("mailbridge.providers.mailgun_provider.requests.post")
-    def test_send_with_cc_bcc_replyto(self, mock_post, mailgun_provider, mock_success_response):
-        mock_post.return_value = mock_success_response
-        msg = EmailMessageDto(
-            to="a@example.com",
-            subject="Test",
-            body="Body",
-            cc=["cc@example.com"],
-            bcc=["bcc@example.com"],
-            reply_to="reply@example.com"
-        )
-        mailgun_provider.send(msg)
-        data = mock_post.call_args[1]["data"]
-        assert data["cc"] == ["cc@example.com"]
-        assert data["bcc"] == ["bcc@example.com"]
-        assert data["h:Reply-To"] == "reply@example.com"
-
-    @patch("mailbridge.providers.mailgun_provider.requests.post")
-    def test_send_with_headers(self, mock_post, mailgun_provider, mock_success_response):
-        mock_post.return_value = mock_success_response
-        msg = EmailMessageDto(
-            to="x@example.com", subject="Header", body="Body",
-            headers={"X-Custom": "Yes"}
-        )
-        mailgun_provider.send(msg)
-        data = mock_post.call_args[1]["data"]
-        assert data["h:X-Custom"] == "Yes"
-
-    @patch("mailbridge.providers.mailgun_provider.requests.post")
     def test_send_api_error(self, mock_post, mailgun_provider, simple_message):
-        mock_resp = Mock()
-        mock_resp.status_code = 400
-        mock_resp.text = "Invalid recipient"
-        mock_post.return_value = mock_resp
+        mock_post.return_value = FakeResp(status_code=400, text="Invalid recipient")
         with pytest.raises(EmailSendError):
             mailgun_provider.send(simple_message)
 
-    @patch("mailbridge.providers.mailgun_provider.requests.post")
     def test_send_request_exception(self, mock_post, mailgun_provider, simple_message):
         import requests
         mock_post.side_effect = requests.ConnectionError("Network down")
@@ -190,22 +164,19 @@ class TestMailgunSend:
 
 class TestMailgunTemplateEmails:
 
-    @patch("mailbridge.providers.mailgun_provider.requests.post")
     def test_send_template(self, mock_post, mailgun_provider, template_message, mock_success_response):
         mock_post.return_value = mock_success_response
         resp = mailgun_provider.send(template_message)
         assert resp.success is True
         data = mock_post.call_args[1]["data"]
         assert data["template"] == "welcome_template"
-        assert json.loads(data["t:variables"]) == {"name": "John", "promo": "DISCOUNT20"}
+        assert _tvars(data) == EXPECTED_TEMPLATE_VARS
 
-    @patch("mailbridge.providers.mailgun_provider.requests.post")
-    def test_send_template_empty_data(self, mock_post, mailgun_provider, mock_success_response):
-        mock_post.return_value = mock_success_response
+    def test_send_template_empty_data(self, mailgun_provider):
         msg = EmailMessageDto(to="x@x.com", template_id="t1", template_data=None)
-        mailgun_provider.send(msg)
-        data = mock_post.call_args[1]["data"]
-        assert json.loads(data["t:variables"]) == {}
+        data = mailgun_provider._build_from_data(msg)
+        assert data["template"] == "t1"
+        assert _tvars(data) == {}
 
 
 # =============================================================================
@@ -214,13 +185,14 @@ class TestMailgunTemplateEmails:
 
 class TestMailgunAttachments:
 
-    def test_build_files_from_path(self, mailgun_provider, tmp_path):
-        file = tmp_path / "test.txt"
-        file.write_text("abc")
+    def test_build_files_from_path(self, mailgun_provider, in_memory_files):
+        file = Path("test.txt")
+        in_memory_files(mailgun_provider_module, {"test.txt": b"abc"})
         files = mailgun_provider._build_files([file])
         assert len(files) == 1
         assert files[0][0] == "attachment"
         assert files[0][1][0] == "test.txt"
+        assert files[0][1][1].read() == b"abc"
 
     def test_build_files_from_tuple(self, mailgun_provider):
         content = b"data"
@@ -236,20 +208,14 @@ class TestMailgunAttachments:
 
 class TestMailgunBulk:
 
-    @patch("mailbridge.providers.mailgun_provider.requests.post")
     def test_send_bulk_success(self, mock_post, mailgun_provider, mock_success_response):
         mock_post.return_value = mock_success_response
-        messages = [
-            EmailMessageDto(to=f"user{i}@example.com", subject="S", body="B")
-            for i in range(3)
-        ]
-        bulk = BulkEmailDTO(messages=messages)
+        bulk = BulkEmailDTO(messages=list(BULK_MESSAGES))
         result = mailgun_provider.send_bulk(bulk)
         assert result.total == 3
         assert result.failed == 0
         assert result.successful == 3
 
-    @patch("mailbridge.providers.mailgun_provider.requests.post")
     def test_send_bulk_failure(self, mock_post, mailgun_provider):
         mock_post.side_effect = Exception("unexpected")
         messages = [
@@ -14,9 +14,9 @@ Run with: pytest tests/test_postmark_provider.py -v
 """
 
 import pytest
-from unittest.mock import Mock, patch
 from pathlib import Path
 import base64
+import requests
 
 from mailbridge.providers.postmark_provider import PostmarkProvider
 from mailbridge.dto.email_message_dto import EmailMessageDto
@@ -30,30 +30,33 @@ from mailbridge.exceptions import ConfigurationError, EmailSendError
 # FIXTURES
 # =============================================================================
 
-@pytest.fixture
-def postmark_config():
-    """Postmark configuration fixture."""
-    return {
-        'server_token': 'test-server-token-12345',
-        'from_email': 'sender@example.com'
-    }
+POSTMARK_URL = 'https://api.postmarkapp.com/email'
 
+POSTMARK_RESPONSE = {
+    'MessageID': 'postmark-message-id-123',
+    'SubmittedAt': '2024-01-15T10:30:00Z',
+    'To': 'recipient@example.com'
+}
 
-@pytest.fixture
-def postmark_provider(postmark_config):
-    """Postmark provider fixture."""
-    return PostmarkProvider(**postmark_config)
 
+EXPECTED_B64 = base64.b64encode(b'Test content').decode()
 
-@pytest.fixture
-def simple_message():
-    """Simple email message fixture."""
-    return EmailMessageDto(
-        to='recipient@example.com',
-        subject='Test Email',
-        body='<h1>Hello World</h1>',
-        html=True
-    )
+EXPECTED_TEMPLATE_MODEL = {
+    'product_name': 'Pro Plan',
+    'name': 'John',
+    'action_url': 'https://example.com/activate'
+}
+
+BULK_MESSAGES = (
+    EmailMessageDto(to='user1@example.com', subject='Test 1', body='Body 1'),
+    EmailMessageDto(to='user2@example.com', subject='Test 2', body='Body 2'),
+    EmailMessageDto(to='user3@example.com', subject='Test 3', body='Body 3'),
+)
+
+@pytest.fixture(autouse=True)
+def postmark_api(requests_mock):
+    """Register a successful Postmark API route for every test."""
+    return requests_mock.post(POSTMARK_URL, json=POSTMARK_RESPONSE)
 
 
 @pytest.fixture
@@ -70,19 +73,6 @@ def template_message():
     )
 
 
-@pytest.fixture
-def mock_postmark_response():
-    """Mock Postmark API response."""
-    mock_response = Mock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {
-        'MessageID': 'postmark-message-id-123',
-        'SubmittedAt': '2024-01-15T10:30:00Z',
-        'To': 'recipient@example.com'
-    }
-    return mock_response
-
-
 # =============================================================================
 # CONFIGURATION TESTS
 # =============================================================================
@@ -100,8 +90,8 @@ class TestPostmarkConfiguration:
 
     def test_custom_endpoint(self, postmark_config):
         """Test provider accepts custom endpoint."""
-        postmark_config['endpoint'] = 'https://custom.postmarkapp.com/email'
-        provider = PostmarkProvider(**postmark_config)
+        config = {**postmark_config, 'endpoint': 'https://custom.postmarkapp.com/email'}
+        provider = PostmarkProvider(**config)
 
         assert provider.endpoint == 'https://custom.postmarkapp.com/email'
 
@@ -128,44 +118,40 @@ class TestPostmarkConfiguration:
 class TestPostmarkRegularEmail:
     """Test regular email sending."""
 
-    @patch('mailbridge.providers.postmark_provider.requests.post')
-    def test_send_simple_email(self, mock_post, postmark_provider, simple_message, mock_postmark_response):
+    def test_send_simple_email(self, requests_mock, postmark_provider, simple_message):
         """Test sending a simple email."""
-        mock_post.return_value = mock_postmark_response
-
         response = postmark_provider.send(simple_message)
 
         # Check response
         assert response.success is True
         assert response.message_id == 'postmark-message-id-123'
         assert response.provider == 'postmark'
-        assert response.metadata['submitted_at'] == '2024-01-15T10:30:00Z'
-        assert response.metadata['to'] == 'recipient@example.com'
+        assert response.metadata == {
+            'submitted_at': '2024-01-15T10:30:00Z',
+            'to': 'recipient@example.com'
+        }
 
         # Check API call
-        mock_post.assert_called_once()
-        call_args = mock_post.call_args
-
-        # Check endpoint
-        assert call_args[0][0] == 'https://api.postmarkapp.com/email'
-
-        # Check headers
-        headers = call_args[1]['headers']
-        assert headers['X-Postmark-Server-Token'] == 'test-server-token-12345'
-        assert headers['Content-Type'] == 'application/json'
+        assert requests_mock.call_count == 1
+        request = requests_mock.last_request
+        assert request.url == POSTMARK_URL
+
+        expected_headers = {
+            'X-Postmark-Server-Token': 'test-server-token-12345',
+            'Content-Type': 'application/json',
+            'Accept': 'application/json'
+        }
+        assert expected_headers.items() <= request.headers.items()
 
-        # Check payload
-        payload = call_args[1]['json']
-        assert payload['From'] == 'sender@example.com'
-        assert payload['To'] == 'recipient@example.com'
-        assert payload['Subject'] == 'Test Email'
-        assert payload['HtmlBody'] == '<h1>Hello World</h1>'
+        assert request.json() == {
+            'From': 'sender@example.com',
+            'To': 'recipient@example.com',
+            'Subject': 'Test Email',
+            'HtmlBody': '<h1>Hello World</h1>'
+        }
 
-    @patch('mailbridge.providers.postmark_provider.requests.post')
-    def test_send_plain_text(self, mock_post, postmark_provider, mock_postmark_response):
+    def test_send_plain_text(self, postmark_provider):
         """Test sending plain text email."""
-        mock_post.return_value = mock_postmark_response
-
         message = EmailMessageDto(
             to='recipient@example.com',
             subject='Plain Text',
@@ -173,111 +159,35 @@ class TestPostmarkRegularEmail:
             html=False
         )
 
-        response = postmark_provider.send(message)
-
-        assert response.success is True
-
-        payload = mock_post.call_args[1]['json']
-        assert 'TextBody' in payload
-        assert payload['TextBody'] == 'Plain text content'
-        assert 'HtmlBody' not in payload
-
-    @patch('mailbridge.providers.postmark_provider.requests.post')
-    def test_send_with_cc_bcc(self, mock_post, postmark_provider, mock_postmark_response):
-        """Test sending email with CC and BCC."""
-        mock_post.return_value = mock_postmark_response
-
-        message = EmailMessageDto(
-            to='recipient@example.com',
-            subject='Test',
-            body='Body',
-            cc=['cc@example.com'],
-            bcc=['bcc@example.com']
-        )
-
-        response = postmark_provider.send(message)
-
-        assert response.success is True
-
-        payload = mock_post.call_args[1]['json']
-        assert payload['Cc'] == 'cc@example.com'
-        assert payload['Bcc'] == 'bcc@example.com'
-
-    @patch('mailbridge.providers.postmark_provider.requests.post')
-    def test_send_with_reply_to(self, mock_post, postmark_provider, mock_postmark_response):
-        """Test sending email with Reply-To."""
-        mock_post.return_value = mock_postmark_response
-
-        message = EmailMessageDto(
-            to='recipient@example.com',
-            subject='Test',
-            body='Body',
-            reply_to='reply@example.com'
-        )
-
-        response = postmark_provider.send(message)
-
-        assert response.success is True
-
-        payload = mock_post.call_args[1]['json']
-        assert payload['ReplyTo'] == 'reply@example.com'
-
-    @patch('mailbridge.providers.postmark_provider.requests.post')
-    def test_send_with_custom_headers(self, mock_post, postmark_provider, mock_postmark_response):
-        """Test sending email with custom headers."""
-        mock_post.return_value = mock_postmark_response
-
-        message = EmailMessageDto(
-            to='recipient@example.com',
-            subject='Test',
-            body='Body',
-            headers={'X-Custom-Header': 'custom-value', 'X-Priority': '1'}
-        )
-
-        response = postmark_provider.send(message)
-
-        assert response.success is True
-
-        payload = mock_post.call_args[1]['json']
-        assert 'Headers' in payload
-        assert len(payload['Headers']) == 2
-        assert {'Name': 'X-Custom-Header', 'Value': 'custom-value'} in payload['Headers']
-        assert {'Name': 'X-Priority', 'Value': '1'} in payload['Headers']
+        assert postmark_provider._build_payload(message) == {
+            'From': 'sender@example.com',
+            'To': 'recipient@example.com',
+            'Subject': 'Plain Text',
+            'TextBody': 'Plain text content'
+        }
 
-    @patch('mailbridge.providers.postmark_provider.requests.post')
-    def test_send_with_attachments(self, mock_post, postmark_provider, mock_postmark_response, tmp_path):
+    def test_send_with_attachments(self, requests_mock, postmark_provider, sample_attachment_file):
         """Test sending email with attachments."""
-        mock_post.return_value = mock_postmark_response
-
-        test_file = tmp_path / "test.txt"
-        test_file.write_text("Test content")
-
         message = EmailMessageDto(
             to='recipient@example.com',
             subject='With Attachment',
             body='See attached file',
-            attachments=[test_file]
+            attachments=[sample_attachment_file]
         )
 
         response = postmark_provider.send(message)
 
         assert response.success is True
 
-        payload = mock_post.call_args[1]['json']
-        assert 'Attachments' in payload
-        assert len(payload['Attachments']) == 1
-        assert payload['Attachments'][0]['Name'] == 'test.txt'
-        assert payload['Attachments'][0]['ContentType'] == 'application/octet-stream'
-
-        # Check base64 encoding
-        content = base64.b64decode(payload['Attachments'][0]['Content'])
-        assert content.decode() == 'Test content'
+        payload = requests_mock.last_request.json()
+        assert payload['Attachments'] == [{
+            'Name': 'test.txt',
+            'Content': EXPECTED_B64,
+            'ContentType': 'application/octet-stream'
+        }]
 
-    @patch('mailbridge.providers.postmark_provider.requests.post')
-    def test_send_with_tuple_attachment(self, mock_post, postmark_provider, mock_postmark_response):
+    def test_send_with_tuple_attachment(self, postmark_provider):
         """Test sending email with tuple attachment."""
-        mock_post.return_value = mock_postmark_response
-
         attachment = ('report.pdf', b'PDF content', 'application/pdf')
 
         message = EmailMessageDto(
@@ -287,16 +197,14 @@ class TestPostmarkRegularEmail:
             attachments=[attachment]
         )
 
-        response = postmark_provider.send(message)
-
-        assert response.success is True
-
-        payload = mock_post.call_args[1]['json']
-        assert payload['Attachments'][0]['Name'] == 'report.pdf'
-        assert payload['Attachments'][0]['ContentType'] == 'application/pdf'
+        payload = postmark_provider._build_payload(message)
+        assert payload['Attachments'] == [{
+            'Name': 'report.pdf',
+            'Content': base64.b64encode(b'PDF content').decode(),
+            'ContentType': 'application/pdf'
+        }]
 
-    @patch('mailbridge.providers.postmark_provider.requests.post')
-    def test_send_with_tracking_options(self, mock_post, mock_postmark_response):
+    def test_send_with_tracking_options(self):
         """Test sending with tracking options."""
         config = {
             'server_token': 'test-token',
@@ -304,32 +212,21 @@ class TestPostmarkRegularEmail:
             'track_links': 'HtmlAndText'
         }
         provider = PostmarkProvider(**config)
-        mock_post.return_value = mock_postmark_response
-
         message = EmailMessageDto(
             to='recipient@example.com',
             subject='Tracked Email',
             body='Track me'
         )
 
-        response = provider.send(message)
-
-        assert response.success is True
+        payload = provider._build_payload(message)
+        assert {'TrackOpens': True, 'TrackLinks': 'HtmlAndText'}.items() <= payload.items()
 
-        payload = mock_post.call_args[1]['json']
-        assert payload['TrackOpens'] is True
-        assert payload['TrackLinks'] == 'HtmlAndText'
-
-    @patch('mailbridge.providers.postmark_provider.requests.post')
-    def test_send_api_error(self, mock_post, postmark_provider, simple_message):
+    def test_send_api_error(self, requests_mock, postmark_provider, simple_message):
         """Test handling of Postmark API error."""
-        mock_response = Mock()
-        mock_response.status_code = 422
-        mock_response.json.return_value = {
+        requests_mock.post(POSTMARK_URL, status_code=422, json={
             'ErrorCode': 300,
             'Message': 'Invalid email request'
-        }
-        mock_post.return_value = mock_response
+        })
 
         with pytest.raises(EmailSendError) as exc_info:
             postmark_provider.send(simple_message)
@@ -337,11 +234,9 @@ class TestPostmarkRegularEmail:
         assert 'Postmark API error' in str(exc_info.value)
         assert '300' in str(exc_info.value)
 
-    @patch('mailbridge.providers.postmark_provider.requests.post')
-    def test_send_network_error(self, mock_post, postmark_provider, simple_message):
+    def test_send_network_error(self, requests_mock, postmark_provider, simple_message):
         """Test handling of network error."""
-        import requests
-        mock_post.side_effect = requests.ConnectionError('Network error')
+        requests_mock.post(POSTMARK_URL, exc=requests.ConnectionError('Network error'))
 
         with pytest.raises(EmailSendError) as exc_info:
             postmark_provider.send(simple_message)
@@ -356,60 +251,38 @@ class TestPostmarkRegularEmail:
 class TestPostmarkTemplateEmail:
     """Test template email sending."""
 
-    @patch('mailbridge.providers.postmark_provider.requests.post')
-    def test_send_template_email(self, mock_post, postmark_provider, template_message, mock_postmark_response):
+    def test_send_template_email(self, requests_mock, postmark_provider, template_message):
         """Test sending a template email."""
-        mock_post.return_value = mock_postmark_response
-
         response = postmark_provider.send(template_message)
 
         assert response.success is True
         assert response.message_id == 'postmark-message-id-123'
 
-        # Check payload
-        payload = mock_post.call_args[1]['json']
-        assert payload['TemplateId'] == 'welcome-template'
-        assert payload['TemplateModel'] == {
-            'product_name': 'Pro Plan',
-            'name': 'John',
-            'action_url': 'https://example.com/activate'
+        # Template emails carry no HtmlBody or TextBody
+        assert requests_mock.last_request.json() == {
+            'From': 'sender@example.com',
+            'To': 'recipient@example.com',
+            'Subject': None,
+            'TemplateId': 'welcome-template',
+            'TemplateModel': EXPECTED_TEMPLATE_MODEL
         }
 
-        # Should NOT have HtmlBody or TextBody
-        assert 'HtmlBody' not in payload
-        assert 'TextBody' not in payload
-
-    @patch('mailbridge.providers.postmark_provider.requests.post')
-    def test_template_with_empty_data(self, mock_post, postmark_provider, mock_postmark_response):
+    def test_template_with_empty_data(self, postmark_provider):
         """Test template email with no template data."""
-        mock_post.return_value = mock_postmark_response
-
         message = EmailMessageDto(
             to='recipient@example.com',
             template_id='simple-template',
             template_data=None
         )
 
-        response = postmark_provider.send(message)
-
-        assert response.success is True
-
-        payload = mock_post.call_args[1]['json']
+        payload = postmark_provider._build_payload(message)
         assert payload['TemplateModel'] is None
 
-    @patch('mailbridge.providers.postmark_provider.requests.post')
-    def test_template_detection(self, mock_post, postmark_provider, template_message):
+    def test_template_detection(self, postmark_provider, template_message):
         """Test that template emails are properly detected."""
-        mock_post.return_value = Mock(
-            status_code=200,
-            json=Mock(return_value={'MessageID': 'test', 'SubmittedAt': '', 'To': ''})
-        )
-
         assert template_message.is_template_email() is True
 
-        postmark_provider.send(template_message)
-
-        payload = mock_post.call_args[1]['json']
+        payload = postmark_provider._build_payload(template_message)
         assert 'TemplateId' in payload
 
 
@@ -420,22 +293,9 @@ class TestPostmarkTemplateEmail:
 class TestPostmarkBulkEmail:
     """Test bulk email sending."""
 
-    @patch('mailbridge.providers.postmark_provider.requests.post')
-    def test_send_bulk_emails(self, mock_post, postmark_provider):
+    def test_send_bulk_emails(self, requests_mock, postmark_provider):
         """Test sending bulk emails (loops through each)."""
-        mock_response = Mock(
-            status_code=200,
-            json=Mock(return_value={'MessageID': 'bulk-id', 'SubmittedAt': '', 'To': ''})
-        )
-        mock_post.return_value = mock_response
-
-        messages = [
-            EmailMessageDto(to='user1@example.com', subject='Test 1', body='Body 1'),
-            EmailMessageDto(to='user2@example.com', subject='Test 2', body='Body 2'),
-            EmailMessageDto(to='user3@example.com', subject='Test 3', body='Body 3'),
-        ]
-
-        bulk = BulkEmailDTO(messages=messages)
+        bulk = BulkEmailDTO(messages=list(BULK_MESSAGES))
         result = postmark_provider.send_bulk(bulk)
 
         assert result.total == 3
@@ -443,7 +303,7 @@ class TestPostmarkBulkEmail:
         assert result.failed == 0
 
         # Should call send() for each message (no native bulk API used)
-        assert mock_post.call_count == 3
+        assert requests_mock.call_count == 3
 
 
 # =============================================================================
@@ -484,22 +344,20 @@ class TestPostmarkHelpers:
         assert 'HtmlBody' not in payload
         assert 'TextBody' not in payload
 
-    def test_build_attachments(self, postmark_provider, tmp_path):
+    def test_build_attachments(self, postmark_provider, sample_attachment_file):
         """Test _build_attachments helper."""
-        test_file = tmp_path / "document.txt"
-        test_file.write_text("Content")
-
         tuple_attachment = ('file.csv', b'csv,data', 'text/csv')
 
-        attachments = [test_file, tuple_attachment]
+        attachments = [sample_attachment_file, tuple_attachment]
 
         result = postmark_provider._build_attachments(attachments)
 
         assert len(result) == 2
 
         # Check file attachment
-        assert result[0]['Name'] == 'document.txt'
+        assert result[0]['Name'] == 'test.txt'
         assert result[0]['ContentType'] == 'application/octet-stream'
+        assert result[0]['Content'] == EXPECTED_B64
 
         # Check tuple attachment
         assert result[1]['Name'] == 'file.csv'
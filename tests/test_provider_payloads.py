@@ -0,0 +1,117 @@
+"""
+Provider-agnostic payload tests for the HTTP providers.
+
+Tests cover:
+- CC/BCC
+- Reply-To
+- Custom headers
+
+Each case runs against Mailgun, Postmark and SendGrid. A per-provider
+extractor normalises the provider payload into plain Python values so the
+assertions can be shared.
+
+Run with: pytest tests/test_provider_payloads.py -v
+"""
+
+import pytest
+
+from mailbridge.dto.email_message_dto import EmailMessageDto
+
+
+# =============================================================================
+# PAYLOAD EXTRACTORS
+# =============================================================================
+
+def _mailgun_fields(provider, message):
+    data = provider._build_from_data(message)
+    return {
+        'cc': data.get('cc', []),
+        'bcc': data.get('bcc', []),
+        'reply_to': data.get('h:Reply-To'),
+        'headers': {
+            key[2:]: value for key, value in data.items()
+            if key.startswith('h:') and key != 'h:Reply-To'
+        },
+    }
+
+
+def _postmark_fields(provider, message):
+    payload = provider._build_payload(message)
+    return {
+        'cc': payload['Cc'].split(', ') if 'Cc' in payload else [],
+        'bcc': payload['Bcc'].split(', ') if 'Bcc' in payload else [],
+        'reply_to': payload.get('ReplyTo'),
+        'headers': {h['Name']: h['Value'] for h in payload.get('Headers', [])},
+    }
+
+
+def _sendgrid_fields(provider, message):
+    payload = provider._build_payload(message)
+    personalization = payload['personalizations'][0]
+    return {
+        'cc': [r['email'] for r in personalization.get('cc', [])],
+        'bcc': [r['email'] for r in personalization.get('bcc', [])],
+        'reply_to': payload.get('reply_to', {}).get('email'),
+        'headers': payload.get('headers', {}),
+    }
+
+
+EXTRACTORS = {
+    'mailgun': _mailgun_fields,
+    'postmark': _postmark_fields,
+    'sendgrid': _sendgrid_fields,
+}
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+@pytest.fixture(params=sorted(EXTRACTORS))
+def any_provider(request):
+    """(provider, extractor) pair for each HTTP provider."""
+    provider = request.getfixturevalue(f'{request.param}_provider')
+    return provider, EXTRACTORS[request.param]
+
+
+def _message(**kwargs):
+    return EmailMessageDto(to='recipient@example.com', subject='Test', body='Body', **kwargs)
+
+
+# =============================================================================
+# PAYLOAD TESTS
+# =============================================================================
+
+class TestProviderPayloadFields:
+    """Optional message fields land in every provider payload."""
+
+    def test_cc_bcc(self, any_provider):
+        provider, fields = any_provider
+        message = _message(cc=['cc1@example.com', 'cc2@example.com'], bcc=['bcc@example.com'])
+
+        result = fields(provider, message)
+
+        assert result['cc'] == ['cc1@example.com', 'cc2@example.com']
+        assert result['bcc'] == ['bcc@example.com']
+
+    def test_reply_to(self, any_provider):
+        provider, fields = any_provider
+
+        result = fields(provider, _message(reply_to='reply@example.com'))
+
+        assert result['reply_to'] == 'reply@example.com'
+
+    def test_custom_headers(self, any_provider):
+        provider, fields = any_provider
+        headers = {'X-Custom-Header': 'custom-value', 'X-Priority': '1'}
+
+        result = fields(provider, _message(headers=headers))
+
+        assert result['headers'] == headers
+
+    def test_optional_fields_absent(self, any_provider):
+        provider, fields = any_provider
+
+        assert fields(provider, _message()) == {
+            'cc': [], 'bcc': [], 'reply_to': None, 'headers': {},
+        }
@@ -0,0 +1,86 @@
+"""
+Unit tests for the shared outbound rate limiter.
+
+Tests cover:
+- Slot spacing for threads and async tasks
+- Idle time not being banked into bursts
+- max_send_rate config validation
+
+Run with: pytest tests/test_rate_limit.py -v
+"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from mailbridge import rate_limit
+from mailbridge.rate_limit import RateLimiter, rate_limiter_from_config
+from mailbridge.exceptions import ConfigurationError
+
+
+# =============================================================================
+# RATE LIMITER TESTS
+# =============================================================================
+
+class TestRateLimiter:
+    """Test slot spacing."""
+
+    def test_wait_spaces_calls(self):
+        """Test calls made at the same instant are spaced 1 / rate apart."""
+        with patch.object(rate_limit.time, 'monotonic_ns', return_value=10**9), \
+                patch.object(rate_limit.time, 'sleep') as mock_sleep:
+            limiter = RateLimiter(4)
+            for _ in range(3):
+                limiter.wait()
+
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [0.25, 0.5]
+
+    def test_idle_time_does_not_allow_burst(self):
+        """Test a limiter left idle still spaces the next calls."""
+        clock = iter([0, 0, 5 * 10**9, 5 * 10**9])
+        with patch.object(rate_limit.time, 'monotonic_ns', side_effect=lambda: next(clock)), \
+                patch.object(rate_limit.time, 'sleep') as mock_sleep:
+            limiter = RateLimiter(2)
+            limiter.wait()
+            limiter.wait()
+            limiter.wait()
+
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [0.5]
+
+    def test_wait_async_spaces_calls(self):
+        """Test async waiters sleep on the event loop for their slot."""
+        with patch.object(rate_limit.time, 'monotonic_ns', return_value=10**9), \
+                patch.object(rate_limit.asyncio, 'sleep', new_callable=AsyncMock) as mock_sleep, \
+                patch.object(rate_limit.time, 'sleep') as thread_sleep:
+            limiter = RateLimiter(10)
+
+            async def main():
+                await asyncio.gather(*(limiter.wait_async() for _ in range(3)))
+
+            asyncio.run(main())
+
+        assert sorted(c.args[0] for c in mock_sleep.await_args_list) == pytest.approx([0.1, 0.2])
+        thread_sleep.assert_not_called()
+
+
+# =============================================================================
+# CONFIG TESTS
+# =============================================================================
+
+class TestRateLimiterFromConfig:
+    """Test max_send_rate handling."""
+
+    def test_unset_means_unlimited(self):
+        """Test no limiter is built without max_send_rate."""
+        assert rate_limiter_from_config({}, 'SMTP') is None
+
+    @pytest.mark.parametrize('rate', [5, 0.5])
+    def test_valid_rate(self, rate):
+        """Test integer and fractional rates are accepted."""
+        assert isinstance(rate_limiter_from_config({'max_send_rate': rate}, 'SMTP'), RateLimiter)
+
+    @pytest.mark.parametrize('rate', [0, -1, 'fast', True])
+    def test_invalid_rate(self, rate):
+        """Test non-positive and non-numeric rates are rejected."""
+        with pytest.raises(ConfigurationError, match="SMTP 'max_send_rate'"):
+            rate_limiter_from_config({'max_send_rate': rate}, 'SMTP')
@@ -5,52 +5,66 @@ Tests cover:
 - Configuration validation
 - Regular email sending
 - Template email sending
-- Bulk email sending
+- Bulk email sending (sync and async)
 - Error handling
 - Attachments
-- CC/BCC/Reply-To
 
 Run with: pytest tests/test_sendgrid_provider.py -v
 """
 
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import patch
+import asyncio
 import base64
+import io
+import json
+import threading
+import time
 
+from mailbridge import _encoding
 from mailbridge.providers.sendgrid_provider import SendGridProvider
+from mailbridge.providers import sendgrid_provider as sendgrid_provider_module
 from mailbridge.dto.email_message_dto import EmailMessageDto
 from mailbridge.dto.bulk_email_dto import BulkEmailDTO
 from mailbridge.exceptions import ConfigurationError, EmailSendError
+from tests.helpers import FakeResp
 
 
 # =============================================================================
 # FIXTURES
 # =============================================================================
 
-@pytest.fixture
-def sendgrid_config():
-    """SendGrid configuration fixture."""
-    return {
-        'api_key': 'SG.test_api_key_12345',
-        'from_email': 'sender@example.com'
-    }
+EXPECTED_B64 = base64.b64encode(b'Test content').decode()
 
+EXPECTED_TEMPLATE_DATA = {
+    'name': 'John Doe',
+    'company': 'Acme Corp'
+}
 
-@pytest.fixture
-def sendgrid_provider(sendgrid_config):
-    """SendGrid provider fixture."""
-    return SendGridProvider(**sendgrid_config)
+BULK_MESSAGES = (
+    EmailMessageDto(to='user1@example.com', subject='Test 1', body='Body 1'),
+    EmailMessageDto(to='user2@example.com', subject='Test 2', body='Body 2'),
+    EmailMessageDto(to='user3@example.com', subject='Test 3', body='Body 3'),
+)
 
 
-@pytest.fixture
-def simple_message():
-    """Simple email message fixture."""
-    return EmailMessageDto(
-        to='recipient@example.com',
-        subject='Test Email',
-        body='<h1>Hello World</h1>',
-        html=True
-    )
+def _sent_payload(mock_post):
+    """Decode the JSON body of the last mocked POST."""
+    return json.loads(mock_post.call_args[1]['data'])
+
+
+@pytest.fixture(scope='module')
+def _patched_post():
+    """Patch Session.post once for the whole module."""
+    with patch.object(sendgrid_provider_module.requests.Session, 'post') as mock:
+        yield mock
+
+
+@pytest.fixture(autouse=True)
+def mock_post(_patched_post):
+    """Module-wide Session.post mock, reset before every test."""
+    _patched_post.reset_mock(return_value=True, side_effect=True)
+    return _patched_post
 
 
 @pytest.fixture
@@ -66,13 +80,10 @@ def template_message():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope='module')
 def mock_requests_response():
     """Mock requests response fixture."""
-    mock_response = Mock()
-    mock_response.status_code = 202
-    mock_response.headers = {'X-Message-Id': 'test_message_id_123'}
-    return mock_response
+    return FakeResp(status_code=202, headers={'X-Message-Id': 'test_message_id_123'})
 
 
 # =============================================================================
@@ -92,8 +103,8 @@ class TestSendGridConfiguration:
 
     def test_custom_endpoint(self, sendgrid_config):
         """Test provider accepts custom endpoint."""
-        sendgrid_config['endpoint'] = 'https://custom.sendgrid.com/v3/mail/send'
-        provider = SendGridProvider(**sendgrid_config)
+        config = {**sendgrid_config, 'endpoint': 'https://custom.sendgrid.com/v3/mail/send'}
+        provider = SendGridProvider(**config)
 
         assert provider.endpoint == 'https://custom.sendgrid.com/v3/mail/send'
 
@@ -104,6 +115,25 @@ class TestSendGridConfiguration:
 
         assert 'api_key' in str(exc_info.value)
 
+    def test_session_pools_connections(self, sendgrid_provider):
+        """Test sends go through one pooled session that only retries safe failures."""
+        adapter = sendgrid_provider.session.get_adapter(sendgrid_provider.endpoint)
+        retry = adapter.max_retries
+
+        assert adapter._pool_maxsize == 50
+        assert retry.total == 3
+        assert retry.read == 0
+        assert retry.status_forcelist == (429,)
+        assert 'POST' in retry.allowed_methods
+
+    def test_session_pool_options(self, sendgrid_config):
+        """Test pool size and retry count can be configured."""
+        provider = SendGridProvider(**sendgrid_config, pool_size=5, max_retries=0)
+        adapter = provider.session.get_adapter(provider.endpoint)
+
+        assert adapter._pool_maxsize == 5
+        assert adapter.max_retries.total == 0
+
     def test_supports_templates(self, sendgrid_provider):
         """Test provider indicates template support."""
         assert sendgrid_provider.supports_templates() is True
@@ -112,6 +142,11 @@ class TestSendGridConfiguration:
         """Test provider indicates bulk sending support."""
         assert sendgrid_provider.supports_bulk_sending() is True
 
+    def test_capabilities_on_class(self):
+        """Test capabilities can be read without instantiating the provider."""
+        assert SendGridProvider.SUPPORTS_TEMPLATES is True
+        assert SendGridProvider.SUPPORTS_BULK_SENDING is True
+
 
 # =============================================================================
 # REGULAR EMAIL TESTS
@@ -120,7 +155,6 @@ class TestSendGridConfiguration:
 class TestSendGridRegularEmail:
     """Test regular email sending."""
 
-    @patch('mailbridge.providers.sendgrid_provider.requests.post')
     def test_send_simple_email(self, mock_post, sendgrid_provider, simple_message, mock_requests_response):
         """Test sending a simple email."""
         mock_post.return_value = mock_requests_response
@@ -146,84 +180,15 @@ class TestSendGridRegularEmail:
         assert headers['Content-Type'] == 'application/json'
 
         # Check payload
-        payload = call_args[1]['json']
+        payload = _sent_payload(mock_post)
         assert payload['personalizations'][0]['to'] == [{'email': 'recipient@example.com'}]
         assert payload['from']['email'] == 'sender@example.com'
         assert payload['subject'] == 'Test Email'
         assert payload['content'][0]['type'] == 'text/html'
         assert payload['content'][0]['value'] == '<h1>Hello World</h1>'
 
-    @patch('mailbridge.providers.sendgrid_provider.requests.post')
-    def test_send_with_cc_bcc(self, mock_post, sendgrid_provider, mock_requests_response):
-        """Test sending email with CC and BCC."""
-        mock_post.return_value = mock_requests_response
-
-        message = EmailMessageDto(
-            to='recipient@example.com',
-            subject='Test',
-            body='Test body',
-            cc=['cc1@example.com', 'cc2@example.com'],
-            bcc=['bcc@example.com']
-        )
-
-        response = sendgrid_provider.send(message)
-
-        assert response.success is True
-
-        # Check payload
-        payload = mock_post.call_args[1]['json']
-        assert payload['personalizations'][0]['cc'] == [
-            {'email': 'cc1@example.com'},
-            {'email': 'cc2@example.com'}
-        ]
-        assert payload['personalizations'][0]['bcc'] == [
-            {'email': 'bcc@example.com'}
-        ]
-
-    @patch('mailbridge.providers.sendgrid_provider.requests.post')
-    def test_send_with_reply_to(self, mock_post, sendgrid_provider, mock_requests_response):
-        """Test sending email with Reply-To header."""
-        mock_post.return_value = mock_requests_response
-
-        message = EmailMessageDto(
-            to='recipient@example.com',
-            subject='Test',
-            body='Test body',
-            reply_to='reply@example.com'
-        )
-
-        response = sendgrid_provider.send(message)
-
-        assert response.success is True
-
-        payload = mock_post.call_args[1]['json']
-        assert payload['reply_to']['email'] == 'reply@example.com'
-
-    @patch('mailbridge.providers.sendgrid_provider.requests.post')
-    def test_send_with_custom_headers(self, mock_post, sendgrid_provider, mock_requests_response):
-        """Test sending email with custom headers."""
-        mock_post.return_value = mock_requests_response
-
-        message = EmailMessageDto(
-            to='recipient@example.com',
-            subject='Test',
-            body='Test body',
-            headers={'X-Custom-Header': 'custom-value', 'X-Priority': '1'}
-        )
-
-        response = sendgrid_provider.send(message)
-
-        assert response.success is True
-
-        payload = mock_post.call_args[1]['json']
-        assert payload['headers']['X-Custom-Header'] == 'custom-value'
-        assert payload['headers']['X-Priority'] == '1'
-
-    @patch('mailbridge.providers.sendgrid_provider.requests.post')
-    def test_send_plain_text(self, mock_post, sendgrid_provider, mock_requests_response):
+    def test_send_plain_text(self, sendgrid_provider):
         """Test sending plain text email."""
-        mock_post.return_value = mock_requests_response
-
         message = EmailMessageDto(
             to='recipient@example.com',
             subject='Test',
@@ -231,49 +196,35 @@ class TestSendGridRegularEmail:
             html=False
         )
 
-        response = sendgrid_provider.send(message)
-
-        assert response.success is True
-
-        payload = mock_post.call_args[1]['json']
+        payload = sendgrid_provider._build_payload(message)
         assert payload['content'][0]['type'] == 'text/plain'
         assert payload['content'][0]['value'] == 'Plain text body'
 
-    @patch('mailbridge.providers.sendgrid_provider.requests.post')
-    def test_send_with_attachments(self, mock_post, sendgrid_provider, mock_requests_response, tmp_path):
+    def test_send_with_attachments(self, mock_post, sendgrid_provider, mock_requests_response, sample_attachment_file):
         """Test sending email with attachments."""
         mock_post.return_value = mock_requests_response
 
-        # Create temporary file
-        test_file = tmp_path / "test.txt"
-        test_file.write_text("Test content")
-
         message = EmailMessageDto(
             to='recipient@example.com',
             subject='Test',
             body='Test body',
-            attachments=[test_file]
+            attachments=[sample_attachment_file]
         )
 
         response = sendgrid_provider.send(message)
 
         assert response.success is True
 
-        payload = mock_post.call_args[1]['json']
+        payload = _sent_payload(mock_post)
         assert 'attachments' in payload
         assert len(payload['attachments']) == 1
         assert payload['attachments'][0]['filename'] == 'test.txt'
-        assert payload['attachments'][0]['type'] == 'application/octet-stream'
+        assert payload['attachments'][0]['type'] == 'text/plain'
 
-        # Check base64 encoding
-        content = base64.b64decode(payload['attachments'][0]['content'])
-        assert content.decode() == 'Test content'
+        assert payload['attachments'][0]['content'] == EXPECTED_B64
 
-    @patch('mailbridge.providers.sendgrid_provider.requests.post')
-    def test_send_with_tuple_attachment(self, mock_post, sendgrid_provider, mock_requests_response):
+    def test_send_with_tuple_attachment(self, sendgrid_provider):
         """Test sending email with tuple attachment."""
-        mock_post.return_value = mock_requests_response
-
         attachment = ('report.pdf', b'PDF content', 'application/pdf')
 
         message = EmailMessageDto(
@@ -283,28 +234,19 @@ class TestSendGridRegularEmail:
             attachments=[attachment]
         )
 
-        response = sendgrid_provider.send(message)
-
-        assert response.success is True
-
-        payload = mock_post.call_args[1]['json']
+        payload = sendgrid_provider._build_payload(message)
         assert payload['attachments'][0]['filename'] == 'report.pdf'
         assert payload['attachments'][0]['type'] == 'application/pdf'
 
-    @patch('mailbridge.providers.sendgrid_provider.requests.post')
     def test_send_api_error(self, mock_post, sendgrid_provider, simple_message):
         """Test handling of SendGrid API error."""
-        mock_response = Mock()
-        mock_response.status_code = 400
-        mock_response.text = 'Bad Request: Invalid email'
-        mock_post.return_value = mock_response
+        mock_post.return_value = FakeResp(status_code=400, text='Bad Request: Invalid email')
 
         with pytest.raises(EmailSendError) as exc_info:
             sendgrid_provider.send(simple_message)
         assert 'SendGrid template error' in str(exc_info.value)
         assert '400' in str(exc_info.value)
 
-    @patch('mailbridge.providers.sendgrid_provider.requests.post')
     def test_send_network_error(self, mock_post, sendgrid_provider, simple_message):
         """Test handling of network error."""
         import requests
@@ -323,7 +265,6 @@ class TestSendGridRegularEmail:
 class TestSendGridTemplateEmail:
     """Test template email sending."""
 
-    @patch('mailbridge.providers.sendgrid_provider.requests.post')
     def test_send_template_email(self, mock_post, sendgrid_provider, template_message, mock_requests_response):
         """Test sending a template email."""
         mock_post.return_value = mock_requests_response
@@ -334,45 +275,47 @@ class TestSendGridTemplateEmail:
         assert response.message_id == 'test_message_id_123'
 
         # Check payload
-        payload = mock_post.call_args[1]['json']
+        payload = _sent_payload(mock_post)
         assert payload['template_id'] == 'd-1234567890abcdef'
-        assert payload['personalizations'][0]['dynamic_template_data'] == {
-            'name': 'John Doe',
-            'company': 'Acme Corp'
-        }
+        assert payload['personalizations'][0]['dynamic_template_data'] == EXPECTED_TEMPLATE_DATA
 
         # Should NOT have subject or content
         assert 'subject' not in payload
         assert 'content' not in payload
 
-    @patch('mailbridge.providers.sendgrid_provider.requests.post')
-    def test_template_with_empty_data(self, mock_post, sendgrid_provider, mock_requests_response):
-        """Test template email with no template data."""
+    def test_send_template_data_non_str_keys_and_big_ints(self, mock_post, sendgrid_provider, mock_requests_response):
+        """Test template data that plain orjson rejects still serializes like json."""
         mock_post.return_value = mock_requests_response
-
         message = EmailMessageDto(
             to='recipient@example.com',
             template_id='d-template-id',
-            template_data=None,
+            template_data={1: 'a', 'big': 2 ** 70},
+            headers={'X-Count': 2 ** 70}
         )
 
         response = sendgrid_provider.send(message)
 
         assert response.success is True
+        payload = _sent_payload(mock_post)
+        assert payload['personalizations'][0]['dynamic_template_data'] == {'1': 'a', 'big': 2 ** 70}
+        assert payload['headers'] == {'X-Count': 2 ** 70}
 
-        payload = mock_post.call_args[1]['json']
+    def test_template_with_empty_data(self, sendgrid_provider):
+        """Test template email with no template data."""
+        message = EmailMessageDto(
+            to='recipient@example.com',
+            template_id='d-template-id',
+            template_data=None,
+        )
+
+        payload = sendgrid_provider._build_payload(message)
         assert payload['personalizations'][0]['dynamic_template_data'] == None
 
-    @patch('mailbridge.providers.sendgrid_provider.requests.post')
-    def test_template_is_detected(self, mock_post, sendgrid_provider, template_message):
+    def test_template_is_detected(self, sendgrid_provider, template_message):
         """Test that template emails are properly detected."""
-        mock_post.return_value = Mock(status_code=202, headers={'X-Message-Id': 'test_id'})
-
         assert template_message.is_template_email() is True
 
-        sendgrid_provider.send(template_message)
-
-        payload = mock_post.call_args[1]['json']
+        payload = sendgrid_provider._build_payload(template_message)
         assert 'template_id' in payload
 
 
@@ -383,21 +326,43 @@ class TestSendGridTemplateEmail:
 class TestSendGridBulkEmail:
     """Test bulk email sending."""
 
-    @patch('mailbridge.providers.sendgrid_provider.requests.post')
-    def test_send_bulk_regular_emails(self, mock_post, sendgrid_provider):
-        """Test sending bulk regular emails."""
-        mock_response = Mock(status_code=202, headers={'X-Message-Id': 'bulk_id_123'})
-        mock_post.return_value = mock_response
+    def test_send_bulk_regular_emails(self, mock_post, sendgrid_provider, mock_requests_response):
+        """Test sending bulk regular emails with shared content."""
+        mock_post.return_value = mock_requests_response
 
         messages = [
-            EmailMessageDto(to='user1@example.com', subject='Test 1', body='Body 1'),
-            EmailMessageDto(to='user2@example.com', subject='Test 2', body='Body 2'),
-            EmailMessageDto(to='user3@example.com', subject='Test 3', body='Body 3'),
+            EmailMessageDto(to='user1@example.com', cc='cc@example.com', subject='News', body='Body'),
+            EmailMessageDto(to='user2@example.com', subject='News', body='Body'),
+            EmailMessageDto(to='user3@example.com', subject='News', body='Body'),
         ]
 
         bulk = BulkEmailDTO(messages=messages)
         result = sendgrid_provider.send_bulk(bulk)
 
+        assert result.total == 1  # Batched into one request
+        assert result.successful == 1
+        assert result.failed == 0
+        assert result.responses[0].metadata['bulk_count'] == 3
+
+        # Should call API once with all personalizations
+        assert mock_post.call_count == 1
+
+        payload = _sent_payload(mock_post)
+        assert payload['subject'] == 'News'
+        assert payload['content'] == [{'type': 'text/html', 'value': 'Body'}]
+        assert payload['personalizations'] == [
+            {'to': [{'email': 'user1@example.com'}], 'cc': [{'email': 'cc@example.com'}]},
+            {'to': [{'email': 'user2@example.com'}]},
+            {'to': [{'email': 'user3@example.com'}]},
+        ]
+
+    def test_send_bulk_regular_emails_different_content(self, mock_post, sendgrid_provider, mock_requests_response):
+        """Test that regular emails with different subjects are sent separately."""
+        mock_post.return_value = mock_requests_response
+
+        bulk = BulkEmailDTO(messages=list(BULK_MESSAGES))
+        result = sendgrid_provider.send_bulk(bulk)
+
         assert result.total == 3
         assert result.successful == 3
         assert result.failed == 0
@@ -406,11 +371,66 @@ class TestSendGridBulkEmail:
         # Should call send() for each message
         assert mock_post.call_count == 3
 
-    @patch('mailbridge.providers.sendgrid_provider.requests.post')
-    def test_send_bulk_template_emails(self, mock_post, sendgrid_provider):
+    def test_send_bulk_unhashable_attachment_sent_alone(self, mock_post, sendgrid_provider, mock_requests_response):
+        """Test a message with bytearray attachment content is sent without batching."""
+        mock_post.return_value = mock_requests_response
+        attachment = ('data.bin', bytearray(b'Test content'), 'application/octet-stream')
+
+        messages = [
+            EmailMessageDto(to='user1@example.com', subject='News', body='Body', attachments=[attachment]),
+            EmailMessageDto(to='user2@example.com', subject='News', body='Body'),
+            EmailMessageDto(to='user3@example.com', subject='News', body='Body'),
+        ]
+
+        result = sendgrid_provider.send_bulk(BulkEmailDTO(messages=messages))
+
+        assert result.total == 2
+        assert result.successful == 2
+        payloads = [json.loads(call[1]['data']) for call in mock_post.call_args_list]
+        assert [len(p['personalizations']) for p in payloads] == [1, 2]
+        assert payloads[0]['attachments'][0]['content'] == EXPECTED_B64
+
+    def test_send_bulk_regular_emails_batch_limit(self, mock_post, sendgrid_provider, mock_requests_response):
+        """Test that batches are split at SendGrid's recipient limit."""
+        mock_post.return_value = mock_requests_response
+
+        messages = [
+            EmailMessageDto(to=f'user{i}@example.com', subject='News', body='Body')
+            for i in range(1001)
+        ]
+
+        result = sendgrid_provider.send_bulk(BulkEmailDTO(messages=messages))
+
+        assert result.total == 2
+        assert mock_post.call_count == 2
+        assert len(_sent_payload(mock_post)['personalizations']) == 1
+
+    def test_send_bulk_batch_limit_counts_cc_and_bcc(self, mock_post, sendgrid_provider, mock_requests_response):
+        """Test that cc and bcc addresses count toward the per-request recipient limit."""
+        mock_post.return_value = mock_requests_response
+
+        messages = [
+            EmailMessageDto(
+                to=f'user{i}@example.com',
+                cc=f'cc{i}@example.com',
+                bcc=f'bcc{i}@example.com',
+                subject='News',
+                body='Body'
+            )
+            for i in range(1000)
+        ]
+
+        result = sendgrid_provider.send_bulk(BulkEmailDTO(messages=messages))
+
+        payloads = [json.loads(call[1]['data']) for call in mock_post.call_args_list]
+        # 333 messages of 3 recipients fit under 1000; the last one goes alone
+        assert result.total == 4
+        assert [len(p['personalizations']) for p in payloads] == [333, 333, 333, 1]
+        assert all(p['personalizations'][0].keys() == {'to', 'cc', 'bcc'} for p in payloads)
+
+    def test_send_bulk_template_emails(self, mock_post, sendgrid_provider, mock_requests_response):
         """Test sending bulk template emails."""
-        mock_response = Mock(status_code=202, headers={'X-Message-Id': 'bulk_template_id'})
-        mock_post.return_value = mock_response
+        mock_post.return_value = mock_requests_response
 
         messages = [
             EmailMessageDto(
@@ -441,7 +461,7 @@ class TestSendGridBulkEmail:
         assert mock_post.call_count == 1
 
         # Check payload structure
-        payload = mock_post.call_args[1]['json']
+        payload = _sent_payload(mock_post)
         assert payload['template_id'] == 'd-welcome'
         assert len(payload['personalizations']) == 3
 
@@ -451,11 +471,9 @@ class TestSendGridBulkEmail:
         assert payload['personalizations'][1]['to'] == [{'email': 'user2@example.com'}]
         assert payload['personalizations'][1]['dynamic_template_data'] == {'name': 'Bob'}
 
-    @patch('mailbridge.providers.sendgrid_provider.requests.post')
-    def test_send_bulk_mixed_emails(self, mock_post, sendgrid_provider):
+    def test_send_bulk_mixed_emails(self, mock_post, sendgrid_provider, mock_requests_response):
         """Test sending bulk with mix of regular and template emails."""
-        mock_response = Mock(status_code=202, headers={'X-Message-Id': 'mixed_id'})
-        mock_post.return_value = mock_response
+        mock_post.return_value = mock_requests_response
 
         messages = [
             # Template emails
@@ -474,11 +492,9 @@ class TestSendGridBulkEmail:
         # Should call API twice: once for template batch, once for regular
         assert mock_post.call_count == 2
 
-    @patch('mailbridge.providers.sendgrid_provider.requests.post')
-    def test_send_bulk_multiple_templates(self, mock_post, sendgrid_provider):
+    def test_send_bulk_multiple_templates(self, mock_post, sendgrid_provider, mock_requests_response):
         """Test sending bulk with different template IDs."""
-        mock_response = Mock(status_code=202, headers={'X-Message-Id': 'multi_template_id'})
-        mock_post.return_value = mock_response
+        mock_post.return_value = mock_requests_response
 
         messages = [
             EmailMessageDto(to='user1@example.com', template_id='d-welcome', template_data={'name': 'Alice'}),
@@ -495,11 +511,9 @@ class TestSendGridBulkEmail:
         # Should call API twice: once per template_id
         assert mock_post.call_count == 2
 
-    @patch('mailbridge.providers.sendgrid_provider.requests.post')
-    def test_send_bulk_with_defaults(self, mock_post, sendgrid_provider):
+    def test_send_bulk_with_defaults(self, mock_post, sendgrid_provider, mock_requests_response):
         """Test bulk sending with default_from."""
-        mock_response = Mock(status_code=202, headers={'X-Message-Id': 'default_id'})
-        mock_post.return_value = mock_response
+        mock_post.return_value = mock_requests_response
 
         messages = [
             EmailMessageDto(to='user1@example.com', subject='Test', body='Body'),
@@ -513,12 +527,73 @@ class TestSendGridBulkEmail:
 
         result = sendgrid_provider.send_bulk(bulk)
 
-        assert result.successful == 2
+        assert result.successful == 1  # Same content, batched into one request
+        assert _sent_payload(mock_post)['from'] == {'email': 'noreply@example.com'}
 
         # Check that default_from was applied
         for msg in bulk.messages:
             assert msg.from_email == 'noreply@example.com'
 
+
+@pytest.fixture
+def mock_async_transport():
+    """Serve send_bulk_async requests from an in-process httpx transport."""
+    httpx = pytest.importorskip('httpx')
+    sent = []
+    sent_status = {'code': 202}
+
+    def handle(request):
+        sent.append(request)
+        if sent_status['code'] != 202:
+            return httpx.Response(sent_status['code'], text='Bad Request')
+        return httpx.Response(202, headers={'X-Message-Id': f'async_{len(sent)}'})
+
+    with patch.object(
+        sendgrid_provider_module.httpx, 'AsyncHTTPTransport',
+        return_value=httpx.MockTransport(handle)
+    ) as transport_class:
+        yield transport_class, sent, sent_status
+
+
+class TestSendGridBulkEmailAsync:
+    """Test concurrent bulk sending over httpx."""
+
+    def test_send_bulk_async(self, mock_async_transport, sendgrid_provider):
+        transport_class, sent, _ = mock_async_transport
+        messages = [
+            EmailMessageDto(to='user1@example.com', template_id='d-welcome', template_data={'name': 'Alice'}),
+            EmailMessageDto(to='user2@example.com', template_id='d-welcome', template_data={'name': 'Bob'}),
+            EmailMessageDto(to='admin@example.com', subject='Admin Report', body='Report content'),
+        ]
+
+        result = asyncio.run(sendgrid_provider.send_bulk_async(BulkEmailDTO(messages=messages)))
+
+        assert result.total == 2
+        assert result.successful == 2
+        assert result.responses[0].metadata == {
+            'status_code': 202, 'bulk_count': 2, 'template_id': 'd-welcome'
+        }
+        assert transport_class.call_args[1]['http2'] is True
+
+        assert len(sent) == 2
+        assert sent[0].headers['Authorization'] == 'Bearer SG.test_api_key_12345'
+        assert len(json.loads(sent[0].content)['personalizations']) == 2
+        assert json.loads(sent[1].content)['subject'] == 'Admin Report'
+
+    def test_send_bulk_async_error(self, mock_async_transport, sendgrid_provider):
+        _, _, status = mock_async_transport
+        status['code'] = 400
+
+        with pytest.raises(EmailSendError, match='400'):
+            asyncio.run(sendgrid_provider.send_bulk_async(BulkEmailDTO(messages=list(BULK_MESSAGES))))
+
+    def test_send_bulk_async_requires_httpx(self, sendgrid_provider):
+        bulk = BulkEmailDTO(messages=list(BULK_MESSAGES))
+
+        with patch.object(sendgrid_provider_module, 'HTTPX_AVAILABLE', False):
+            with pytest.raises(ConfigurationError, match='httpx'):
+                asyncio.run(sendgrid_provider.send_bulk_async(bulk))
+
 # =============================================================================
 # HELPER METHODS TESTS
 # =============================================================================
@@ -586,6 +661,118 @@ class TestSendGridHelpers:
         assert 'subject' not in payload
         assert 'content' not in payload
 
+    def test_build_payload_from(self, sendgrid_provider):
+        """Test that the sender falls back to the configured from_email."""
+        default = sendgrid_provider._build_payload(EmailMessageDto(to='a@example.com', subject='S', body='B'))
+        custom = sendgrid_provider._build_payload(
+            EmailMessageDto(to='a@example.com', subject='S', body='B', from_email='custom@example.com')
+        )
+
+        assert default['from'] == {'email': 'sender@example.com'}
+        assert custom['from'] == {'email': 'custom@example.com'}
+        assert sendgrid_provider._default_from == {'email': 'sender@example.com'}
+
+    def test_build_personalizations_share_address_objects(self, sendgrid_provider):
+        """Test that repeated addresses reuse one cached address dict."""
+        messages = [
+            EmailMessageDto(to='user1@example.com', cc='team@example.com', template_id='d-1'),
+            EmailMessageDto(to='user2@example.com', cc='team@example.com', template_id='d-1'),
+        ]
+
+        first, second = sendgrid_provider._build_personalizations(messages)
+
+        assert first['cc'] == [{'email': 'team@example.com'}]
+        assert first['cc'][0] is second['cc'][0]
+
+    def test_build_attachments_streams_file(self, sendgrid_provider, tmp_path, monkeypatch):
+        """Test file attachments are read in bounded chunks and encode to plain base64."""
+        data = bytes(range(256)) * 10 + b'xy'
+        test_file = tmp_path / "blob.bin"
+        test_file.write_bytes(data)
+        reads = []
+
+        class RecordingFile(io.BytesIO):
+            def readinto(self, buffer):
+                read = super().readinto(buffer)
+                reads.append((len(buffer), id(buffer)))
+                return read
+
+        monkeypatch.setattr(_encoding, 'FILE_CHUNK_SIZE', 300)
+        monkeypatch.setattr(_encoding, 'open', lambda path, mode='r': RecordingFile(data), raising=False)
+
+        result = sendgrid_provider._build_attachments([test_file])
+
+        assert result[0]['content'] == base64.b64encode(data).decode()
+        assert len(reads) > 1
+        # One chunk-sized buffer, reused for every read
+        assert set(reads) == {(300, reads[0][1])}
+
+    @pytest.mark.parametrize('b64encode', [
+        base64.b64encode,
+        _encoding.b64encode,
+    ], ids=['stdlib', 'default'])
+    def test_build_attachments_tuple_encoders(self, sendgrid_provider, b64encode):
+        """Test tuple attachments encode the same with and without pybase64."""
+        data = bytes(range(256)) * 10
+
+        with patch.object(_encoding, 'b64encode', b64encode):
+            result = sendgrid_provider._build_attachments([('file.pdf', data, 'application/pdf')])
+
+        assert result[0]['content'] == base64.b64encode(data).decode()
+
+    @pytest.mark.parametrize('name,expected', [
+        ('report.PDF', 'application/pdf'),
+        ('photo.png', 'image/png'),
+        ('data.unknownext', 'application/octet-stream'),
+        ('README', 'application/octet-stream'),
+    ])
+    def test_build_attachments_guesses_mime(self, sendgrid_provider, tmp_path, name, expected):
+        """Test that file attachments get a MIME type from their extension."""
+        path = tmp_path / name
+        path.write_bytes(b'data')
+
+        result = sendgrid_provider._build_attachments([path])
+
+        assert result[0]['type'] == expected
+
+    def test_build_attachments_parallel_keeps_order(self, sendgrid_config):
+        """Test that attachments encoded on the pool keep their order."""
+        provider = SendGridProvider(**sendgrid_config)
+        attachments = [(f'file{i}.txt', f'content {i}', 'text/plain') for i in range(6)]
+
+        with provider:
+            result = provider._build_attachments(attachments)
+            assert provider._encode_pool is not None
+
+        assert provider._encode_pool is None
+        assert [a['filename'] for a in result] == [f'file{i}.txt' for i in range(6)]
+        assert base64.b64decode(result[5]['content']) == b'content 5'
+
+    def test_encode_pool_created_once_across_threads(self, sendgrid_config):
+        """Test concurrent payload builders share a single encoding pool."""
+        provider = SendGridProvider(**sendgrid_config)
+        real_executor = sendgrid_provider_module.ThreadPoolExecutor
+        start = threading.Barrier(8)
+
+        def slow_executor(*args, **kwargs):
+            # Widen the window between the None check and the assignment
+            time.sleep(0.01)
+            return real_executor(*args, **kwargs)
+
+        def get_pool():
+            start.wait()
+            return provider._get_encode_pool()
+
+        with patch.object(sendgrid_provider_module, 'ThreadPoolExecutor',
+                          side_effect=slow_executor) as executor_class:
+            with real_executor(max_workers=8) as callers:
+                pools = list(callers.map(lambda _: get_pool(), range(8)))
+
+        provider.close()
+        executor_class.assert_called_once()
+        assert all(pool is pools[0] for pool in pools)
+        assert provider._encode_pool is None
+
 
 # =============================================================================
 # CONTEXT MANAGER TESTS
@@ -600,8 +787,15 @@ class TestSendGridContextManager:
             assert provider is not None
             assert isinstance(provider, SendGridProvider)
 
-        # Provider should be closed after exiting context
-        # (SendGrid doesn't need explicit cleanup, but test the pattern works)
+    def test_context_manager_closes_session(self, sendgrid_config):
+        """Test leaving the context closes the pooled HTTP session."""
+        provider = SendGridProvider(**sendgrid_config)
+
+        with patch.object(provider.session, 'close') as mock_close:
+            with provider:
+                mock_close.assert_not_called()
+
+        mock_close.assert_called_once()
 
 
 # =============================================================================
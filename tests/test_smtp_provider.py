@@ -8,55 +8,130 @@ Tests cover:
 - CC/BCC/Reply-To
 - Attachments
 - TLS vs SSL connections
+- Delivery to an in-process SMTP server (aiosmtpd)
 - Error handling
 
 Run with: pytest tests/test_smtp_provider.py -v
 """
 
+import asyncio
+import base64
+import email
+from email.header import decode_header, make_header
+import io
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 from pathlib import Path
 import smtplib
+import socket
+import ssl
 
+from mailbridge import _encoding, rate_limit
+from mailbridge.providers import smtp_provider as smtp_provider_module
 from mailbridge.providers.smtp_provider import SMTPProvider
 from mailbridge.dto.email_message_dto import EmailMessageDto
+from mailbridge.dto.bulk_email_dto import BulkEmailDTO
 from mailbridge.dto.email_response_dto import EmailResponseDTO
 from mailbridge.exceptions import ConfigurationError, EmailSendError
 
+try:
+    from aiosmtpd.controller import Controller
+    from aiosmtpd.smtp import AuthResult
+    AIOSMTPD_AVAILABLE = True
+except ImportError:
+    AIOSMTPD_AVAILABLE = False
+
 
 # =============================================================================
 # FIXTURES
 # =============================================================================
 
+# (port, use_tls, use_ssl, smtplib class) for STARTTLS, implicit SSL and plain SMTP
+TRANSPORTS = [
+    (587, True, False, 'SMTP'),
+    (465, False, True, 'SMTP_SSL'),
+    (25, False, False, 'SMTP'),
+]
+TRANSPORT_IDS = ['starttls', 'ssl', 'plain']
+
+
+NON_ASCII_FIELDS = {
+    'subject': 'Héllo',
+    'body': 'Body',
+    'from_email': 'Zoë Sender <sender@example.com>',
+    'cc': 'Ćao <cc@example.com>',
+    'reply_to': 'Zoë <reply@example.com>',
+    'headers': {'X-Name': 'Zoë'},
+}
+NON_ASCII_HEADERS = {
+    'Subject': 'Héllo',
+    'From': 'Zoë Sender <sender@example.com>',
+    'Cc': 'Ćao <cc@example.com>',
+    'Reply-To': 'Zoë <reply@example.com>',
+    'X-Name': 'Zoë',
+}
+
+
+def decoded_header(msg, name):
+    """Header value with any RFC 2047 encoded words decoded."""
+    return str(make_header(decode_header(msg[name])))
+
+
+def parse_sent_message(mock_server):
+    """Parse the raw bytes handed to sendmail() back into a message."""
+    return email.message_from_bytes(mock_server.sendmail.call_args[0][2])
+
+
+class RecordingHandler:
+    """aiosmtpd handler that keeps every delivered envelope."""
+
+    def __init__(self):
+        self.envelopes = []
+        self.sessions = set()
+
+    async def handle_DATA(self, server, session, envelope):
+        self.sessions.add(id(session))
+        self.envelopes.append(envelope)
+        return '250 Message accepted'
+
+
+@pytest.fixture(scope='session')
+def _smtp_server():
+    """In-process SMTP server on a free loopback port, started once per session."""
+    if not AIOSMTPD_AVAILABLE:
+        pytest.skip('aiosmtpd not installed')
+
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+
+    controller = Controller(
+        RecordingHandler(),
+        hostname='127.0.0.1',
+        port=port,
+        authenticator=lambda *args: AuthResult(success=True),
+        auth_require_tls=False
+    )
+    controller.start()
+    yield controller
+    controller.stop()
+
+
 @pytest.fixture
-def smtp_config():
-    """SMTP configuration fixture."""
-    return {
-        'host': 'smtp.example.com',
-        'port': 587,
+def live_smtp(_smtp_server):
+    """(config, handler) for the shared SMTP server, with no deliveries recorded yet."""
+    handler = _smtp_server.handler
+    handler.envelopes.clear()
+    handler.sessions.clear()
+    config = {
+        'host': '127.0.0.1',
+        'port': _smtp_server.port,
         'username': 'user@example.com',
         'password': 'password123',
         'from_email': 'sender@example.com',
-        'use_tls': True,
-        'use_ssl': False
+        'use_tls': False,
     }
-
-
-@pytest.fixture
-def smtp_provider(smtp_config):
-    """SMTP provider fixture."""
-    return SMTPProvider(**smtp_config)
-
-
-@pytest.fixture
-def simple_message():
-    """Simple email message fixture."""
-    return EmailMessageDto(
-        to='recipient@example.com',
-        subject='Test Email',
-        body='<h1>Hello World</h1>',
-        html=True
-    )
+    return config, handler
 
 
 @pytest.fixture
@@ -112,7 +187,7 @@ class TestSMTPRegularEmail:
     def test_send_simple_email(self, mock_smtp_class, smtp_provider, simple_message):
         """Test sending a simple email via SMTP."""
         mock_server = MagicMock()
-        mock_smtp_class.return_value.__enter__.return_value = mock_server
+        mock_smtp_class.return_value = mock_server
 
         response = smtp_provider.send(simple_message)
 
@@ -123,39 +198,38 @@ class TestSMTPRegularEmail:
         # Check SMTP connection
         mock_smtp_class.assert_called_once_with('smtp.example.com', 587)
         # Check message was sent
-        mock_server.send_message.assert_called_once()
+        mock_server.sendmail.assert_called_once()
 
-    @patch('mailbridge.providers.smtp_provider.smtplib.SMTP_SSL')
-    def test_send_with_ssl(self, mock_smtp_ssl_class, smtp_config):
-        """Test sending email with SSL connection."""
-        smtp_config['use_ssl'] = True
-        smtp_config['use_tls'] = False
-        provider = SMTPProvider(**smtp_config)
+    @pytest.mark.parametrize('port,use_tls,use_ssl,transport', TRANSPORTS, ids=TRANSPORT_IDS)
+    def test_send_over_transport(self, smtp_config, port, use_tls, use_ssl, transport):
+        """Test sending over STARTTLS, implicit SSL and plain connections."""
+        provider = SMTPProvider(**{**smtp_config, 'port': port, 'use_tls': use_tls, 'use_ssl': use_ssl})
 
-        mock_server = MagicMock()
-        mock_smtp_ssl_class.return_value.__enter__.return_value = mock_server
+        with patch('mailbridge.providers.smtp_provider.smtplib.SMTP') as mock_smtp_class, \
+                patch('mailbridge.providers.smtp_provider.smtplib.SMTP_SSL') as mock_smtp_ssl_class:
+            classes = {'SMTP': mock_smtp_class, 'SMTP_SSL': mock_smtp_ssl_class}
+            mock_server = classes[transport].return_value
 
-        message = EmailMessageDto(
-            to='recipient@example.com',
-            subject='SSL Test',
-            body='Body'
-        )
-
-        response = provider.send(message)
+            response = provider.send(EmailMessageDto(
+                to='recipient@example.com',
+                subject='Transport Test',
+                body='Body'
+            ))
 
         assert response.success is True
+        assert classes[transport].call_args[0] == ('smtp.example.com', port)
+        for name, mock_class in classes.items():
+            assert mock_class.called is (name == transport)
 
-        # Should use SMTP_SSL
-        mock_smtp_ssl_class.assert_called_once()
-
-        # Should NOT call starttls (already SSL)
-        mock_server.starttls.assert_not_called()
+        # STARTTLS only upgrades plain connections that asked for it
+        assert mock_server.starttls.called is use_tls
+        mock_server.sendmail.assert_called_once()
 
     @patch('mailbridge.providers.smtp_provider.smtplib.SMTP')
     def test_send_plain_text(self, mock_smtp_class, smtp_provider):
         """Test sending plain text email."""
         mock_server = MagicMock()
-        mock_smtp_class.return_value.__enter__.return_value = mock_server
+        mock_smtp_class.return_value = mock_server
 
         message = EmailMessageDto(
             to='recipient@example.com',
@@ -169,17 +243,53 @@ class TestSMTPRegularEmail:
         assert response.success is True
 
         # Check message was sent
-        call_args = mock_server.send_message.call_args
-        sent_message = call_args[0][0]
+        sent_message = parse_sent_message(mock_server)
 
-        # Check it's plain text (would need to parse MIME to verify fully)
         assert sent_message['Subject'] == 'Plain Text'
+        assert sent_message.get_content_type() == 'text/plain'
+
+    @pytest.mark.parametrize('body,charset,encoding', [
+        ('Plain ASCII body', 'us-ascii', '7bit'),
+        ('Zdravo, šta radiš?', 'utf-8', 'base64'),
+    ])
+    @patch('mailbridge.providers.smtp_provider.smtplib.SMTP')
+    def test_body_charset(self, mock_smtp_class, smtp_provider, body, charset, encoding):
+        """Test ASCII bodies are sent as 7bit us-ascii, everything else as utf-8."""
+        mock_server = MagicMock()
+        mock_smtp_class.return_value = mock_server
+
+        message = EmailMessageDto(to='recipient@example.com', subject='Test', body=body)
+
+        smtp_provider.send(message)
+
+        part = parse_sent_message(mock_server)
+        assert part.get_content_charset() == charset
+        assert part['Content-Transfer-Encoding'] == encoding
+        assert part.get_payload(decode=True).decode(charset) == body
+
+    @pytest.mark.parametrize('body,encoding', [
+        ('Zdravo, šta radiš?', '8bit'),
+        ('š' * 600, 'base64'),
+    ], ids=['short-lines', 'line-too-long'])
+    @patch('mailbridge.providers.smtp_provider.smtplib.SMTP')
+    def test_body_8bitmime(self, mock_smtp_class, smtp_config, body, encoding):
+        """Test use_8bitmime sends UTF-8 unencoded when lines fit the SMTP limit."""
+        mock_server = MagicMock()
+        mock_smtp_class.return_value = mock_server
+        provider = SMTPProvider(**smtp_config, use_8bitmime=True)
+
+        provider.send(EmailMessageDto(to='recipient@example.com', subject='Test', body=body))
+
+        part = parse_sent_message(mock_server)
+        assert part['Content-Transfer-Encoding'] == encoding
+        assert part.get_payload(decode=True).decode('utf-8') == body
+        assert mock_server.sendmail.call_args[1]['mail_options'] == ('BODY=8BITMIME',)
 
     @patch('mailbridge.providers.smtp_provider.smtplib.SMTP')
     def test_send_with_cc_bcc(self, mock_smtp_class, smtp_provider):
         """Test sending email with CC and BCC."""
         mock_server = MagicMock()
-        mock_smtp_class.return_value.__enter__.return_value = mock_server
+        mock_smtp_class.return_value = mock_server
 
         message = EmailMessageDto(
             to='recipient@example.com',
@@ -194,17 +304,37 @@ class TestSMTPRegularEmail:
         assert response.success is True
 
         # Check recipients include to, cc, bcc
-        call_kwargs = mock_server.send_message.call_args[1]
-        recipients = call_kwargs['to_addrs']
-        assert 'recipient@example.com' in recipients
-        assert 'cc@example.com' in recipients
-        assert 'bcc@example.com' in recipients
+        recipients = mock_server.sendmail.call_args[0][1]
+        assert recipients == ['recipient@example.com', 'cc@example.com', 'bcc@example.com']
+
+        # Building the envelope must not mutate the message
+        assert message.to == ['recipient@example.com']
+
+    @patch('mailbridge.providers.smtp_provider.smtplib.SMTP')
+    def test_bcc_not_in_headers(self, mock_smtp_class, smtp_provider):
+        """Test BCC recipients never appear in the transmitted message."""
+        mock_server = MagicMock()
+        mock_smtp_class.return_value = mock_server
+
+        message = EmailMessageDto(
+            to='recipient@example.com',
+            subject='Test',
+            body='Body',
+            bcc=['hidden@example.com']
+        )
+
+        smtp_provider.send(message)
+
+        from_addr, recipients, payload = mock_server.sendmail.call_args[0]
+        assert b'Bcc' not in payload
+        assert b'hidden@example.com' not in payload
+        assert 'hidden@example.com' in recipients
 
     @patch('mailbridge.providers.smtp_provider.smtplib.SMTP')
     def test_send_with_reply_to(self, mock_smtp_class, smtp_provider):
         """Test sending email with Reply-To."""
         mock_server = MagicMock()
-        mock_smtp_class.return_value.__enter__.return_value = mock_server
+        mock_smtp_class.return_value = mock_server
 
         message = EmailMessageDto(
             to='recipient@example.com',
@@ -217,14 +347,14 @@ class TestSMTPRegularEmail:
 
         assert response.success is True
 
-        sent_message = mock_server.send_message.call_args[0][0]
+        sent_message = parse_sent_message(mock_server)
         assert sent_message['Reply-To'] == 'reply@example.com'
 
     @patch('mailbridge.providers.smtp_provider.smtplib.SMTP')
     def test_send_with_custom_headers(self, mock_smtp_class, smtp_provider):
         """Test sending email with custom headers."""
         mock_server = MagicMock()
-        mock_smtp_class.return_value.__enter__.return_value = mock_server
+        mock_smtp_class.return_value = mock_server
 
         message = EmailMessageDto(
             to='recipient@example.com',
@@ -237,24 +367,76 @@ class TestSMTPRegularEmail:
 
         assert response.success is True
 
-        sent_message = mock_server.send_message.call_args[0][0]
+        sent_message = parse_sent_message(mock_server)
         assert sent_message['X-Custom-Header'] == 'custom-value'
         assert sent_message['X-Priority'] == '1'
 
+    @pytest.mark.parametrize('attachments', [None, [('file.csv', b'data', 'text/csv')]],
+                             ids=['simple', 'multipart'])
     @patch('mailbridge.providers.smtp_provider.smtplib.SMTP')
-    def test_send_with_attachments(self, mock_smtp_class, smtp_provider, tmp_path):
-        """Test sending email with file attachment."""
+    def test_send_sets_message_id(self, mock_smtp_class, smtp_provider, attachments):
+        """Test each message gets a unique Message-ID, reported in the response."""
         mock_server = MagicMock()
-        mock_smtp_class.return_value.__enter__.return_value = mock_server
+        mock_smtp_class.return_value = mock_server
+        message = EmailMessageDto(
+            to='recipient@example.com', subject='Test', body='Body', attachments=attachments
+        )
+
+        with patch('mailbridge.providers.smtp_provider._local_hostname', return_value='mx.example.com'):
+            first = smtp_provider.send(message)
+            second = smtp_provider.send(message)
 
-        test_file = tmp_path / "test.txt"
-        test_file.write_text("Test content")
+        assert first.message_id != second.message_id
+        assert first.message_id.startswith('<') and first.message_id.endswith('@mx.example.com>')
+        assert parse_sent_message(mock_server)['Message-ID'] == second.message_id
+
+    @patch('mailbridge.providers.smtp_provider.smtplib.SMTP')
+    def test_send_keeps_custom_message_id(self, mock_smtp_class, smtp_provider):
+        """Test a Message-ID passed in custom headers is used as-is."""
+        mock_server = MagicMock()
+        mock_smtp_class.return_value = mock_server
+        message = EmailMessageDto(
+            to='recipient@example.com', subject='Test', body='Body',
+            headers={'message-id': '<custom@example.com>'}
+        )
+
+        response = smtp_provider.send(message)
+
+        assert response.message_id == '<custom@example.com>'
+        assert parse_sent_message(mock_server).get_all('Message-ID') == ['<custom@example.com>']
+
+    @pytest.mark.parametrize('attachments', [None, [('file.csv', b'a,b', 'text/csv')]],
+                             ids=['single-part', 'multipart'])
+    @patch('mailbridge.providers.smtp_provider.smtplib.SMTP')
+    def test_send_non_ascii_headers(self, mock_smtp_class, smtp_provider, attachments):
+        """Test non-ASCII header values are RFC 2047-encoded rather than rejected."""
+        mock_server = MagicMock()
+        mock_smtp_class.return_value = mock_server
+
+        response = smtp_provider.send(EmailMessageDto(
+            to='Zoë <recipient@example.com>', attachments=attachments, **NON_ASCII_FIELDS
+        ))
+
+        assert response.success is True
+        assert mock_server.sendmail.call_args[0][0] == 'sender@example.com'
+        payload = mock_server.sendmail.call_args[0][2]
+        assert payload.partition(b'\r\n\r\n')[0].isascii()
+        sent = parse_sent_message(mock_server)
+        assert decoded_header(sent, 'To') == 'Zoë <recipient@example.com>'
+        for name, value in NON_ASCII_HEADERS.items():
+            assert decoded_header(sent, name) == value
+
+    @patch('mailbridge.providers.smtp_provider.smtplib.SMTP')
+    def test_send_with_attachments(self, mock_smtp_class, smtp_provider, sample_attachment_file):
+        """Test sending email with file attachment."""
+        mock_server = MagicMock()
+        mock_smtp_class.return_value = mock_server
 
         message = EmailMessageDto(
             to='recipient@example.com',
             subject='With Attachment',
             body='See attached',
-            attachments=[test_file]
+            attachments=[sample_attachment_file]
         )
 
         response = smtp_provider.send(message)
@@ -262,13 +444,43 @@ class TestSMTPRegularEmail:
         assert response.success is True
 
         # Message was sent (attachment is in MIME message)
-        mock_server.send_message.assert_called_once()
+        mock_server.sendmail.assert_called_once()
+
+    @patch('mailbridge.providers.smtp_provider.smtplib.SMTP')
+    def test_multipart_only_with_attachments(self, mock_smtp_class, smtp_provider):
+        """Test messages without attachments are sent as a single text part."""
+        mock_server = MagicMock()
+        mock_smtp_class.return_value = mock_server
+
+        smtp_provider.send(EmailMessageDto(
+            to='recipient@example.com',
+            subject='Simple',
+            body='<p>Hi</p>',
+            html=True,
+            cc=['cc@example.com']
+        ))
+        smtp_provider.send(EmailMessageDto(
+            to='recipient@example.com',
+            subject='With Attachment',
+            body='See attached',
+            attachments=[('report.csv', b'a,b', 'text/csv')]
+        ))
+
+        simple, with_attachment = [
+            email.message_from_bytes(c[0][2]) for c in mock_server.sendmail.call_args_list
+        ]
+        assert simple.get_content_type() == 'text/html'
+        assert simple['Cc'] == 'cc@example.com'
+        assert b'boundary' not in mock_server.sendmail.call_args_list[0][0][2]
+        assert with_attachment.is_multipart()
+        assert with_attachment['Subject'] == 'With Attachment'
+        assert len(with_attachment.get_payload()) == 2
 
     @patch('mailbridge.providers.smtp_provider.smtplib.SMTP')
     def test_send_with_tuple_attachment(self, mock_smtp_class, smtp_provider):
         """Test sending email with tuple attachment."""
         mock_server = MagicMock()
-        mock_smtp_class.return_value.__enter__.return_value = mock_server
+        mock_smtp_class.return_value = mock_server
 
         attachment = ('report.csv', b'col1,col2\nval1,val2', 'text/csv')
 
@@ -282,7 +494,7 @@ class TestSMTPRegularEmail:
         response = smtp_provider.send(message)
 
         assert response.success is True
-        mock_server.send_message.assert_called_once()
+        mock_server.sendmail.assert_called_once()
 
     @patch('mailbridge.providers.smtp_provider.smtplib.SMTP')
     def test_send_connection_error(self, mock_smtp_class, smtp_provider, simple_message):
@@ -302,47 +514,87 @@ class TestSMTPRegularEmail:
 class TestSMTPConnection:
     """Test SMTP connection handling."""
 
-    @patch('mailbridge.providers.smtp_provider.smtplib.SMTP')
-    def test_get_smtp_connection_tls(self, mock_smtp_class, smtp_config):
-        """Test SMTP connection with TLS."""
-        smtp_config['use_tls'] = True
-        smtp_config['use_ssl'] = False
-        provider = SMTPProvider(**smtp_config)
+    @pytest.mark.parametrize('port,use_tls,use_ssl,transport', TRANSPORTS, ids=TRANSPORT_IDS)
+    def test_get_smtp_connection(self, smtp_config, port, use_tls, use_ssl, transport):
+        """Test the connection class, STARTTLS upgrade and login for each transport."""
+        provider = SMTPProvider(**{**smtp_config, 'port': port, 'use_tls': use_tls, 'use_ssl': use_ssl})
 
+        with patch.object(smtp_provider_module.smtplib, transport) as mock_class:
+            connection = provider._get_smtp_connection()
+
+        assert connection is mock_class.return_value
+        assert mock_class.call_args[0] == ('smtp.example.com', port)
+        if use_ssl:
+            assert mock_class.call_args[1]['context'] is SMTPProvider._get_ssl_context()
+
+        if use_tls:
+            connection.starttls.assert_called_once_with(context=SMTPProvider._get_ssl_context())
+        else:
+            connection.starttls.assert_not_called()
+
+        connection.login.assert_called_once_with('user@example.com', 'password123')
+
+    @patch('mailbridge.providers.smtp_provider.smtplib.SMTP')
+    def test_ssl_context_is_cached(self, mock_smtp_class, smtp_config):
+        """Test every connection reuses the same default SSL context."""
         mock_server = MagicMock()
         mock_smtp_class.return_value = mock_server
 
-        connection = provider._get_smtp_connection()
+        SMTPProvider(**smtp_config)._get_smtp_connection()
+        SMTPProvider(**smtp_config)._get_smtp_connection()
 
-        # Should create SMTP (not SMTP_SSL)
-        mock_smtp_class.assert_called_once_with('smtp.example.com', 587)
+        first_context = mock_server.starttls.call_args_list[0][1]['context']
+        second_context = mock_server.starttls.call_args_list[1][1]['context']
+        assert first_context is second_context
+        assert isinstance(first_context, ssl.SSLContext)
 
-        # Should call STARTTLS
-        mock_server.starttls.assert_called_once()
+    def test_default_ssl_context_settings(self):
+        """Test the shared context floors at TLS 1.2 and keeps the library defaults."""
+        context = SMTPProvider._get_ssl_context()
 
-        # Should login
-        mock_server.login.assert_called_once_with('user@example.com', 'password123')
+        assert context.minimum_version == ssl.TLSVersion.TLSv1_2
+        assert context.maximum_version == ssl.TLSVersion.MAXIMUM_SUPPORTED
+        assert not context.options & ssl.OP_NO_TICKET
+        assert context.verify_mode == ssl.CERT_REQUIRED
 
-    @patch('mailbridge.providers.smtp_provider.smtplib.SMTP_SSL')
-    def test_get_smtp_connection_ssl(self, mock_smtp_ssl_class, smtp_config):
-        """Test SMTP connection with SSL."""
-        smtp_config['use_ssl'] = True
-        smtp_config['use_tls'] = False
+    @patch('mailbridge.providers.smtp_provider.smtplib.SMTP')
+    def test_custom_ssl_context(self, mock_smtp_class, smtp_config):
+        """Test a per-provider SSL context overrides the shared one."""
+        custom_context = ssl.create_default_context()
+        smtp_config['ssl_context'] = custom_context
         provider = SMTPProvider(**smtp_config)
 
         mock_server = MagicMock()
-        mock_smtp_ssl_class.return_value = mock_server
+        mock_smtp_class.return_value = mock_server
 
-        connection = provider._get_smtp_connection()
+        provider._get_smtp_connection()
 
-        # Should create SMTP_SSL
-        mock_smtp_ssl_class.assert_called_once()
+        mock_server.starttls.assert_called_once_with(context=custom_context)
 
-        # Should NOT call starttls
-        mock_server.starttls.assert_not_called()
+    @patch('mailbridge.providers.smtp_provider.smtplib.SMTP')
+    def test_get_smtp_connection_sets_tcp_nodelay(self, mock_smtp_class, smtp_provider):
+        """Test TCP_NODELAY is enabled before the STARTTLS handshake."""
+        mock_server = MagicMock()
+        mock_smtp_class.return_value = mock_server
 
-        # Should login
-        mock_server.login.assert_called_once()
+        smtp_provider._get_smtp_connection()
+
+        mock_server.sock.setsockopt.assert_called_once_with(
+            socket.IPPROTO_TCP, socket.TCP_NODELAY, 1
+        )
+
+    @patch('mailbridge.providers.smtp_provider.smtplib.SMTP')
+    def test_get_smtp_connection_tcp_nodelay_disabled(self, mock_smtp_class, smtp_config):
+        """Test TCP_NODELAY can be switched off via config."""
+        smtp_config['tcp_nodelay'] = False
+        provider = SMTPProvider(**smtp_config)
+
+        mock_server = MagicMock()
+        mock_smtp_class.return_value = mock_server
+
+        provider._get_smtp_connection()
+
+        mock_server.sock.setsockopt.assert_not_called()
 
     @patch('mailbridge.providers.smtp_provider.smtplib.SMTP')
     def test_default_from_email(self, mock_smtp_class, smtp_config):
@@ -350,7 +602,7 @@ class TestSMTPConnection:
         provider = SMTPProvider(**smtp_config)
 
         mock_server = MagicMock()
-        mock_smtp_class.return_value.__enter__.return_value = mock_server
+        mock_smtp_class.return_value = mock_server
 
         message = EmailMessageDto(
             to='recipient@example.com',
@@ -363,10 +615,561 @@ class TestSMTPConnection:
 
         assert response.success is True
 
-        sent_message = mock_server.send_message.call_args[0][0]
+        sent_message = parse_sent_message(mock_server)
         # Should use from_email from config
         assert sent_message['From'] == 'sender@example.com'
 
+    @patch('mailbridge.providers.smtp_provider.smtplib.SMTP')
+    def test_connection_reused_across_sends(self, mock_smtp_class, smtp_provider, simple_message):
+        """Test a live connection is reused instead of reconnecting per send."""
+        mock_server = MagicMock()
+        mock_server.noop.return_value = (250, b'OK')
+        mock_smtp_class.return_value = mock_server
+
+        smtp_provider.send(simple_message)
+        smtp_provider.send(simple_message)
+
+        # Only one handshake for both messages
+        mock_smtp_class.assert_called_once()
+        mock_server.login.assert_called_once()
+        assert mock_server.sendmail.call_count == 2
+
+    @patch('mailbridge.providers.smtp_provider.smtplib.SMTP')
+    def test_send_batch_over_one_connection(self, mock_smtp_class, smtp_config):
+        """Test a run of sends stays on one connection and keeps message order."""
+        mock_server = MagicMock()
+        mock_server.noop.return_value = (250, b'OK')
+        mock_smtp_class.return_value = mock_server
+
+        with SMTPProvider(**smtp_config, max_messages_per_connection=1000) as provider:
+            responses = [
+                provider.send(EmailMessageDto(to=f'r{i}@example.com', subject='Hi', body=f'Body {i}'))
+                for i in range(100)
+            ]
+
+        mock_smtp_class.assert_called_once()
+        mock_server.login.assert_called_once()
+        calls = mock_server.sendmail.call_args_list
+        assert [c[0][1] for c in calls] == [[f'r{i}@example.com'] for i in range(100)]
+        assert [email.message_from_bytes(c[0][2])['Message-ID'] for c in calls] == [
+            r.message_id for r in responses
+        ]
+
+    @patch('mailbridge.providers.smtp_provider.smtplib.SMTP')
+    def test_send_bulk_non_ascii_headers(self, mock_smtp_class, smtp_provider):
+        """Test bulk sends encode non-ASCII headers, including each copy's own To."""
+        mock_server = MagicMock()
+        mock_smtp_class.return_value = mock_server
+
+        result = smtp_provider.send_bulk(BulkEmailDTO(messages=[
+            EmailMessageDto(to=f'Zoë {i} <user{i}@example.com>', **NON_ASCII_FIELDS)
+            for i in range(3)
+        ]))
+
+        assert result.successful == 3
+        for i, call in enumerate(mock_server.sendmail.call_args_list):
+            sent = email.message_from_bytes(call[0][2])
+            assert decoded_header(sent, 'To') == f'Zoë {i} <user{i}@example.com>'
+            for name, value in NON_ASCII_HEADERS.items():
+                assert decoded_header(sent, name) == value
+
+    @patch('mailbridge.providers.smtp_provider.smtplib.SMTP')
+    def test_reconnects_when_connection_is_stale(self, mock_smtp_class, smtp_config, simple_message):
+        """Test provider reconnects when an idle connection fails NOOP."""
+        smtp_config['idle_check_interval'] = 0
+        smtp_provider = SMTPProvider(**smtp_config)
+        stale_server = MagicMock()
+        stale_server.noop.side_effect = smtplib.SMTPServerDisconnected()
+        fresh_server = MagicMock()
+        mock_smtp_class.side_effect = [stale_server, fresh_server]
+
+        smtp_provider.send(simple_message)
+        smtp_provider.send(simple_message)
+
+        assert mock_smtp_class.call_count == 2
+        stale_server.sendmail.assert_called_once()
+        fresh_server.sendmail.assert_called_once()
+
+    @patch('mailbridge.providers.smtp_provider.smtplib.SMTP')
+    def test_recently_used_connection_skips_probe(self, mock_smtp_class, smtp_provider, simple_message):
+        """Test a connection reused within the idle window costs no extra round trips."""
+        mock_server = MagicMock()
+        mock_smtp_class.return_value = mock_server
+
+        smtp_provider.send(simple_message)
+        smtp_provider.send(simple_message)
+
+        mock_smtp_class.assert_called_once()
+        mock_server.noop.assert_not_called()
+        # smtplib re-issues EHLO itself where needed (e.g. after STARTTLS)
+        mock_server.ehlo.assert_not_called()
+        assert mock_server.sendmail.call_count == 2
+
+    @patch('mailbridge.providers.smtp_provider.smtplib.SMTP')
+    def test_close_quits_connection(self, mock_smtp_class, smtp_provider, simple_message):
+        """Test close() sends QUIT on the cached connection."""
+        mock_server = MagicMock()
+        mock_smtp_class.return_value = mock_server
+
+        smtp_provider.send(simple_message)
+        smtp_provider.close()
+
+        mock_server.quit.assert_called_once()
+
+    @patch('mailbridge.providers.smtp_provider.smtplib.SMTP')
+    def test_connection_rotated_after_message_limit(self, mock_smtp_class, smtp_config, simple_message):
+        """Test a connection is retired once it hits max_messages_per_connection."""
+        smtp_config['max_messages_per_connection'] = 2
+        provider = SMTPProvider(**smtp_config)
+
+        first_server = MagicMock()
+        first_server.noop.return_value = (250, b'OK')
+        second_server = MagicMock()
+        mock_smtp_class.side_effect = [first_server, second_server]
+
+        for _ in range(3):
+            provider.send(simple_message)
+
+        assert mock_smtp_class.call_count == 2
+        assert first_server.sendmail.call_count == 2
+        first_server.quit.assert_called_once()
+        second_server.sendmail.assert_called_once()
+
+    @patch('mailbridge.providers.smtp_provider.smtplib.SMTP')
+    def test_resends_same_payload_after_disconnect(self, mock_smtp_class, smtp_provider, simple_message):
+        """Test a dropped connection is replaced and the flattened bytes resent."""
+        dropped_server = MagicMock()
+        dropped_server.sendmail.side_effect = smtplib.SMTPServerDisconnected()
+        fresh_server = MagicMock()
+        mock_smtp_class.side_effect = [dropped_server, fresh_server]
+
+        response = smtp_provider.send(simple_message)
+
+        assert response.success is True
+        assert mock_smtp_class.call_count == 2
+        assert dropped_server.sendmail.call_args == fresh_server.sendmail.call_args
+
+    @patch('mailbridge.providers.smtp_provider.smtplib.SMTP')
+    def test_sendmail_payload_is_smtp_wire_format(self, mock_smtp_class, smtp_provider):
+        """Test the payload uses CRLF line endings and a bare envelope sender."""
+        mock_server = MagicMock()
+        mock_smtp_class.return_value = mock_server
+
+        message = EmailMessageDto(
+            to='recipient@example.com',
+            subject='Test',
+            body='Line one\nLine two',
+            from_email='Sender Name <sender@example.com>'
+        )
+
+        smtp_provider.send(message)
+
+        from_addr, recipients, payload = mock_server.sendmail.call_args[0]
+        assert from_addr == 'sender@example.com'
+        assert isinstance(payload, bytes)
+        assert b'\r\n' in payload
+        assert b'\n' not in payload.replace(b'\r\n', b'')
+
+
+# =============================================================================
+# CONNECTION POOL TESTS
+# =============================================================================
+
+class TestSMTPConnectionPool:
+    """Test pooled connections and parallel bulk sending."""
+
+    @pytest.mark.parametrize('value', [0, True, '2'])
+    @pytest.mark.parametrize('key', ['pool_size', 'max_messages_per_connection'])
+    def test_invalid_pool_config(self, smtp_config, key, value):
+        """Test pool settings must be positive integers."""
+        smtp_config[key] = value
+
+        with pytest.raises(ConfigurationError) as exc_info:
+            SMTPProvider(**smtp_config)
+
+        assert key in str(exc_info.value)
+
+    @pytest.mark.parametrize('value', [-1, 'soon', True])
+    def test_invalid_idle_check_interval(self, smtp_config, value):
+        """Test the idle probe interval must be a non-negative number."""
+        smtp_config['idle_check_interval'] = value
+
+        with pytest.raises(ConfigurationError, match='idle_check_interval'):
+            SMTPProvider(**smtp_config)
+
+    @pytest.mark.parametrize('value', [0, 2.5])
+    def test_valid_idle_check_interval(self, smtp_config, value):
+        """Test zero (always probe) and fractional intervals are accepted."""
+        smtp_config['idle_check_interval'] = value
+
+        assert SMTPProvider(**smtp_config)._pool.idle_check_interval == value
+
+    @patch('mailbridge.providers.smtp_provider.smtplib.SMTP')
+    def test_send_bulk_uses_pool(self, mock_smtp_class, smtp_config):
+        """Test bulk sending never opens more than pool_size connections."""
+        smtp_config['pool_size'] = 2
+        provider = SMTPProvider(**smtp_config)
+
+        def make_server(*args, **kwargs):
+            server = MagicMock()
+            server.noop.return_value = (250, b'OK')
+            return server
+
+        mock_smtp_class.side_effect = make_server
+
+        bulk = BulkEmailDTO(messages=[
+            EmailMessageDto(to=f'user{i}@example.com', subject='Hi', body='Body')
+            for i in range(10)
+        ])
+
+        result = provider.send_bulk(bulk)
+
+        assert result.total == 10
+        assert result.successful == 10
+        assert 1 <= mock_smtp_class.call_count <= 2
+
+    @patch('mailbridge.providers.smtp_provider.smtplib.SMTP')
+    def test_send_bulk_reports_failures(self, mock_smtp_class, smtp_config):
+        """Test a failing message is reported without aborting the batch."""
+        smtp_config['pool_size'] = 2
+        provider = SMTPProvider(**smtp_config)
+
+        mock_server = MagicMock()
+        mock_server.noop.return_value = (250, b'OK')
+        mock_server.sendmail.side_effect = [
+            None,
+            smtplib.SMTPRecipientsRefused({'bad@example.com': (550, b'No such user')}),
+        ]
+        mock_smtp_class.return_value = mock_server
+
+        bulk = BulkEmailDTO(messages=[
+            EmailMessageDto(to='good@example.com', subject='Hi', body='Body'),
+            EmailMessageDto(to='bad@example.com', subject='Hi', body='Body'),
+        ])
+
+        result = provider.send_bulk(bulk)
+
+        assert result.total == 2
+        assert result.successful == 1
+        assert result.failed == 1
+
+
+    @patch('mailbridge.providers.smtp_provider.smtplib.SMTP')
+    def test_send_bulk_pipelined_keeps_order(self, mock_smtp_class, smtp_provider):
+        """Test single-connection bulk builds ahead but reports results in order."""
+        mock_server = MagicMock()
+        mock_server.noop.return_value = (250, b'OK')
+        mock_smtp_class.return_value = mock_server
+
+        bulk = BulkEmailDTO(messages=[
+            EmailMessageDto(to='first@example.com', subject='Hi', body='Body'),
+            EmailMessageDto(
+                to='broken@example.com',
+                subject='Hi',
+                body='Body',
+                attachments=[('file.bin', b'data', 'not-a-mimetype')]
+            ),
+            EmailMessageDto(to='third@example.com', subject='Hi', body='Body'),
+        ])
+
+        result = smtp_provider.send_bulk(bulk)
+
+        assert [r.success for r in result.responses] == [True, False, True]
+        assert 'Failed to send email via SMTP' in result.responses[1].error
+        mock_smtp_class.assert_called_once()
+        sent_to = [c[0][1] for c in mock_server.sendmail.call_args_list]
+        assert sent_to == [['first@example.com'], ['third@example.com']]
+
+    @patch('mailbridge.providers.smtp_provider.smtplib.SMTP')
+    def test_send_bulk_rate_limited(self, mock_smtp_class, smtp_config):
+        """Test max_send_rate spaces out bulk sends."""
+        mock_server = MagicMock()
+        mock_server.noop.return_value = (250, b'OK')
+        mock_smtp_class.return_value = mock_server
+        bulk = BulkEmailDTO(messages=[
+            EmailMessageDto(to=f'user{i}@example.com', subject='Hi', body='Body')
+            for i in range(3)
+        ])
+
+        with patch.object(rate_limit.time, 'monotonic_ns', return_value=10**9), \
+                patch.object(rate_limit.time, 'sleep') as mock_sleep:
+            provider = SMTPProvider(**smtp_config, max_send_rate=5)
+            result = provider.send_bulk(bulk)
+
+        assert result.successful == 3
+        assert [c.args[0] for c in mock_sleep.call_args_list] == pytest.approx([0.2, 0.4])
+
+    @patch('mailbridge.providers.smtp_provider.smtplib.SMTP')
+    def test_send_bulk_reuses_shared_content(self, mock_smtp_class, smtp_provider):
+        """Test messages differing only in recipients are built once."""
+        mock_server = MagicMock()
+        mock_server.noop.return_value = (250, b'OK')
+        mock_smtp_class.return_value = mock_server
+
+        bulk = BulkEmailDTO(messages=[
+            EmailMessageDto(
+                to=f'user{i}@example.com',
+                cc='team@example.com' if i == 1 else None,
+                bcc='audit@example.com',
+                subject='Hi',
+                body='Body',
+                attachments=[('report.csv', b'a,b', 'text/csv')]
+            )
+            for i in range(3)
+        ])
+
+        with patch.object(smtp_provider, '_build_message', wraps=smtp_provider._build_message) as build:
+            result = smtp_provider.send_bulk(bulk)
+
+        assert result.successful == 3
+        build.assert_called_once()
+
+        payloads = [email.message_from_bytes(c[0][2]) for c in mock_server.sendmail.call_args_list]
+        assert [m['To'] for m in payloads] == ['user0@example.com', 'user1@example.com', 'user2@example.com']
+        assert [m['Cc'] for m in payloads] == [None, 'team@example.com', None]
+        assert all(m['Bcc'] is None for m in payloads)
+        assert all(m.get_payload()[1].get_payload(decode=True) == b'a,b' for m in payloads)
+        assert [m['Message-ID'] for m in payloads] == [r.message_id for r in result.responses]
+        assert len(set(r.message_id for r in result.responses)) == 3
+        assert mock_server.sendmail.call_args_list[1][0][1] == [
+            'user1@example.com', 'team@example.com', 'audit@example.com'
+        ]
+
+
+    @patch('mailbridge.providers.smtp_provider.smtplib.SMTP')
+    def test_send_bulk_encodes_shared_attachment_once(
+            self, mock_smtp_class, smtp_provider, sample_attachment_file
+    ):
+        """Test an attachment shared by personalised messages is encoded once per send."""
+        mock_server = MagicMock()
+        mock_server.noop.return_value = (250, b'OK')
+        mock_smtp_class.return_value = mock_server
+        attachments = [sample_attachment_file, ('report.csv', b'a,b', 'text/csv')]
+
+        bulk = BulkEmailDTO(messages=[
+            EmailMessageDto(
+                to=f'user{i}@example.com',
+                subject='Hi',
+                body=f'Hello user {i}',
+                attachments=list(attachments)
+            )
+            for i in range(3)
+        ])
+
+        with patch.object(smtp_provider_module, 'encode_file_base64',
+                          wraps=smtp_provider_module.encode_file_base64) as encode_file, \
+                patch.object(smtp_provider_module, 'encode_base64',
+                             wraps=smtp_provider_module.encode_base64) as encode_bytes:
+            result = smtp_provider.send_bulk(bulk)
+
+        assert result.successful == 3
+        assert (encode_file.call_count, encode_bytes.call_count) == (1, 1)
+
+        for i, call in enumerate(mock_server.sendmail.call_args_list):
+            body, attached_file, attached_csv = email.message_from_bytes(call[0][2]).get_payload()
+            assert body.get_payload() == f'Hello user {i}'
+            assert attached_file.get_payload(decode=True) == b'Test content'
+            assert attached_csv.get_payload(decode=True) == b'a,b'
+
+# =============================================================================
+# ASYNC BULK TESTS
+# =============================================================================
+
+class TestSMTPAsyncBulk:
+    """Test aiosmtplib-based bulk sending."""
+
+    @patch('mailbridge.providers.smtp_provider.aiosmtplib.SMTP')
+    def test_send_bulk_async_pins_connection_per_worker(self, mock_async_smtp_class, smtp_config):
+        """Test each worker connects once and reuses its connection."""
+        smtp_config['pool_size'] = 2
+        provider = SMTPProvider(**smtp_config)
+
+        clients = []
+
+        async def sendmail(*args, **kwargs):
+            # Yield to the event loop like real network I/O would
+            await asyncio.sleep(0)
+
+        def make_client(*args, **kwargs):
+            client = AsyncMock()
+            client.sendmail.side_effect = sendmail
+            clients.append(client)
+            return client
+
+        mock_async_smtp_class.side_effect = make_client
+
+        bulk = BulkEmailDTO(messages=[
+            EmailMessageDto(to=f'user{i}@example.com', subject='Hi', body='Body')
+            for i in range(5)
+        ])
+
+        result = asyncio.run(provider.send_bulk_async(bulk))
+
+        assert result.total == 5
+        assert result.successful == 5
+        assert len(clients) == 2
+        assert sum(c.sendmail.await_count for c in clients) == 5
+        for client in clients:
+            client.connect.assert_awaited_once()
+            client.quit.assert_awaited_once()
+
+        _, kwargs = mock_async_smtp_class.call_args
+        assert kwargs['hostname'] == 'smtp.example.com'
+        assert kwargs['start_tls'] is True
+        assert kwargs['use_tls'] is False
+
+    @patch('mailbridge.providers.smtp_provider.aiosmtplib.SMTP')
+    def test_send_bulk_async_reports_failures(self, mock_async_smtp_class, smtp_provider):
+        """Test a failing message does not abort the rest of the batch."""
+        client = AsyncMock()
+        client.is_connected = True
+        client.sendmail.side_effect = [None, Exception('Recipient refused'), None]
+        mock_async_smtp_class.return_value = client
+
+        bulk = BulkEmailDTO(messages=[
+            EmailMessageDto(to=f'user{i}@example.com', subject='Hi', body='Body')
+            for i in range(3)
+        ])
+
+        result = asyncio.run(smtp_provider.send_bulk_async(bulk))
+
+        assert result.successful == 2
+        assert result.failed == 1
+        assert 'Recipient refused' in result.responses[1].error
+
+    @patch('mailbridge.providers.smtp_provider.aiosmtplib.SMTP')
+    def test_send_bulk_async_reports_connect_failures(self, mock_async_smtp_class, smtp_provider):
+        """Test a refused connection fails each message instead of the whole batch."""
+        client = AsyncMock()
+        client.connect.side_effect = smtp_provider_module.aiosmtplib.SMTPConnectError('Connection refused')
+        mock_async_smtp_class.return_value = client
+
+        bulk = BulkEmailDTO(messages=[
+            EmailMessageDto(to=f'user{i}@example.com', subject='Hi', body='Body')
+            for i in range(2)
+        ])
+
+        result = asyncio.run(smtp_provider.send_bulk_async(bulk))
+
+        assert result.total == 2
+        assert result.failed == 2
+        assert all('Connection refused' in r.error for r in result.responses)
+        client.sendmail.assert_not_awaited()
+
+    @patch('mailbridge.providers.smtp_provider.smtplib.SMTP')
+    @patch('mailbridge.providers.smtp_provider.aiosmtplib.SMTP')
+    def test_send_bulk_async_never_uses_blocking_smtplib(
+            self, mock_async_smtp_class, mock_smtp_class, smtp_provider, simple_message
+    ):
+        """Test the async path does its I/O with aiosmtplib, not smtplib in disguise."""
+        assert asyncio.iscoroutinefunction(SMTPProvider.send_bulk_async)
+        client = AsyncMock()
+        mock_async_smtp_class.return_value = client
+
+        result = asyncio.run(smtp_provider.send_bulk_async(BulkEmailDTO(messages=[simple_message])))
+
+        assert result.successful == 1
+        client.sendmail.assert_awaited_once()
+        mock_smtp_class.assert_not_called()
+
+    def test_send_bulk_async_requires_aiosmtplib(self, smtp_provider, simple_message):
+        """Test a clear error is raised when aiosmtplib is missing."""
+        bulk = BulkEmailDTO(messages=[simple_message])
+
+        with patch('mailbridge.providers.smtp_provider.AIOSMTPLIB_AVAILABLE', False):
+            with pytest.raises(ConfigurationError) as exc_info:
+                asyncio.run(smtp_provider.send_bulk_async(bulk))
+
+        assert 'aiosmtplib' in str(exc_info.value)
+
+
+# =============================================================================
+# LIVE SERVER TESTS
+# =============================================================================
+
+class TestSMTPLiveServer:
+    """Send over real sockets to an in-process aiosmtpd server."""
+
+    def test_send(self, live_smtp):
+        """Test a message with CC/BCC and an attachment arrives intact."""
+        config, handler = live_smtp
+        message = EmailMessageDto(
+            to='recipient@example.com',
+            cc=['cc@example.com'],
+            bcc=['bcc@example.com'],
+            subject='Live',
+            body='Hello over the wire',
+            attachments=[('report.csv', b'a,b', 'text/csv')]
+        )
+
+        with SMTPProvider(**config) as provider:
+            response = provider.send(message)
+
+        (envelope,) = handler.envelopes
+        assert envelope.mail_from == 'sender@example.com'
+        assert envelope.rcpt_tos == ['recipient@example.com', 'cc@example.com', 'bcc@example.com']
+
+        received = email.message_from_bytes(envelope.content)
+        assert received['Message-ID'] == response.message_id
+        assert received['Cc'] == 'cc@example.com'
+        assert received['Bcc'] is None
+        body, attachment = received.get_payload()
+        assert body.get_payload() == 'Hello over the wire'
+        assert attachment.get_payload(decode=True) == b'a,b'
+
+    def test_sends_share_one_session(self, live_smtp):
+        """Test consecutive send() calls reuse one authenticated session."""
+        config, handler = live_smtp
+
+        with SMTPProvider(**config) as provider:
+            for i in range(3):
+                provider.send(EmailMessageDto(to=f'user{i}@example.com', subject='Hi', body='Body'))
+
+        assert [e.rcpt_tos for e in handler.envelopes] == [[f'user{i}@example.com'] for i in range(3)]
+        assert len(handler.sessions) == 1
+
+    @pytest.mark.parametrize('pool_size', [1, 3])
+    def test_send_bulk_reuses_sessions(self, live_smtp, pool_size):
+        """Test bulk sends deliver everything over at most pool_size sessions."""
+        config, handler = live_smtp
+        bulk = BulkEmailDTO(messages=[
+            EmailMessageDto(to=f'user{i}@example.com', subject='Hi', body=f'Message {i}')
+            for i in range(12)
+        ])
+
+        with SMTPProvider(**config, pool_size=pool_size) as provider:
+            result = provider.send_bulk(bulk)
+
+        assert result.successful == 12
+        assert sorted(e.rcpt_tos[0] for e in handler.envelopes) == sorted(
+            f'user{i}@example.com' for i in range(12)
+        )
+        assert 1 <= len(handler.sessions) <= pool_size
+
+    def test_send_8bitmime(self, live_smtp):
+        """Test 8BITMIME bodies are accepted and arrive as raw UTF-8."""
+        config, handler = live_smtp
+
+        with SMTPProvider(**config, use_8bitmime=True) as provider:
+            provider.send(EmailMessageDto(to='a@example.com', subject='Hi', body='Zdravo, šta radiš?'))
+
+        (envelope,) = handler.envelopes
+        assert 'Zdravo, šta radiš?'.encode('utf-8') in envelope.original_content
+
+    @pytest.mark.skipif(not smtp_provider_module.AIOSMTPLIB_AVAILABLE, reason='aiosmtplib not installed')
+    def test_send_bulk_async(self, live_smtp):
+        """Test aiosmtplib bulk sends deliver every message."""
+        config, handler = live_smtp
+        provider = SMTPProvider(**config, pool_size=2)
+        bulk = BulkEmailDTO(messages=[
+            EmailMessageDto(to=f'user{i}@example.com', subject='Hi', body='Body')
+            for i in range(6)
+        ])
+
+        result = asyncio.run(provider.send_bulk_async(bulk))
+
+        assert result.successful == 6
+        assert len(handler.envelopes) == 6
 
 # =============================================================================
 # HELPER METHODS TESTS
@@ -388,6 +1191,46 @@ class TestSMTPHelpers:
         # Check attachment was added
         assert len(msg.get_payload()) == 1
 
+    def test_attach_large_file_streams_base64(self, smtp_provider, tmp_path):
+        """Test multi-chunk files encode to valid, RFC 2045 wrapped base64."""
+        from email.mime.multipart import MIMEMultipart
+
+        data = bytes(range(256)) * 1000
+        test_file = tmp_path / "archive.bin"
+        test_file.write_bytes(data)
+
+        msg = MIMEMultipart()
+        smtp_provider._attach_file(msg, test_file)
+
+        part = msg.get_payload()[0]
+        assert part['Content-Transfer-Encoding'] == 'base64'
+        assert part.get_payload(decode=True) == data
+        assert max(len(line) for line in part.get_payload().splitlines()) == 76
+
+    def test_attach_file_reuses_read_buffer(self, smtp_provider, tmp_path, monkeypatch):
+        """Test file chunks are read into one reused buffer."""
+        from email.mime.multipart import MIMEMultipart
+
+        data = bytes(range(256)) * 10
+        test_file = tmp_path / "blob.bin"
+        test_file.write_bytes(data)
+        reads = []
+
+        class RecordingFile(io.BytesIO):
+            def readinto(self, buffer):
+                reads.append((len(buffer), id(buffer)))
+                return super().readinto(buffer)
+
+        monkeypatch.setattr(_encoding, 'FILE_CHUNK_SIZE', 570)
+        monkeypatch.setattr(_encoding, 'open', lambda path, mode='r': RecordingFile(data), raising=False)
+
+        msg = MIMEMultipart()
+        smtp_provider._attach_file(msg, test_file)
+
+        assert msg.get_payload()[0].get_payload(decode=True) == data
+        assert len(reads) > 1
+        assert set(reads) == {(570, reads[0][1])}
+
     def test_attach_tuple(self, smtp_provider):
         """Test _attach_file with tuple."""
         from email.mime.multipart import MIMEMultipart
@@ -400,6 +1243,69 @@ class TestSMTPHelpers:
         # Check attachment was added
         assert len(msg.get_payload()) == 1
 
+    @pytest.mark.parametrize('encodebytes', [
+        base64.encodebytes,
+        _encoding.encodebytes,
+    ], ids=['stdlib', 'default'])
+    def test_attach_tuple_matches_stdlib_encoder(self, smtp_provider, encodebytes):
+        """Test tuple attachments encode the same with and without pybase64."""
+        from email.mime.multipart import MIMEMultipart
+        from email.mime.base import MIMEBase
+        from email import encoders
+
+        data = bytes(range(256)) * 10
+        expected = MIMEBase('application', 'pdf')
+        expected.set_payload(data)
+        encoders.encode_base64(expected)
+
+        with patch.object(_encoding, 'encodebytes', encodebytes):
+            msg = MIMEMultipart()
+            smtp_provider._attach_file(msg, ('file.pdf', data, 'application/pdf'))
+
+        part = msg.get_payload()[0]
+        assert part['Content-Transfer-Encoding'] == 'base64'
+        assert part.get_payload() == expected.get_payload()
+        assert part.get_payload(decode=True) == data
+
+    @pytest.mark.parametrize('recipients', [True, False])
+    @pytest.mark.parametrize('fields', [
+        {},
+        {'html': True},
+        {'body': 'Line one\r\nLine two\rLine three\n'},
+        {'cc': ['cc@example.com'], 'reply_to': 'reply@example.com'},
+        {'headers': {'X-Campaign': 'spring', 'Message-ID': '<id@example.com>'}},
+    ], ids=['plain', 'html', 'line-endings', 'cc-reply-to', 'custom-headers'])
+    def test_build_simple_matches_mime_builder(self, smtp_provider, fields, recipients):
+        """Test the direct header assembly emits the same bytes as the MIME builder."""
+        message = EmailMessageDto(**{
+            'to': ['a@example.com', 'b@example.com'],
+            'subject': 'Weekly report',
+            'body': 'Hello\nWorld',
+            **fields
+        })
+
+        head, body = smtp_provider._build_simple(message, recipients=recipients)
+
+        expected = _encoding.flatten_crlf(
+            smtp_provider._build_message(message, recipients=recipients)
+        )
+        assert head + b'\r\n' + body == expected
+
+    @pytest.mark.parametrize('fields', [
+        {'body': 'Héllo'},
+        {'subject': 'Café'},
+        {'subject': 'x' * 80},
+        {'headers': {'X-Tab': 'a\tb'}},
+        {'attachments': [('file.csv', b'data', 'text/csv')]},
+    ], ids=['non-ascii-body', 'non-ascii-subject', 'long-header', 'control-char', 'attachment'])
+    def test_build_simple_falls_back(self, smtp_provider, fields):
+        """Test messages the MIME builder would encode or fold skip the fast path."""
+        message = EmailMessageDto(**{
+            'to': 'a@example.com', 'subject': 'Test', 'body': 'Body', **fields
+        })
+
+        assert smtp_provider._build_simple(message) is None
+
 
 # =============================================================================
 # CONTEXT MANAGER TESTS
@@ -408,12 +1314,26 @@ class TestSMTPHelpers:
 class TestSMTPContextManager:
     """Test context manager support."""
 
-    def test_context_manager(self, smtp_config):
+    def test_context_manager(self, smtp_provider):
         """Test using provider as context manager."""
-        with SMTPProvider(**smtp_config) as provider:
-            assert provider is not None
+        with smtp_provider as provider:
+            assert provider is smtp_provider
             assert isinstance(provider, SMTPProvider)
 
+    @patch('mailbridge.providers.smtp_provider.smtplib.SMTP')
+    def test_context_manager_closes_connection(self, mock_smtp_class, smtp_provider, simple_message):
+        """Test leaving the context closes the shared connection."""
+        mock_server = MagicMock()
+        mock_server.noop.return_value = (250, b'OK')
+        mock_smtp_class.return_value = mock_server
+
+        with smtp_provider as provider:
+            provider.send(simple_message)
+            provider.send(simple_message)
+
+        mock_smtp_class.assert_called_once()
+        mock_server.quit.assert_called_once()
+
 
 # =============================================================================
 # RUN TESTS